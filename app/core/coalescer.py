@@ -0,0 +1,98 @@
+# app/core/coalescer.py
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple
+
+
+class _Group:
+    __slots__ = ("key", "entries", "closed")
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        self.entries: List[Tuple[Any, Future]] = []
+        self.closed = False
+
+
+class GroupCommitCoalescer:
+    """Gathers submissions sharing a key for up to ``window_seconds`` and applies them together.
+
+    The first submission for a key opens a group. Once its window has passed, or once ``max_size``
+    entries are waiting, ``apply(key, items)`` runs on one of ``max_workers`` threads and must
+    return one result per item, in order; each submitter's future gets its own result. A result
+    that is an exception is raised to that submitter only; if ``apply`` itself raises, every
+    future in the group gets the exception.
+
+    A single timer thread closes due groups, so however many keys are active at most
+    ``max_workers`` groups are being applied at a time.
+    """
+
+    def __init__(
+        self, apply: Callable[[Hashable, List[Any]], Sequence[Any]], max_size: int = 100, max_workers: int = 4
+    ):
+        self.apply = apply
+        self.max_size = max_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="group-commit")
+        self._groups: Dict[Hashable, _Group] = {}
+        # (deadline, tie-breaker, group), earliest first
+        self._due: List[Tuple[float, int, _Group]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._timer: threading.Thread | None = None
+
+    def submit(self, key: Hashable, item: Any, window_seconds: float) -> Future:
+        future: Future = Future()
+        with self._cond:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group(key)
+                heapq.heappush(self._due, (time.monotonic() + window_seconds, next(self._sequence), group))
+                self._start_timer()
+                self._cond.notify()
+            group.entries.append((item, future))
+            if len(group.entries) >= self.max_size:
+                self._dispatch(group)
+        return future
+
+    def _start_timer(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._run_timer, name="group-commit-timer", daemon=True)
+            self._timer.start()
+
+    def _run_timer(self) -> None:
+        with self._cond:
+            while True:
+                if not self._due:
+                    self._cond.wait()
+                    continue
+                deadline, _, group = self._due[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._due)
+                if not group.closed:
+                    self._dispatch(group)
+
+    def _dispatch(self, group: _Group) -> None:
+        # caller holds the lock; a closed group takes no more entries and is applied exactly once
+        group.closed = True
+        if self._groups.get(group.key) is group:
+            del self._groups[group.key]
+        self._executor.submit(self._apply, group)
+
+    def _apply(self, group: _Group) -> None:
+        items = [item for item, _ in group.entries]
+        try:
+            results = self.apply(group.key, items)
+        except BaseException as exc:  # noqa: BLE001 - handed to every waiting caller
+            for _, future in group.entries:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(group.entries, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
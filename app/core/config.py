@@ -11,6 +11,60 @@ class Settings(BaseSettings):
     service_name: str = "ledger-api"
     environment: str = "local"
 
+    log_queue_enabled: bool = False
+    log_queue_max_size: int = 10000
+    log_queue_policy: str = "drop"
+    log_queue_block_timeout: float = 0.05
+
+    rejection_log_burst: int = 5
+    rejection_log_window_seconds: float = 1.0
+
+    async_db_enabled: bool = False
+    request_profiling_enabled: bool = False
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = True
+
+    asset_cache_max_size: int = 1024
+    asset_cache_ttl_seconds: float = 300.0
+    # how long a status name or id found in no dominio row is remembered as missing
+    status_miss_ttl_seconds: float = 30.0
+
+    balance_upsert_enabled: bool = True
+    idempotency_insert_first: bool = True
+    event_copy_threshold: int = 5000
+
+    # deposits to these accounts are spread over balance_shards rows instead of queuing on one
+    sharded_account_ids: set[int] = set()
+    balance_shards: int = 8
+
+    # how single-row balance writes serialize: atomic (one guarded UPDATE), pessimistic
+    # (SELECT ... FOR UPDATE, then write), optimistic (read, then UPDATE ... WHERE version = ?)
+    # or adaptive (optimistic per account until its conflict rate passes the threshold)
+    balance_concurrency: str = "atomic"
+    optimistic_retry_attempts: int = 3
+    optimistic_conflict_threshold: float = 0.2
+    optimistic_conflict_ttl_seconds: float = 60.0
+
+    # deposits to the same (account, asset) arriving within the window share one transaction;
+    # 0 disables coalescing. Sharded accounts are never coalesced.
+    deposit_coalesce_window_ms: float = 0.0
+    deposit_coalesce_max_size: int = 100
+    # groups applied at once, each on its own pooled connection
+    deposit_coalesce_workers: int = 4
+
+    # extra attempts for a request whose transaction deadlocked or failed to serialize
+    transaction_retry_attempts: int = 3
+    transaction_retry_base_delay: float = 0.005
+    transaction_retry_max_delay: float = 0.1
+
+    idempotency_cache_enabled: bool = False
+    idempotency_cache_max_size: int = 10000
+    idempotency_cache_ttl_seconds: float = 600.0
+
     class Config:
         env_file = ".env"
         env_prefix = ""
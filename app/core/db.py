@@ -1,18 +1,33 @@
 # app/core/db.py
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.core.config import get_settings
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_options, pool_status
 
 settings = get_settings()
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = create_engine(settings.database_url, poolclass=InstrumentedQueuePool, **pool_options(settings))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# postgresql+psycopg resolves to psycopg's async dialect under create_async_engine
+async_engine = create_async_engine(
+    settings.database_url, poolclass=InstrumentedAsyncQueuePool, **pool_options(settings)
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+def get_pool_stats():
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.sync_engine.pool),
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -23,3 +38,15 @@ def get_db():
         raise
     finally:
         db.close()
+
+
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
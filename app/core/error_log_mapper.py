@@ -210,3 +210,25 @@ class LedgerErrorLogMapper:
             "current_status": current_status,
             "request_id": request_id,
         }
+
+    @staticmethod
+    def idempotency_key_reused(
+        *,
+        account_id: int,
+        asset: str,
+        amount: str,
+        request_id: str,
+        idempotency_key: str,
+        operation: str,
+    ) -> Dict:
+        return {
+            "operation": operation,
+            "error_type": "IDEMPOTENCY_KEY_REUSED",
+            "error_code": "LEDGER_011",
+            "impact": "none",
+            "account_id": account_id,
+            "asset": asset,
+            "amount": amount,
+            "request_id": request_id,
+            "idempotency_key": idempotency_key,
+        }
@@ -1,50 +1,49 @@
 from fastapi import HTTPException
 from starlette.requests import Request
 
-from app.core.ledger_logger import LedgerErrorLogger
-from app.ledger.schemas import request
 
+class LedgerRejection(HTTPException):
+    """A 409 business-rule rejection.
 
-class InsufficientFunds(HTTPException):
-    def __init__(self, request: Request, payload, message="Insufficient funds"):
-        self.message = message
-        super().__init__(detail=self.message, status_code=409)
-
-        self.ledger_log_error = LedgerErrorLogger(__name__, request)
-        self.ledger_log_error.insufficient_funds(**payload)
+    Construction is side-effect free: the rejection is logged by ``ledger_rejection_handler``
+    once the request's transaction has been rolled back, through the matching
+    ``LedgerErrorLogger`` method named by ``log_event``.
+    """
 
+    log_event: str = ""
+    default_message: str = ""
 
-class LockExceedsAvailable(HTTPException):
-    def __init__(self, request: Request, payload, message="Lock exceeds available funds"):
-        self.message = message
+    def __init__(self, request: Request, payload, message=None):
+        self.message = message or self.default_message
+        self.payload = payload
         super().__init__(detail=self.message, status_code=409)
 
-        self.ledger_log_error = LedgerErrorLogger(__name__, request)
-        self.ledger_log_error.lock_exceeds_available(**payload)
 
+class InsufficientFunds(LedgerRejection):
+    log_event = "insufficient_funds"
+    default_message = "Insufficient funds"
 
-class UnlockExceedsLocked(HTTPException):
-    def __init__(self, request: Request, payload, message="Unlock exceeds locked funds"):
-        self.message = message
-        super().__init__(detail=self.message, status_code=409)
 
-        self.ledger_log_error = LedgerErrorLogger(__name__, request)
-        self.ledger_log_error.unlock_exceeds_locked(**payload)
+class LockExceedsAvailable(LedgerRejection):
+    log_event = "lock_exceeds_available"
+    default_message = "Lock exceeds available funds"
 
 
-class SettleExceedsLocked(HTTPException):
-    def __init__(self, request: Request, payload, message="Settle exceeds locked funds"):
-        self.message = message
-        super().__init__(detail=self.message, status_code=409)
+class UnlockExceedsLocked(LedgerRejection):
+    log_event = "unlock_exceeds_locked"
+    default_message = "Unlock exceeds locked funds"
 
-        self.ledger_log_error = LedgerErrorLogger(__name__, request)
-        self.ledger_log_error.settle_exceeds_locked(**payload)
 
+class SettleExceedsLocked(LedgerRejection):
+    log_event = "settle_exceeds_locked"
+    default_message = "Settle exceeds locked funds"
+
+
+class InvalidSettlementState(LedgerRejection):
+    log_event = "invalid_settlement_state"
+    default_message = "Invalid settlement state"
 
-class InvalidSettlementState(HTTPException):
-    def __init__(self, request: Request, payload, message="Invalid settlement state"):
-        self.message = message
-        super().__init__(detail=self.message, status_code=409)
 
-        self.ledger_log_error = LedgerErrorLogger(__name__, request)
-        self.ledger_log_error.invalid_settlement_state(**payload)
+class IdempotencyKeyReused(LedgerRejection):
+    log_event = "idempotency_key_reused"
+    default_message = "Idempotency key reused with a different payload"
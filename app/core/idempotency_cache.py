@@ -0,0 +1,108 @@
+# app/core/idempotency_cache.py
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.exceptions import IdempotencyKeyReused
+from app.core.ledger_metrics import ledger_metrics
+
+settings = get_settings()
+
+_PENDING_KEY = "idempotency_pending"
+_REPLAYED_KEY = "idempotency_replayed"
+
+
+class IdempotencyCache:
+    """Per-worker LRU of committed responses keyed by idempotency_key.
+
+    Responses are staged on the request's session and only become visible once that
+    session commits, so a rolled-back request is never replayed from memory. Only applied
+    operations are cached: a database replay answers with the recorded event whatever the
+    payload, so caching its fingerprint would let a mismatched retry claim the key.
+    """
+
+    def __init__(self, enabled: bool, max_size: int, ttl_seconds: Optional[float]):
+        self.enabled = enabled
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.conflicts = 0
+
+    @staticmethod
+    def fingerprint(operation: str, payload: BaseModel) -> str:
+        body = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{operation}:{body}".encode()).hexdigest()
+
+    def get(self, request: Request, operation: str, payload: BaseModel) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        entry = self._cache.get(payload.idempotency_key)
+        if entry is None:
+            return None
+
+        fingerprint, response = entry
+        if fingerprint != self.fingerprint(operation, payload):
+            self.conflicts += 1
+            ledger_metrics.rejections.inc(operation, IdempotencyKeyReused.__name__)
+            raise IdempotencyKeyReused(
+                request=request,
+                payload={
+                    "account_id": payload.account_id,
+                    "asset": payload.asset,
+                    "amount": payload.amount,
+                    "idempotency_key": payload.idempotency_key,
+                    "operation": operation,
+                },
+            )
+        ledger_metrics.replays.inc(operation, "cache")
+        return response
+
+    @staticmethod
+    def mark_replayed(db: Session, idempotency_key: str) -> None:
+        """Record that this session answered ``idempotency_key`` from an already recorded event."""
+        db.info.setdefault(_REPLAYED_KEY, set()).add(idempotency_key)
+
+    def store_after_commit(self, db: Session, operation: str, payload: BaseModel, response: Any) -> None:
+        if not self.enabled or payload.idempotency_key in db.info.get(_REPLAYED_KEY, ()):
+            return
+        entry = (self.fingerprint(operation, payload), response)
+        db.info.setdefault(_PENDING_KEY, []).append((payload.idempotency_key, entry))
+
+    def publish(self, entries) -> None:
+        for idempotency_key, entry in entries:
+            self._cache.set(idempotency_key, entry)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.conflicts = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._cache.stats(), "conflicts": self.conflicts}
+
+
+idempotency_cache = IdempotencyCache(
+    enabled=settings.idempotency_cache_enabled,
+    max_size=settings.idempotency_cache_max_size,
+    ttl_seconds=settings.idempotency_cache_ttl_seconds,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_responses(session):
+    if session.in_nested_transaction():
+        return
+    idempotency_cache.publish(session.info.pop(_PENDING_KEY, []))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_responses(session, transaction):
+    if transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_REPLAYED_KEY, None)
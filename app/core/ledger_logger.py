@@ -1,72 +1,73 @@
 # app/core/ledger_logger.py
+import functools
 import logging
 
-from starlette.requests import Request
-
 from app.core.error_log_mapper import LedgerErrorLogMapper
 from app.core.log_mapper import LedgerLogMapper
 from app.core.logger import ContextLogger
+from app.core.request_context import get_request_id
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(logger_name: str) -> ContextLogger:
+    """One ContextLogger per logger name, shared by every LedgerLogger/LedgerErrorLogger instance."""
+    return ContextLogger(logging.getLogger(logger_name), {})
 
 
-class LedgerLogger:
-    def __init__(self, logger_name: str, request: Request):
-        self._logger = logging.getLogger(logger_name)
-        self.request = request
+class _MappedLogger:
+    def __init__(self, logger_name: str):
+        self._logger = _adapter(logger_name)
 
+    def _emit(self, level: int, message: str, mapper, kwargs: dict):
+        # the mapper (dict building, Decimal -> str) only runs when the record will be emitted
+        if self._logger.isEnabledFor(level):
+            self._logger.log(level, message, extra=mapper(**kwargs, request_id=get_request_id()))
+
+
+class LedgerLogger(_MappedLogger):
     def deposit(self, **kwargs):
-        data = LedgerLogMapper.deposit(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).info("deposit")
+        self._emit(logging.INFO, "deposit", LedgerLogMapper.deposit, kwargs)
 
     def lock(self, **kwargs):
-        data = LedgerLogMapper.lock(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).info("lock")
+        self._emit(logging.INFO, "lock", LedgerLogMapper.lock, kwargs)
 
     def withdraw(self, **kwargs):
-        data = LedgerLogMapper.withdraw(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).info("withdraw")
+        self._emit(logging.INFO, "withdraw", LedgerLogMapper.withdraw, kwargs)
 
+    def transfer(self, **kwargs):
+        self._emit(logging.INFO, "transfer", LedgerLogMapper.transfer, kwargs)
 
-class LedgerErrorLogger:
-    def __init__(self, logger_name: str, request: Request):
-        self._logger = logging.getLogger(logger_name)
-        self.request = request
 
+class LedgerErrorLogger(_MappedLogger):
     def insufficient_funds(self, **kwargs):
-        data = LedgerErrorLogMapper.insufficient_funds(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("insufficient_funds")
+        self._emit(logging.WARNING, "insufficient_funds", LedgerErrorLogMapper.insufficient_funds, kwargs)
 
     def negative_amount(self, **kwargs):
-        data = LedgerErrorLogMapper.negative_amount(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("negative_amount")
+        self._emit(logging.WARNING, "negative_amount", LedgerErrorLogMapper.negative_amount, kwargs)
 
     def invalid_asset(self, **kwargs):
-        data = LedgerErrorLogMapper.invalid_asset(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("invalid_asset")
+        self._emit(logging.WARNING, "invalid_asset", LedgerErrorLogMapper.invalid_asset, kwargs)
 
     def balance_not_found(self, **kwargs):
-        data = LedgerErrorLogMapper.balance_not_found(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("balance_not_found")
+        self._emit(logging.WARNING, "balance_not_found", LedgerErrorLogMapper.balance_not_found, kwargs)
 
     def invalid_operation(self, **kwargs):
-        data = LedgerErrorLogMapper.invalid_operation(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("invalid_operation")
+        self._emit(logging.WARNING, "invalid_operation", LedgerErrorLogMapper.invalid_operation, kwargs)
 
     def lock_exceeds_available(self, **kwargs):
-        data = LedgerErrorLogMapper.lock_exceeds_available(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("lock_exceeds_available")
+        self._emit(logging.WARNING, "lock_exceeds_available", LedgerErrorLogMapper.lock_exceeds_available, kwargs)
 
     def unlock_exceeds_locked(self, **kwargs):
-        data = LedgerErrorLogMapper.unlock_exceeds_locked(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("unlock_exceeds_locked")
+        self._emit(logging.WARNING, "unlock_exceeds_locked", LedgerErrorLogMapper.unlock_exceeds_locked, kwargs)
 
     def settle_exceeds_locked(self, **kwargs):
-        data = LedgerErrorLogMapper.settle_exceeds_locked(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("settle_exceeds_locked")
+        self._emit(logging.WARNING, "settle_exceeds_locked", LedgerErrorLogMapper.settle_exceeds_locked, kwargs)
 
     def event_exists(self, **kwargs):
-        data = LedgerErrorLogMapper.event_exists(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("event_exists")
+        self._emit(logging.WARNING, "event_exists", LedgerErrorLogMapper.event_exists, kwargs)
 
     def invalid_settlement_state(self, **kwargs):
-        data = LedgerErrorLogMapper.invalid_settlement_state(**kwargs, request_id=self.request.state.request_id)
-        ContextLogger(self._logger, data).warning("invalid_settlement_state")
+        self._emit(logging.WARNING, "invalid_settlement_state", LedgerErrorLogMapper.invalid_settlement_state, kwargs)
+
+    def idempotency_key_reused(self, **kwargs):
+        self._emit(logging.WARNING, "idempotency_key_reused", LedgerErrorLogMapper.idempotency_key_reused, kwargs)
@@ -0,0 +1,128 @@
+# app/core/ledger_metrics.py
+import functools
+import time
+from typing import Dict, List
+
+from fastapi import HTTPException
+
+from app.core.metrics import Counter, Gauge, LabeledHistogram, render_histogram, render_prometheus
+
+_POOL_GAUGES = ("size", "checked_in", "checked_out", "overflow")
+_POOL_COUNTERS = ("checkouts", "checkout_timeouts")
+
+
+class LedgerMetrics:
+    """Process-wide counters and latency histograms served by ``GET /metrics``."""
+
+    def __init__(self):
+        self.operations = Counter(
+            "ledger_operations_total", "Ledger operations by outcome.", labelnames=("operation", "outcome")
+        )
+        self.duration = LabeledHistogram(
+            "ledger_operation_duration_seconds", "Service time of ledger operations.", labelnames=("operation",)
+        )
+        self.replays = Counter(
+            "ledger_idempotent_replays_total",
+            "Requests answered from an already recorded idempotency key.",
+            labelnames=("operation", "source"),
+        )
+        self.rejections = Counter(
+            "ledger_rejections_total", "409 rejections by exception class.", labelnames=("operation", "exception")
+        )
+        self.log_records_dropped = Counter(
+            "ledger_log_records_dropped_total", "Log records dropped by a full log queue.", labelnames=("level",)
+        )
+        self.transaction_retries = Counter(
+            "ledger_transaction_retries_total",
+            "Requests re-run after a deadlock or serialization failure.",
+            labelnames=("reason",),
+        )
+        self.transaction_retries_exhausted = Counter(
+            "ledger_transaction_retries_exhausted_total",
+            "Requests that still failed after the last retry.",
+            labelnames=("reason",),
+        )
+        self.balance_write_conflicts = Counter(
+            "ledger_balance_write_conflicts_total",
+            "Optimistic balance writes that lost the version race.",
+            labelnames=("resolution",),
+        )
+        self.coalesced_deposits = Counter(
+            "ledger_coalesced_deposits_total", "Deposits applied through the group-commit coalescer."
+        )
+        self.deposit_groups = Counter(
+            "ledger_deposit_groups_total", "Transactions run by the deposit coalescer, one per group."
+        )
+        self.in_flight = Gauge("ledger_http_requests_in_flight", "HTTP requests currently being served.")
+
+    def observe(self, operation: str, outcome: str, seconds: float) -> None:
+        self.operations.inc(operation, outcome)
+        self.duration.labels(operation).observe(seconds)
+
+    def reject(self, operation: str, exc: Exception) -> None:
+        self.rejections.inc(operation, type(exc).__name__)
+
+    def render(self, pool_stats: Dict[str, Dict]) -> str:
+        text = render_prometheus(
+            [
+                self.operations,
+                self.duration,
+                self.replays,
+                self.rejections,
+                self.log_records_dropped,
+                self.transaction_retries,
+                self.transaction_retries_exhausted,
+                self.balance_write_conflicts,
+                self.coalesced_deposits,
+                self.deposit_groups,
+                self.in_flight,
+            ]
+        )
+        return text + _render_pool_stats(pool_stats)
+
+
+def _render_pool_stats(pool_stats: Dict[str, Dict]) -> str:
+    lines: List[str] = []
+    for field in _POOL_GAUGES:
+        lines.append(f"# TYPE ledger_db_pool_{field} gauge")
+        lines.extend(f'ledger_db_pool_{field}{{pool="{pool}"}} {status[field]}' for pool, status in pool_stats.items())
+    for field in _POOL_COUNTERS:
+        lines.append(f"# TYPE ledger_db_pool_{field}_total counter")
+        lines.extend(
+            f'ledger_db_pool_{field}_total{{pool="{pool}"}} {status[field]}'
+            for pool, status in pool_stats.items()
+            if field in status
+        )
+    lines.append("# TYPE ledger_db_pool_wait_seconds histogram")
+    for pool, status in pool_stats.items():
+        if "wait_seconds" in status:
+            lines.extend(render_histogram("ledger_db_pool_wait_seconds", ("pool",), (pool,), status["wait_seconds"]))
+    return "\n".join(lines) + "\n"
+
+
+ledger_metrics = LedgerMetrics()
+
+
+def observe_operation(operation: str):
+    """Count and time a service method; 409s are also counted per exception class."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(*args, **kwargs)
+                outcome = "success"
+                return result
+            except HTTPException as exc:
+                if exc.status_code == 409:
+                    outcome = "rejected"
+                    ledger_metrics.reject(operation, exc)
+                raise
+            finally:
+                ledger_metrics.observe(operation, outcome, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
@@ -47,5 +47,27 @@ class LedgerLogMapper:
             "success": True,
         }
 
+    @staticmethod
+    def transfer(
+        *,
+        account_id: int,
+        to_account_id: int,
+        asset: str,
+        amount: Decimal,
+        request_id: str,
+        idempotency_key: str,
+        reference_id: str = None,
+    ) -> Dict:
+        return {
+            "operation": "transfer",
+            "account_id": account_id,
+            "to_account_id": to_account_id,
+            "asset": asset,
+            "amount": str(amount),
+            "request_id": request_id,
+            "idempotency_key": idempotency_key,
+            "reference_id": reference_id,
+        }
+
     class Config:
         extra = "ignore"
@@ -1,19 +1,51 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
 from pythonjsonlogger import jsonlogger
 
 from app.core.config import get_settings
+from app.core.ledger_metrics import ledger_metrics
 
 settings = get_settings()
 
 LOG_LEVEL = getattr(logging, settings.log_level.upper(), logging.INFO)
 
+_listener: QueueListener | None = None
 
-def setup_logging():
-    logger = logging.getLogger()
-    logger.setLevel(LOG_LEVEL)
 
+class BoundedQueueHandler(QueueHandler):
+    """Hands records to a background QueueListener through a bounded queue.
+
+    With policy ``"drop"`` a full queue drops the record immediately; with ``"block"`` the
+    caller waits up to ``block_timeout`` seconds for room before dropping. Formatting happens
+    on the listener thread, so the request thread only pays for the enqueue.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop", block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        if policy not in ("drop", "block"):
+            raise ValueError(f"unknown log queue policy: {policy}")
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # in-process queue: the record does not need to be pickled, so skip the eager format
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            ledger_metrics.log_records_dropped.inc(record.levelname)
+
+
+def _stream_handler() -> logging.Handler:
     handler = logging.StreamHandler(sys.stdout)
 
     formatter = jsonlogger.JsonFormatter(
@@ -21,9 +53,39 @@ def setup_logging():
     )
 
     handler.setFormatter(formatter)
+    return handler
+
+
+def setup_logging():
+    global _listener
+
+    logger = logging.getLogger()
+    logger.setLevel(LOG_LEVEL)
+
+    shutdown_logging()
+    handler = _stream_handler()
+    if settings.log_queue_enabled:
+        log_queue = queue.Queue(maxsize=settings.log_queue_max_size)
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        handler = BoundedQueueHandler(
+            log_queue, policy=settings.log_queue_policy, block_timeout=settings.log_queue_block_timeout
+        )
 
     logger.handlers = []
     logger.addHandler(handler)
 
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+
+def shutdown_logging():
+    """Flush and stop the background writer, if queue mode is on."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
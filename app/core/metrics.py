@@ -0,0 +1,143 @@
+# app/core/metrics.py
+import bisect
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# seconds; tuned for DB/HTTP latencies of a single ledger operation
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus semantics: cumulative ``le`` buckets)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+
+class Counter:
+    """Monotonic counter per tuple of label values.
+
+    ``inc`` is a single dict update under an uncontended lock, cheap enough for the hot path.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class LabeledHistogram:
+    """One Histogram per tuple of label values, created on first use."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labels: str) -> Histogram:
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, Histogram(self.buckets))
+        return child
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], Histogram]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+def _format_labels(labelnames: Sequence[str], labels: Sequence[str], **extra: str) -> str:
+    pairs = list(zip(labelnames, labels)) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_histogram(name: str, labelnames: Sequence[str], labels: Sequence[str], snapshot: Dict) -> List[str]:
+    lines = [
+        f"{name}_bucket{_format_labels(labelnames, labels, le=_format_bound(bound))} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_format_labels(labelnames, labels)} {snapshot['count']}")
+    return lines
+
+
+def render_prometheus(metrics: Iterable) -> str:
+    """Prometheus text exposition (format 0.0.4) for Counter, Gauge and LabeledHistogram instances."""
+    lines: List[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        if isinstance(metric, Counter):
+            lines.append(f"# TYPE {metric.name} counter")
+            for labels, value in metric.samples():
+                lines.append(f"{metric.name}{_format_labels(metric.labelnames, labels)} {value}")
+        elif isinstance(metric, Gauge):
+            lines.append(f"# TYPE {metric.name} gauge")
+            lines.append(f"{metric.name} {metric.value}")
+        elif isinstance(metric, LabeledHistogram):
+            lines.append(f"# TYPE {metric.name} histogram")
+            for labels, histogram in metric.samples():
+                lines.extend(render_histogram(metric.name, metric.labelnames, labels, histogram.snapshot()))
+    return "\n".join(lines) + "\n"
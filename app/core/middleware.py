@@ -1,16 +1,81 @@
 import logging
 import uuid
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.ledger_metrics import ledger_metrics
+from app.core.profiling import install_query_listeners, start_profile
+from app.core.request_context import request_id_var
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-Id", str(uuid.uuid4()))
+logger = logging.getLogger(__name__)
 
-        request.state.request_id = request_id
 
-        response = await call_next(request)
-        response.headers["X-Request-Id"] = request_id
-        return response
+class RequestContextMiddleware:
+    """Pure ASGI middleware: assigns the request id and echoes it back as ``X-Request-Id``.
+
+    The id is stored in ``scope["state"]`` (so ``request.state.request_id`` keeps working) and in
+    ``request_id_var`` for code that has no access to the Request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id") or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-Id"] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        ledger_metrics.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            ledger_metrics.in_flight.dec()
+            request_id_var.reset(token)
+
+
+class RequestProfilerMiddleware:
+    """Opt-in per-request SQL statement count, DB time, lock-wait and handler time.
+
+    Must run inside RequestContextMiddleware so the request id is set. Handler time is
+    measured up to the start of the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        install_query_listeners()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = start_profile(request_id_var.get())
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                profile.finish()
+                MutableHeaders(scope=message)["Server-Timing"] = profile.server_timing()
+                route = scope.get("route")
+                logger.info(
+                    "request_profile",
+                    extra={
+                        "request_id": profile.request_id,
+                        "method": scope["method"],
+                        "route": getattr(route, "path", scope["path"]),
+                        "status_code": message["status"],
+                        **profile.as_log_fields(),
+                    },
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,80 @@
+# app/core/pool.py
+import time
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings
+from app.core.metrics import Histogram
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds = Histogram()
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout (including time spent queued for a free connection)."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.checkout_timeouts += 1
+            raise
+        finally:
+            self.stats.wait_seconds.observe(time.perf_counter() - start)
+        self.stats.checkouts += 1
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+
+def pool_options(settings: Settings) -> Dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def pool_status(pool) -> Dict:
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    stats = getattr(pool, "stats", None)
+    if stats:
+        status.update(
+            {
+                "checkouts": stats.checkouts,
+                "checkout_timeouts": stats.checkout_timeouts,
+                "wait_seconds": stats.wait_seconds.snapshot(),
+            }
+        )
+    return status
@@ -0,0 +1,96 @@
+# app/core/profiling.py
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# statements that take row locks: their duration is an upper bound on the time spent waiting for them
+_LOCKING_STATEMENT = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+)?UPDATE\b|^\s*UPDATE\b|\bON\s+CONFLICT\b.*\bDO\s+UPDATE\b", re.I | re.S
+)
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+_installed = False
+
+
+class RequestProfile:
+    """SQL and wall-clock cost of a single HTTP request."""
+
+    __slots__ = ("request_id", "started", "finished", "statements", "db_seconds", "lock_seconds")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.lock_seconds = 0.0
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.db_seconds += elapsed
+        if _LOCKING_STATEMENT.search(statement):
+            self.lock_seconds += elapsed
+
+    def finish(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def handler_seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def as_log_fields(self):
+        return {
+            "db_statements": self.statements,
+            "db_time_ms": round(self.db_seconds * 1000, 3),
+            "lock_wait_ms": round(self.lock_seconds * 1000, 3),
+            "handler_time_ms": round(self.handler_seconds * 1000, 3),
+        }
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            [
+                f'db;dur={self.db_seconds * 1000:.3f};desc="{self.statements} statements"',
+                f"lock;dur={self.lock_seconds * 1000:.3f}",
+                f"app;dur={self.handler_seconds * 1000:.3f}",
+            ]
+        )
+
+
+def start_profile(request_id: str) -> RequestProfile:
+    profile = RequestProfile(request_id)
+    _current_profile.set(profile)
+    return profile
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_profile.get() is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profile_started", None)
+    if profile is not None and started is not None:
+        profile.record(statement, time.perf_counter() - started)
+
+
+def install_query_listeners() -> None:
+    """Attach the cursor hooks to every Engine (sync, and the sync side of async engines).
+
+    The hooks are no-ops outside a profiled request, but they are only installed when
+    profiling is enabled so the default deployment pays nothing for them.
+    """
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
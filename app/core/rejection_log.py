@@ -0,0 +1,95 @@
+# app/core/rejection_log.py
+import logging
+import threading
+import time
+from typing import Hashable
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.responses import JSONResponse
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.exceptions import LedgerRejection
+from app.core.ledger_logger import LedgerErrorLogger
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "rejections_pending"
+
+
+class RejectionLog:
+    """Rate-limited logging of 409 rejections.
+
+    At most ``burst`` records per (account, rejection class) are written in each
+    ``window_seconds``; the rest are counted and reported as ``suppressed`` on the next
+    record that gets through (a separate ``rejections_suppressed`` line), so a client hammering a rejected operation costs one dict
+    lookup per request instead of one log line.
+    """
+
+    def __init__(self, burst: int, window_seconds: float, max_keys: int = 10000):
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self._windows = TTLCache(max_size=max_keys)
+        self._lock = threading.Lock()
+        self._logger = LedgerErrorLogger(__name__)
+
+    @staticmethod
+    def _key(exc: LedgerRejection) -> Hashable:
+        return exc.payload.get("account_id", exc.payload.get("settlement_id")), type(exc).__name__
+
+    def _admit(self, key: Hashable) -> int | None:
+        """Return the number of records suppressed since the last admitted one, or None to drop."""
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                self._windows.set(key, [now, 1, 0])
+                return suppressed
+            if window[1] < self.burst:
+                window[1] += 1
+                suppressed, window[2] = window[2], 0
+                return suppressed
+            window[2] += 1
+            return None
+
+    def record(self, exc: LedgerRejection) -> bool:
+        key = self._key(exc)
+        suppressed = self._admit(key)
+        if suppressed is None:
+            return False
+        if suppressed:
+            logger.warning(
+                "rejections_suppressed",
+                extra={"account_id": key[0], "error": key[1], "suppressed": suppressed},
+            )
+        getattr(self._logger, exc.log_event)(**exc.payload)
+        return True
+
+    def record_after_transaction(self, db: Session, exc: LedgerRejection) -> None:
+        """For rejections that are reported instead of raised: log once the transaction ends."""
+        db.info.setdefault(_PENDING_KEY, []).append(exc)
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+
+rejection_log = RejectionLog(burst=settings.rejection_log_burst, window_seconds=settings.rejection_log_window_seconds)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _log_pending_rejections(session, transaction):
+    if transaction.parent is not None:
+        return
+    for exc in session.info.pop(_PENDING_KEY, ()):
+        rejection_log.record(exc)
+
+
+async def ledger_rejection_handler(request: Request, exc: LedgerRejection):
+    # by the time the handler runs, get_db/get_async_db has already rolled back and released the rows
+    rejection_log.record(exc)
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
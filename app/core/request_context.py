@@ -0,0 +1,11 @@
+# app/core/request_context.py
+from contextvars import ContextVar
+from typing import Optional
+
+# set by RequestContextMiddleware for the lifetime of each HTTP request; propagates into
+# threadpool-run sync endpoints and into AsyncSession.run_sync greenlets
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_var.get()
@@ -0,0 +1,70 @@
+# app/core/retry.py
+import asyncio
+import logging
+import random
+from typing import Callable, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy.exc import DBAPIError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import get_settings
+from app.core.ledger_metrics import ledger_metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# SQLSTATEs after which Postgres has rolled the transaction back and running it again is safe
+RETRYABLE_SQLSTATES = {"40001": "serialization_failure", "40P01": "deadlock_detected"}
+
+
+def retryable_reason(exc: BaseException) -> Optional[str]:
+    if isinstance(exc, DBAPIError):
+        return RETRYABLE_SQLSTATES.get(getattr(exc.orig, "sqlstate", None))
+    return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full jitter: uniform in [0, base * 2**attempt], capped, so retrying peers spread out."""
+    ceiling = min(settings.transaction_retry_max_delay, settings.transaction_retry_base_delay * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+class RetryingRoute(APIRoute):
+    """Re-runs the whole handler, ``get_db`` included, when its transaction hit a deadlock or a
+    serialization failure.
+
+    The handler owns the transaction (``get_db`` commits when it exits), so each attempt starts
+    from a fresh session; the request body is cached on the Request and is read again for free.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def retrying_handler(request: Request) -> Response:
+            attempt = 0
+            while True:
+                try:
+                    return await handler(request)
+                except DBAPIError as exc:
+                    reason = retryable_reason(exc)
+                    if reason is None:
+                        raise
+                    if attempt >= settings.transaction_retry_attempts:
+                        ledger_metrics.transaction_retries_exhausted.inc(reason)
+                        raise
+                    attempt += 1
+                    ledger_metrics.transaction_retries.inc(reason)
+                    logger.info(
+                        "transaction_retry",
+                        extra={
+                            "request_id": request.state.request_id,
+                            "route": self.path,
+                            "reason": reason,
+                            "attempt": attempt,
+                        },
+                    )
+                    await asyncio.sleep(backoff_delay(attempt))
+
+        return retrying_handler
@@ -0,0 +1,72 @@
+"""Ledger maintenance commands.
+
+    python -m app.ledger.cli snapshot checkpoint [--window N] [--yield-per N]
+    python -m app.ledger.cli snapshot verify [--account-id ID] [--limit N]
+    python -m app.ledger.cli snapshot rebuild
+    python -m app.ledger.cli reconcile [--processes N] [--partition-size N] [--state FILE] [--restart]
+"""
+import argparse
+import json
+import sys
+
+from app.core.db import SessionLocal
+from app.ledger.services.reconciliation import reconcile
+from app.ledger.services.snapshot import SnapshotService
+
+
+def _snapshot(args) -> int:
+    with SessionLocal() as db:
+        service = SnapshotService(db, window=args.window, yield_per=args.yield_per)
+        if args.action == "checkpoint":
+            print(json.dumps(service.checkpoint()))
+            return 0
+        if args.action == "rebuild":
+            print(json.dumps(service.rebuild()))
+            return 0
+
+        mismatches = 0
+        for mismatch in service.verify(account_id=args.account_id):
+            mismatches += 1
+            if args.limit is None or mismatches <= args.limit:
+                print(json.dumps(mismatch, default=str))
+        print(json.dumps({"mismatches": mismatches}), file=sys.stderr)
+        return 1 if mismatches else 0
+
+
+def _reconcile(args) -> int:
+    summary = reconcile(
+        partition_size=args.partition_size,
+        processes=args.processes,
+        state_path=args.state,
+        restart=args.restart,
+        on_mismatch=lambda mismatch: print(json.dumps(mismatch, default=str), flush=True),
+    )
+    print(json.dumps(summary), file=sys.stderr)
+    return 1 if summary["mismatches"] else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.ledger.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="balance snapshots built from the event log")
+    snapshot.add_argument("action", choices=["checkpoint", "verify", "rebuild"])
+    snapshot.add_argument("--window", type=int, default=1_000_000, help="event ids per checkpoint transaction")
+    snapshot.add_argument("--yield-per", type=int, default=5_000, help="rows fetched per server-side cursor round trip")
+    snapshot.add_argument("--account-id", type=int, help="verify a single account")
+    snapshot.add_argument("--limit", type=int, help="print at most this many mismatches")
+    snapshot.set_defaults(handler=_snapshot)
+
+    reconciliation = commands.add_parser("reconcile", help="audit every balance row against its events")
+    reconciliation.add_argument("--processes", type=int, default=1)
+    reconciliation.add_argument("--partition-size", type=int, default=10_000, help="account ids per partition")
+    reconciliation.add_argument("--state", help="progress file; a rerun skips the partitions it lists")
+    reconciliation.add_argument("--restart", action="store_true", help="ignore the progress file and start over")
+    reconciliation.set_defaults(handler=_reconcile)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
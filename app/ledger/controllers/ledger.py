@@ -1,14 +1,33 @@
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from starlette.requests import Request
 
 from app.core.db import get_db
+from app.core.idempotency_cache import idempotency_cache
+from app.core.retry import RetryingRoute
 from app.ledger import schemas
 from app.ledger.services.ledger import LedgerService
 
-router = APIRouter(prefix="/ledger", tags=["ledger"])
+router = APIRouter(prefix="/ledger", tags=["ledger"], route_class=RetryingRoute)
+
+
+def _balances_response(account_id: int, asset: str, bal) -> schemas.BalancesResponse:
+    return schemas.BalancesResponse(
+        account_id=account_id,
+        balances={asset: schemas.BalanceOut(available=Decimal(bal.available), locked=Decimal(bal.locked))},
+    )
+
+
+def _transfer_response(payload: schemas.TransferRequest, source, target) -> schemas.TransferResponse:
+    return schemas.TransferResponse(
+        account_id=payload.account_id,
+        to_account_id=payload.to_account_id,
+        asset=payload.asset,
+        balance=schemas.BalanceOut(available=Decimal(source.available), locked=Decimal(source.locked)),
+        to_balance=schemas.BalanceOut(available=Decimal(target.available), locked=Decimal(target.locked)),
+    )
 
 
 @router.get("/balances", response_model=schemas.BalancesResponse)
@@ -18,18 +37,39 @@ def get_balances(account_id: int, request: Request, db: Session = Depends(get_db
     return schemas.BalancesResponse(account_id=account_id, balances=balances)
 
 
+@router.get("/events", response_model=schemas.EventPage)
+def list_events(
+    account_id: int,
+    request: Request,
+    asset: str | None = None,
+    event_type: str | None = None,
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    service = LedgerService(db, request=request)
+    return service.list_events(account_id, asset=asset, event_type=event_type, after_id=after_id, limit=limit)
+
+
 @router.post("/lock")
 def lock(payload: schemas.LockIn, request: Request, db: Session = Depends(get_db)):
+    cached = idempotency_cache.get(request, "lock", payload)
+    if cached is not None:
+        return cached
+
     service = LedgerService(db, request)
     _, bal = service.lock_funds(payload=payload)
-    return schemas.BalancesResponse(
-        account_id=payload.account_id,
-        balances={payload.asset: schemas.BalanceOut(available=Decimal(bal.available), locked=Decimal(bal.locked))},
-    )
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db, "lock", payload, response)
+    return response
 
 
 @router.post("/unlock")
 def unlock(payload: schemas.Unlock, request: Request, db: Session = Depends(get_db)):
+    cached = idempotency_cache.get(request, "unlock", payload)
+    if cached is not None:
+        return cached
+
     service = LedgerService(db, request)
     _, bal = service.unlock_funds(
         idempotency_key=payload.idempotency_key,
@@ -38,14 +78,17 @@ def unlock(payload: schemas.Unlock, request: Request, db: Session = Depends(get_
         amount=payload.amount,
         reference_id=payload.reference_id,
     )
-    return schemas.BalancesResponse(
-        account_id=payload.account_id,
-        balances={payload.asset: schemas.BalanceOut(available=Decimal(bal.available), locked=Decimal(bal.locked))},
-    )
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db, "unlock", payload, response)
+    return response
 
 
 @router.post("/deposit")
 def deposit(payload: schemas.DepositRequest, request: Request, db: Session = Depends(get_db)):
+    cached = idempotency_cache.get(request, "deposit", payload)
+    if cached is not None:
+        return cached
+
     service = LedgerService(db, request)
     _, bal = service.deposit(
         idempotency_key=payload.idempotency_key,
@@ -54,14 +97,17 @@ def deposit(payload: schemas.DepositRequest, request: Request, db: Session = Dep
         amount=payload.amount,
         reference_id=payload.reference_id,
     )
-    return schemas.BalancesResponse(
-        account_id=payload.account_id,
-        balances={payload.asset: schemas.BalanceOut(available=Decimal(bal.available), locked=Decimal(bal.locked))},
-    )
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db, "deposit", payload, response)
+    return response
 
 
 @router.post("/withdraw")
 def withdraw(payload: schemas.WithdrawRequest, request: Request, db: Session = Depends(get_db)):
+    cached = idempotency_cache.get(request, "withdraw", payload)
+    if cached is not None:
+        return cached
+
     service = LedgerService(db, request)
     _, bal = service.withdraw(
         idempotency_key=payload.idempotency_key,
@@ -70,7 +116,26 @@ def withdraw(payload: schemas.WithdrawRequest, request: Request, db: Session = D
         amount=payload.amount,
         reference_id=payload.reference_id,
     )
-    return schemas.BalancesResponse(
-        account_id=payload.account_id,
-        balances={payload.asset: schemas.BalanceOut(available=Decimal(bal.available), locked=Decimal(bal.locked))},
-    )
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db, "withdraw", payload, response)
+    return response
+
+
+@router.post("/transfer", response_model=schemas.TransferResponse)
+def transfer(payload: schemas.TransferRequest, request: Request, db: Session = Depends(get_db)):
+    cached = idempotency_cache.get(request, "transfer", payload)
+    if cached is not None:
+        return cached
+
+    service = LedgerService(db, request)
+    _, source, target = service.transfer(payload)
+    response = _transfer_response(payload, source, target)
+    idempotency_cache.store_after_commit(db, "transfer", payload, response)
+    return response
+
+
+@router.post("/batch", response_model=schemas.BatchResponse)
+def batch(payload: schemas.BatchRequest, request: Request, db: Session = Depends(get_db)):
+    service = LedgerService(db, request)
+    results = service.apply_batch(payload.operations, atomic=payload.mode == "atomic")
+    return schemas.BatchResponse(mode=payload.mode, results=results)
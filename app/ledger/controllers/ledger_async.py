@@ -0,0 +1,123 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.core.db import get_async_db
+from app.core.idempotency_cache import idempotency_cache
+from app.core.retry import RetryingRoute
+from app.ledger import schemas
+from app.ledger.controllers.ledger import _balances_response, _transfer_response
+from app.ledger.services.ledger import AsyncLedgerService
+
+router = APIRouter(prefix="/ledger", tags=["ledger"], route_class=RetryingRoute)
+
+
+@router.get("/balances", response_model=schemas.BalancesResponse)
+async def get_balances(account_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncLedgerService(db, request=request)
+    balances = await service.get_balances(account_id)
+    return schemas.BalancesResponse(account_id=account_id, balances=balances)
+
+
+@router.get("/events", response_model=schemas.EventPage)
+async def list_events(
+    account_id: int,
+    request: Request,
+    asset: str | None = None,
+    event_type: str | None = None,
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    service = AsyncLedgerService(db, request=request)
+    return await service.list_events(account_id, asset=asset, event_type=event_type, after_id=after_id, limit=limit)
+
+
+@router.post("/lock")
+async def lock(payload: schemas.LockIn, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = idempotency_cache.get(request, "lock", payload)
+    if cached is not None:
+        return cached
+
+    service = AsyncLedgerService(db, request)
+    _, bal = await service.lock_funds(payload=payload)
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db.sync_session, "lock", payload, response)
+    return response
+
+
+@router.post("/unlock")
+async def unlock(payload: schemas.Unlock, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = idempotency_cache.get(request, "unlock", payload)
+    if cached is not None:
+        return cached
+
+    service = AsyncLedgerService(db, request)
+    _, bal = await service.unlock_funds(
+        idempotency_key=payload.idempotency_key,
+        account_id=payload.account_id,
+        asset=payload.asset,
+        amount=payload.amount,
+        reference_id=payload.reference_id,
+    )
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db.sync_session, "unlock", payload, response)
+    return response
+
+
+@router.post("/deposit")
+async def deposit(payload: schemas.DepositRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = idempotency_cache.get(request, "deposit", payload)
+    if cached is not None:
+        return cached
+
+    service = AsyncLedgerService(db, request)
+    _, bal = await service.deposit(
+        idempotency_key=payload.idempotency_key,
+        account_id=payload.account_id,
+        asset=payload.asset,
+        amount=payload.amount,
+        reference_id=payload.reference_id,
+    )
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db.sync_session, "deposit", payload, response)
+    return response
+
+
+@router.post("/withdraw")
+async def withdraw(payload: schemas.WithdrawRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = idempotency_cache.get(request, "withdraw", payload)
+    if cached is not None:
+        return cached
+
+    service = AsyncLedgerService(db, request)
+    _, bal = await service.withdraw(
+        idempotency_key=payload.idempotency_key,
+        account_id=payload.account_id,
+        asset=payload.asset,
+        amount=payload.amount,
+        reference_id=payload.reference_id,
+    )
+    response = _balances_response(payload.account_id, payload.asset, bal)
+    idempotency_cache.store_after_commit(db.sync_session, "withdraw", payload, response)
+    return response
+
+
+@router.post("/transfer", response_model=schemas.TransferResponse)
+async def transfer(payload: schemas.TransferRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = idempotency_cache.get(request, "transfer", payload)
+    if cached is not None:
+        return cached
+
+    service = AsyncLedgerService(db, request)
+    _, source, target = await service.transfer(payload)
+    response = _transfer_response(payload, source, target)
+    idempotency_cache.store_after_commit(db.sync_session, "transfer", payload, response)
+    return response
+
+
+@router.post("/batch", response_model=schemas.BatchResponse)
+async def batch(payload: schemas.BatchRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncLedgerService(db, request)
+    results = await service.apply_batch(payload.operations, atomic=payload.mode == "atomic")
+    return schemas.BatchResponse(mode=payload.mode, results=results)
@@ -1,5 +1,7 @@
 from .account import Account
 from .balance import Balance
+from .balance_shard import BalanceShard
+from .balance_snapshot import BalanceSnapshot
 from .dominio import Dominio
 from .event import LedgerEvent
 from .settlement import Settlement
@@ -9,6 +11,8 @@ from .assets import Asset
 __all__ = [
     "Account",
     "Balance",
+    "BalanceShard",
+    "BalanceSnapshot",
     "LedgerEvent",
     "Settlement",
     "Dominio",
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, UniqueConstraint, Index
+from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -19,9 +19,13 @@ class Balance(Base):
 
     available: Mapped[Decimal] = mapped_column(Numeric(20, 8), nullable=False, default=0)
     locked: Mapped[str] = mapped_column(Numeric(20, 8), nullable=False, default=0)
+    # bumped by every write; optimistic writers only update the version they read
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
 
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False, onupdate=datetime.now(timezone.utc)
     )
 
-    asset = relationship("Asset", foreign_keys=[id_asset], lazy="subquery")
\ No newline at end of file
+    asset = relationship("Asset", foreign_keys=[id_asset], lazy="select")
+
+    __mapper_args__ = {"version_id_col": version}
\ No newline at end of file
@@ -6,6 +6,7 @@ from sqlalchemy import BIGINT, DateTime, ForeignKey, Numeric, String, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
+from app.ledger.models.dominio import status_registry
 
 
 class BalanceHold(Base):
@@ -30,6 +31,10 @@ class BalanceHold(Base):
         DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False
     )
 
-    asset = relationship("Asset", foreign_keys=[id_asset], lazy="subquery")
+    asset = relationship("Asset", foreign_keys=[id_asset], lazy="select")
 
-    status = relationship("Dominio", foreign_keys=[id_status], lazy="subquery")
+    status = relationship("Dominio", foreign_keys=[id_status], lazy="select")
+
+    @property
+    def status_name(self) -> str | None:
+        return status_registry.name_of(self.id_status)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, ForeignKey, Numeric, SmallInteger, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class BalanceShard(Base):
+    """Credits of a hot (account, asset) not yet swept into its ``balance`` row.
+
+    The spendable balance is ``balance.available`` plus the sum of its shards; spreading credits over
+    several rows lets concurrent deposits to one account commit without waiting on each other.
+    """
+
+    __tablename__ = "balance_shard"
+    __table_args__ = (
+        UniqueConstraint("account_id", "id_asset", "shard", name="uq_balance_shard_account_id_asset_shard"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("account.id"), nullable=False)
+    id_asset: Mapped[int] = mapped_column(ForeignKey("assets.id"), nullable=False)
+    shard: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    available: Mapped[Decimal] = mapped_column(Numeric(20, 8), nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,24 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import BIGINT, DateTime, ForeignKey, Numeric, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class BalanceSnapshot(Base):
+    """Balance of one (account, asset) as derived from every event with ``id <= last_event_id``."""
+
+    __tablename__ = "balance_snapshot"
+    __table_args__ = (UniqueConstraint("account_id", "id_asset", name="uq_balance_snapshot_account_id_asset"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("account.id"), nullable=False)
+    id_asset: Mapped[int] = mapped_column(ForeignKey("assets.id"), nullable=False)
+
+    available: Mapped[Decimal] = mapped_column(Numeric(20, 8), nullable=False, default=0)
+    locked: Mapped[Decimal] = mapped_column(Numeric(20, 8), nullable=False, default=0)
+    last_event_id: Mapped[int] = mapped_column(BIGINT, nullable=False, index=True)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,10 +1,19 @@
+import threading
 import uuid
+from types import MappingProxyType
+from typing import Mapping
 
-from sqlalchemy import String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, event, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.core.db import Base
 
+settings = get_settings()
+
+_PENDING_KEY = "status_registry_pending"
+
 
 class Dominio(Base):
     __tablename__ = "dominio"
@@ -12,3 +21,90 @@ class Dominio(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     nm_dominio: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
     guid: Mapped[str] = mapped_column(String(36), nullable=False, unique=True, default=lambda: str(uuid.uuid4()))
+
+
+class StatusRegistry:
+    """Read-only, in-memory view of the ``dominio`` table.
+
+    The mappings are replaced wholesale on ``load`` so readers never observe a partially
+    refreshed registry and never need a lock. A reload read through a request's session is
+    only published once that session commits (``stage``), so rows the transaction inserted
+    and then rolled back never reach the registry. Lookups that found nothing are remembered
+    for ``miss_ttl_seconds`` so an unknown name does not reload the table on every call.
+    """
+
+    def __init__(self, miss_ttl_seconds: float = 30.0):
+        self._ids: Mapping[str, int] = MappingProxyType({})
+        self._names: Mapping[int, str] = MappingProxyType({})
+        self._misses = TTLCache(max_size=1024, ttl_seconds=miss_ttl_seconds)
+        self._lock = threading.Lock()
+
+    @property
+    def ids(self) -> Mapping[str, int]:
+        return self._ids
+
+    @property
+    def names(self) -> Mapping[int, str]:
+        return self._names
+
+    @staticmethod
+    def read(db: Session) -> tuple[dict[str, int], dict[int, str]]:
+        rows = db.execute(select(Dominio.id, Dominio.nm_dominio).order_by(Dominio.id)).all()
+        ids, names = {}, {}
+        for id_status, nm_dominio in rows:
+            ids.setdefault(nm_dominio, id_status)
+            names[id_status] = nm_dominio
+        return ids, names
+
+    def load(self, db: Session) -> None:
+        """Publish the table as ``db`` sees it right away; ``db`` must only see committed rows."""
+        self.publish(*self.read(db))
+
+    def stage(self, db: Session) -> tuple[dict[str, int], dict[int, str]]:
+        """Read the table through ``db`` and publish it once ``db`` commits; returns what was read."""
+        ids, names = self.read(db)
+        db.info[_PENDING_KEY] = (ids, names)
+        return ids, names
+
+    def publish(self, ids: dict[str, int], names: dict[int, str]) -> None:
+        with self._lock:
+            self._ids = MappingProxyType(ids)
+            self._names = MappingProxyType(names)
+        self._misses.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids = MappingProxyType({})
+            self._names = MappingProxyType({})
+        self._misses.clear()
+
+    def missing(self, key: str | int) -> bool:
+        return self._misses.get(key, False)
+
+    def mark_missing(self, key: str | int) -> None:
+        self._misses.set(key, True)
+
+    def id_of(self, nm_dominio: str) -> int | None:
+        return self._ids.get(nm_dominio)
+
+    def name_of(self, id_status: int) -> str | None:
+        return self._names.get(id_status)
+
+
+status_registry = StatusRegistry(miss_ttl_seconds=settings.status_miss_ttl_seconds)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_statuses(session):
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is not None:
+        status_registry.publish(*pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_statuses(session, transaction):
+    if transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
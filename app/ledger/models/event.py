@@ -9,6 +9,12 @@ from app.core.db import Base
 
 class LedgerEvent(Base):
     __tablename__ = "event"
+    # keyset pagination of one account's history, WHERE account_id = ? [AND id_asset = ?] AND id > ? ORDER BY id:
+    # each shape needs an index that yields its rows already in id order
+    __table_args__ = (
+        Index("ix_event_account_id_id", "account_id", "id"),
+        Index("ix_event_account_id_asset_id", "account_id", "id_asset", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     idempotency_key: Mapped[str] = mapped_column(String(120), nullable=False, unique=True)
@@ -26,4 +32,15 @@ class LedgerEvent(Base):
         DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False
     )
 
-    asset = relationship("Asset", foreign_keys=[id_asset], lazy="subquery")
\ No newline at end of file
+    asset = relationship("Asset", foreign_keys=[id_asset], lazy="select")
+
+# event_type -> (available coefficient, locked coefficient) applied to ``delta``; replaying every
+# event of an (account, asset) through this table reproduces its balance row
+EVENT_BALANCE_EFFECTS = {
+    "deposit": (1, 0),
+    "withdraw": (1, 0),
+    "lock": (1, -1),
+    "unlock": (1, -1),
+    "settlement": (0, 1),
+    "transfer": (1, 0),
+}
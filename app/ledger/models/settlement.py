@@ -5,6 +5,7 @@ from sqlalchemy import DateTime, ForeignKey, Numeric, String, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
+from app.ledger.models.dominio import status_registry
 
 
 class Settlement(Base):
@@ -27,5 +28,9 @@ class Settlement(Base):
     )
     confirmed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    status = relationship("Dominio", foreign_keys=[id_status], lazy="subquery")
-    asset = relationship("Asset", foreign_keys=[id_asset], lazy="subquery")
\ No newline at end of file
+    status = relationship("Dominio", foreign_keys=[id_status], lazy="select")
+    asset = relationship("Asset", foreign_keys=[id_asset], lazy="select")
+
+    @property
+    def status_name(self) -> str | None:
+        return status_registry.name_of(self.id_status)
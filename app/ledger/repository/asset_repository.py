@@ -1,8 +1,68 @@
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.ledger.models import Asset
 
+settings = get_settings()
+
+_PENDING_KEY = "asset_cache_pending"
+
+
+class AssetCache:
+    """Process-wide name<->id cache for the asset catalog.
+
+    Entries resolved inside a session are only published once that session commits,
+    so an asset inserted by a transaction that later rolls back never leaks into the cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._ids = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._names = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def get_id(self, nm_asset: str) -> int | None:
+        return self._ids.get(nm_asset)
+
+    def get_name(self, id_asset: int) -> str | None:
+        return self._names.get(id_asset)
+
+    def put(self, id_asset: int, nm_asset: str) -> None:
+        self._ids.set(nm_asset, id_asset)
+        self._names.set(id_asset, nm_asset)
+
+    def invalidate(self, nm_asset: str) -> None:
+        id_asset = self._ids.get(nm_asset)
+        self._ids.invalidate(nm_asset)
+        if id_asset is not None:
+            self._names.invalidate(id_asset)
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._names.clear()
+
+    def stats(self):
+        return {"by_name": self._ids.stats(), "by_id": self._names.stats()}
+
+
+asset_cache = AssetCache(max_size=settings.asset_cache_max_size, ttl_seconds=settings.asset_cache_ttl_seconds)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_assets(session):
+    if session.in_nested_transaction():
+        return
+    for nm_asset, id_asset in session.info.pop(_PENDING_KEY, {}).items():
+        asset_cache.put(id_asset, nm_asset)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_assets(session, transaction):
+    if transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
+
 
 class AssetRepository:
     """Simple repository to resolve asset names to IDs and create if missing."""
@@ -15,9 +75,51 @@ class AssetRepository:
 
     def get_or_create(self, nm_asset: str) -> Asset:
         asset = self.get_by_name(nm_asset)
-        if asset:
-            return asset
-        asset = Asset(nm_asset=nm_asset)
-        self.db.add(asset)
-        self.db.flush()
+        if not asset:
+            asset = self._create(nm_asset)
+        self._stage(asset)
+        return asset
+
+    def get_or_create_id(self, nm_asset: str) -> int:
+        """Hot-path lookup: served from the process cache, hits the database only on a miss."""
+        id_asset = asset_cache.get_id(nm_asset)
+        if id_asset is None:
+            id_asset = self.db.info.get(_PENDING_KEY, {}).get(nm_asset)
+        if id_asset is not None:
+            return id_asset
+        return self.get_or_create(nm_asset).id
+
+    def get_id(self, nm_asset: str) -> int | None:
+        """Like get_or_create_id, for read paths: an unknown asset is ``None`` rather than a new row."""
+        id_asset = asset_cache.get_id(nm_asset)
+        if id_asset is not None:
+            return id_asset
+        asset = self.get_by_name(nm_asset)
+        if not asset:
+            return None
+        self._stage(asset)
+        return asset.id
+
+    def get_name(self, id_asset: int) -> str | None:
+        nm_asset = asset_cache.get_name(id_asset)
+        if nm_asset is not None:
+            return nm_asset
+        asset = self.db.get(Asset, id_asset)
+        if not asset:
+            return None
+        self._stage(asset)
+        return asset.nm_asset
+
+    def _create(self, nm_asset: str) -> Asset:
+        # A concurrent transaction may insert the same asset first; the savepoint lets us
+        # recover from the uq_asset violation and read the winner's row instead.
+        try:
+            with self.db.begin_nested():
+                asset = Asset(nm_asset=nm_asset)
+                self.db.add(asset)
+        except IntegrityError:
+            asset = self.get_by_name(nm_asset)
         return asset
+
+    def _stage(self, asset: Asset) -> None:
+        self.db.info.setdefault(_PENDING_KEY, {})[asset.nm_asset] = asset.id
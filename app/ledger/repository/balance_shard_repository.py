@@ -0,0 +1,70 @@
+import zlib
+from decimal import Decimal
+
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.ledger.models.balance_shard import BalanceShard
+
+
+def shard_for(idempotency_key: str, shards: int) -> int:
+    # crc32 rather than hash(): str hashes are salted per process and every worker must agree
+    return zlib.crc32(idempotency_key.encode()) % shards
+
+
+def sharded_available(account_id, id_asset):
+    """Correlated subquery: what the shards of the outer row's (account, asset) still hold."""
+    held = select(func.sum(BalanceShard.available)).where(
+        BalanceShard.account_id == account_id, BalanceShard.id_asset == id_asset
+    )
+    return func.coalesce(held.scalar_subquery(), 0)
+
+
+class BalanceShardRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def credit(self, account_id: int, id_asset: int, shard: int, amount: Decimal) -> None:
+        stmt = pg_insert(BalanceShard).values(
+            account_id=account_id, id_asset=id_asset, shard=shard, available=amount, updated_at=func.now()
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[BalanceShard.account_id, BalanceShard.id_asset, BalanceShard.shard],
+                set_={"available": BalanceShard.available + stmt.excluded.available, "updated_at": func.now()},
+            )
+        )
+
+    def sweep(self, keys) -> dict:
+        """Empty the shards of every (account_id, id_asset) in ``keys``; returns what each key held.
+
+        The shards are locked in (account_id, id_asset, shard) order. Callers lock the balance rows
+        first, so every transaction that takes both kinds of lock takes them in the same order.
+        """
+        held = (
+            select(BalanceShard.id, BalanceShard.account_id, BalanceShard.id_asset, BalanceShard.available)
+            .where(tuple_(BalanceShard.account_id, BalanceShard.id_asset).in_(list(keys)), BalanceShard.available != 0)
+            .order_by(BalanceShard.account_id, BalanceShard.id_asset, BalanceShard.shard)
+            .with_for_update()
+            .cte("held")
+        )
+        rows = self.db.execute(
+            update(BalanceShard)
+            .where(BalanceShard.id == held.c.id)
+            .values(available=0, updated_at=func.now())
+            .returning(held.c.account_id, held.c.id_asset, held.c.available)
+            .execution_options(synchronize_session=False)
+        )
+        swept = {}
+        for account_id, id_asset, available in rows:
+            swept[(account_id, id_asset)] = swept.get((account_id, id_asset), Decimal("0")) + available
+        return swept
+
+    def empty_all(self) -> None:
+        self.db.execute(
+            update(BalanceShard)
+            .where(BalanceShard.available != 0)
+            .values(available=0, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,196 @@
+from typing import Iterable, Iterator
+
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.ledger.models import Balance, BalanceSnapshot, LedgerEvent
+from app.ledger.repository.balance_shard_repository import sharded_available
+from app.ledger.repository.ledger_event_repository import balance_effect_sum, unknown_event_count
+
+
+class BalanceSnapshotRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _is_postgres(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def get(self, account_id: int, id_asset: int) -> BalanceSnapshot | None:
+        return self.db.execute(
+            select(BalanceSnapshot).where(
+                BalanceSnapshot.account_id == account_id, BalanceSnapshot.id_asset == id_asset
+            )
+        ).scalar_one_or_none()
+
+    def event_horizon(self) -> int:
+        """Highest event id below which no transaction can still insert.
+
+        Taking SHARE on ``event`` waits for every in-flight writer, so once it is granted all
+        ids handed out so far are final; it is released when the caller's transaction ends.
+        """
+        if self._is_postgres():
+            self.db.execute(text("LOCK TABLE event IN SHARE MODE"))
+        return self.db.scalar(select(func.coalesce(func.max(LedgerEvent.id), 0)))
+
+    def min_checkpoint(self) -> int:
+        return self.db.scalar(select(func.coalesce(func.min(BalanceSnapshot.last_event_id), 0)))
+
+    def _events_after_checkpoint(self):
+        return LedgerEvent.__table__.outerjoin(
+            BalanceSnapshot.__table__,
+            and_(
+                BalanceSnapshot.account_id == LedgerEvent.account_id, BalanceSnapshot.id_asset == LedgerEvent.id_asset
+            ),
+        )
+
+    def _totals(self):
+        return select(
+            LedgerEvent.account_id,
+            LedgerEvent.id_asset,
+            balance_effect_sum("available").label("available"),
+            balance_effect_sum("locked").label("locked"),
+            unknown_event_count().label("unknown"),
+        ).where(LedgerEvent.id > func.coalesce(BalanceSnapshot.last_event_id, 0))
+
+    def stream_window_totals(self, after_id: int, up_to_id: int, yield_per: int) -> Iterator[Row]:
+        """Per-(account, asset) effect of the events in ``(after_id, up_to_id]`` not yet in a snapshot."""
+        stmt = (
+            self._totals()
+            .select_from(self._events_after_checkpoint())
+            .where(LedgerEvent.id > after_id, LedgerEvent.id <= up_to_id)
+            .group_by(LedgerEvent.account_id, LedgerEvent.id_asset)
+        )
+        return self.db.execute(stmt, execution_options={"yield_per": yield_per})
+
+    def apply_totals(self, rows: Iterable[Row], last_event_id: int) -> None:
+        values = [
+            {
+                "account_id": r.account_id,
+                "id_asset": r.id_asset,
+                "available": r.available,
+                "locked": r.locked,
+                "last_event_id": last_event_id,
+            }
+            for r in rows
+        ]
+        if not values:
+            return
+        if self._is_postgres():
+            stmt = pg_insert(BalanceSnapshot)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[BalanceSnapshot.account_id, BalanceSnapshot.id_asset],
+                set_={
+                    "available": BalanceSnapshot.available + stmt.excluded.available,
+                    "locked": BalanceSnapshot.locked + stmt.excluded.locked,
+                    "last_event_id": stmt.excluded.last_event_id,
+                    "updated_at": func.now(),
+                },
+            )
+            self.db.execute(stmt, values)
+            return
+        for value in values:
+            snapshot = self.get(value["account_id"], value["id_asset"])
+            if snapshot is None:
+                self.db.add(BalanceSnapshot(**value))
+                continue
+            snapshot.available += value["available"]
+            snapshot.locked += value["locked"]
+            snapshot.last_event_id = last_event_id
+        self.db.flush()
+
+    def advance_all(self, last_event_id: int) -> None:
+        self.db.execute(
+            update(BalanceSnapshot)
+            .where(BalanceSnapshot.last_event_id < last_event_id)
+            .values(last_event_id=last_event_id, updated_at=func.now())
+        )
+
+    def expected_balances(self, account_id: int | None = None):
+        """Snapshot plus every event recorded after it, per (account, asset), as a subquery."""
+        tail = self._totals().select_from(self._events_after_checkpoint())
+        if account_id is not None:
+            tail = tail.where(LedgerEvent.account_id == account_id)
+        tail = tail.group_by(LedgerEvent.account_id, LedgerEvent.id_asset).subquery()
+
+        snapshots = select(BalanceSnapshot)
+        if account_id is not None:
+            snapshots = snapshots.where(BalanceSnapshot.account_id == account_id)
+        snapshots = snapshots.subquery()
+
+        return (
+            select(
+                func.coalesce(snapshots.c.account_id, tail.c.account_id).label("account_id"),
+                func.coalesce(snapshots.c.id_asset, tail.c.id_asset).label("id_asset"),
+                (func.coalesce(snapshots.c.available, 0) + func.coalesce(tail.c.available, 0)).label("available"),
+                (func.coalesce(snapshots.c.locked, 0) + func.coalesce(tail.c.locked, 0)).label("locked"),
+                func.coalesce(tail.c.unknown, 0).label("unknown"),
+            )
+            .select_from(
+                snapshots.outerjoin(
+                    tail,
+                    and_(snapshots.c.account_id == tail.c.account_id, snapshots.c.id_asset == tail.c.id_asset),
+                    full=True,
+                )
+            )
+            .subquery()
+        )
+
+    def stream_mismatches(self, yield_per: int, account_id: int | None = None) -> Iterator[Row]:
+        expected = self.expected_balances(account_id)
+        balances = select(
+            Balance.account_id,
+            Balance.id_asset,
+            (Balance.available + sharded_available(Balance.account_id, Balance.id_asset)).label("available"),
+            Balance.locked,
+        )
+        if account_id is not None:
+            balances = balances.where(Balance.account_id == account_id)
+        balances = balances.subquery()
+
+        stmt = (
+            select(
+                func.coalesce(balances.c.account_id, expected.c.account_id).label("account_id"),
+                func.coalesce(balances.c.id_asset, expected.c.id_asset).label("id_asset"),
+                balances.c.available.label("available"),
+                balances.c.locked.label("locked"),
+                expected.c.available.label("expected_available"),
+                expected.c.locked.label("expected_locked"),
+            )
+            .select_from(
+                balances.outerjoin(
+                    expected,
+                    and_(balances.c.account_id == expected.c.account_id, balances.c.id_asset == expected.c.id_asset),
+                    full=True,
+                )
+            )
+            .where(
+                or_(
+                    func.coalesce(balances.c.available, 0) != func.coalesce(expected.c.available, 0),
+                    func.coalesce(balances.c.locked, 0) != func.coalesce(expected.c.locked, 0),
+                )
+            )
+            .order_by("account_id", "id_asset")
+        )
+        return self.db.execute(stmt, execution_options={"yield_per": yield_per})
+
+    def overwrite_balances(self) -> int:
+        """Set every existing balance row to its event-derived value; returns the rows changed."""
+        expected = self.expected_balances()
+        result = self.db.execute(
+            update(Balance)
+            .where(
+                Balance.account_id == expected.c.account_id,
+                Balance.id_asset == expected.c.id_asset,
+                or_(Balance.available != expected.c.available, Balance.locked != expected.c.locked),
+            )
+            .values(
+                available=expected.c.available,
+                locked=expected.c.locked,
+                version=Balance.version + 1,
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
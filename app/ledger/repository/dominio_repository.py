@@ -1,4 +1,7 @@
+from sqlalchemy import select
+
 from app.ledger.models import Dominio
+from app.ledger.models.dominio import status_registry
 
 
 class DominioRepository:
@@ -6,7 +9,33 @@ class DominioRepository:
         self.db = db
 
     def get_status_by_id(self, status_id: int):
-        return self.db.query(Dominio).filter(Dominio.id == status_id).first()
+        return self.db.get(Dominio, status_id)
 
     def get_status_by_name(self, status: str):
-        return self.db.query(Dominio).filter(Dominio.nm_dominio == status).first()
+        return self.db.execute(select(Dominio).where(Dominio.nm_dominio == status).limit(1)).scalar_one_or_none()
+
+    def get_status_id(self, status: str) -> int | None:
+        """Resolve a status name from the in-memory registry, reloading it once on a miss.
+
+        The reload reads through this session, so it also sees statuses inserted by the current
+        transaction; the registry only takes them once the transaction commits.
+        """
+        id_status = status_registry.id_of(status)
+        if id_status is None and not status_registry.missing(status):
+            ids, _ = status_registry.stage(self.db)
+            id_status = ids.get(status)
+            if id_status is None:
+                status_registry.mark_missing(status)
+        return id_status
+
+    def get_status_name(self, status_id: int) -> str | None:
+        nm_dominio = status_registry.name_of(status_id)
+        if nm_dominio is None and not status_registry.missing(status_id):
+            _, names = status_registry.stage(self.db)
+            nm_dominio = names.get(status_id)
+            if nm_dominio is None:
+                status_registry.mark_missing(status_id)
+        return nm_dominio
+
+    def refresh(self) -> None:
+        status_registry.stage(self.db)
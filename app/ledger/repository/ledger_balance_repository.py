@@ -1,7 +1,46 @@
-from sqlalchemy import select
-from sqlalchemy.orm import noload
+from decimal import Decimal
 
+from sqlalchemy import Integer, Numeric, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload, noload
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.ledger_metrics import ledger_metrics
 from app.ledger.models.balance import Balance
+from app.ledger.repository.balance_shard_repository import sharded_available
+
+settings = get_settings()
+
+ZERO = Decimal("0")
+
+
+class ConflictTracker:
+    """Per-account moving conflict rate of optimistic balance writes, for ``balance_concurrency=adaptive``.
+
+    An account whose rate passes the threshold is written pessimistically; with no optimistic
+    writes to observe, its entry then expires after ``ttl_seconds`` and it is tried optimistically again.
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: float, max_size: int = 10000, weight: float = 0.2):
+        self.threshold = threshold
+        self.weight = weight
+        self._rates = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def record(self, account_id: int, conflicted: bool) -> None:
+        rate = self._rates.get(account_id, 0.0)
+        self._rates.set(account_id, rate + self.weight * (float(conflicted) - rate))
+
+    def optimistic(self, account_id: int) -> bool:
+        return self._rates.get(account_id, 0.0) <= self.threshold
+
+    def clear(self) -> None:
+        self._rates.clear()
+
+
+conflict_tracker = ConflictTracker(
+    threshold=settings.optimistic_conflict_threshold, ttl_seconds=settings.optimistic_conflict_ttl_seconds
+)
 
 
 class LedgerBalanceRepository:
@@ -9,15 +48,31 @@ class LedgerBalanceRepository:
         self.db = db
 
     def get_balances_by_account_id(self, account_id: int):
-        rows = self.db.execute(select(Balance).where(Balance.account_id == account_id)).scalars().all()
+        """(Balance, available held in its shards) for every asset of the account."""
+        rows = self.db.execute(
+            select(Balance, sharded_available(Balance.account_id, Balance.id_asset))
+            .options(joinedload(Balance.asset, innerjoin=True))
+            .where(Balance.account_id == account_id)
+        ).all()
         return rows
 
+    def get_balance_with_shards(self, account_id: int, id_asset: int):
+        return self.db.execute(
+            select(Balance, sharded_available(Balance.account_id, Balance.id_asset))
+            .options(noload("*"))
+            .where(Balance.account_id == account_id, Balance.id_asset == id_asset)
+        ).one_or_none()
+
     def get_balance_by_account_id(self, account_id: int, id_asset: int):
         bal = self.db.execute(
-            select(Balance).where(
+            select(Balance)
+            .options(noload("*"))
+            .where(
                 Balance.account_id == account_id,
                 Balance.id_asset == id_asset,
             )
+            # an optimistic retry must see the version a concurrent writer committed
+            .execution_options(populate_existing=True)
         ).scalar_one_or_none()
 
         return bal
@@ -31,6 +86,7 @@ class LedgerBalanceRepository:
                 Balance.id_asset == id_asset,
             )
             .with_for_update(of=Balance)
+            .execution_options(populate_existing=True)
         ).scalar_one_or_none()
 
         return bal
@@ -40,3 +96,181 @@ class LedgerBalanceRepository:
         self.db.add(bal)
         self.db.flush()
         return bal
+
+    def add_available(self, deltas) -> None:
+        """Add each ``(balance, delta)`` to that row's ``available``, all rows in one UPDATE ... FROM (VALUES ...).
+
+        The rows must already be locked and the deltas checked by the caller.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            for bal, delta in deltas:
+                bal.available = Decimal(bal.available) + delta
+            self.db.flush()
+            return
+
+        rows = values(column("id", Integer), column("delta", Numeric(20, 8)), name="deltas").data(
+            [(bal.id, delta) for bal, delta in deltas]
+        )
+        stmt = (
+            update(Balance)
+            .where(Balance.id == rows.c.id)
+            .values(available=Balance.available + rows.c.delta, version=Balance.version + 1, updated_at=func.now())
+            .returning(Balance)
+        )
+        self.db.scalars(stmt, execution_options={"populate_existing": True}).all()
+
+    def create_balances_if_absent(self, keys) -> None:
+        if self.db.get_bind().dialect.name != "postgresql":
+            for account_id, id_asset in keys:
+                self.create_balance(account_id, id_asset, ZERO, ZERO)
+            return
+
+        stmt = pg_insert(Balance).values(
+            [
+                {
+                    "account_id": account_id,
+                    "id_asset": id_asset,
+                    "available": ZERO,
+                    "locked": ZERO,
+                    "updated_at": func.now(),
+                }
+                for account_id, id_asset in keys
+            ]
+        )
+        self.db.execute(stmt.on_conflict_do_nothing(index_elements=[Balance.account_id, Balance.id_asset]))
+
+    def apply_delta(
+        self,
+        account_id: int,
+        id_asset: int,
+        available_delta: Decimal = ZERO,
+        locked_delta: Decimal = ZERO,
+    ) -> Balance | None:
+        """Add the deltas to the (account, asset) balance and return the updated row.
+
+        Returns ``None`` without touching the row when the result would leave ``available``
+        or ``locked`` negative. How the write serializes with concurrent ones follows
+        ``balance_concurrency`` (see ``_concurrency``).
+        """
+        mode = self._concurrency(account_id)
+        if mode == "optimistic":
+            return self._apply_delta_optimistic(account_id, id_asset, available_delta, locked_delta)
+        if mode == "pessimistic":
+            return self._apply_delta_orm(account_id, id_asset, available_delta, locked_delta)
+
+        if available_delta >= 0 and locked_delta >= 0:
+            stmt = self._credit_statement(account_id, id_asset, available_delta, locked_delta)
+        else:
+            stmt = self._debit_statement(account_id, id_asset, available_delta, locked_delta)
+
+        return self.db.scalars(stmt, execution_options={"populate_existing": True}).one_or_none()
+
+    def _concurrency(self, account_id: int) -> str:
+        mode = settings.balance_concurrency
+        if mode == "adaptive":
+            return "optimistic" if conflict_tracker.optimistic(account_id) else "pessimistic"
+        if mode == "atomic" and not self._supports_upsert():
+            # the single-statement forms are PostgreSQL-only
+            return "pessimistic"
+        return mode
+
+    def _apply_delta_optimistic(
+        self, account_id: int, id_asset: int, available_delta: Decimal, locked_delta: Decimal
+    ) -> Balance | None:
+        """Read without locking, then UPDATE ... WHERE version = <read version> AND <funds suffice>.
+
+        Zero rows means a concurrent write got in first: re-read and try again. After
+        ``optimistic_retry_attempts`` lost races the write falls back to the pessimistic path.
+        """
+        for _ in range(settings.optimistic_retry_attempts):
+            bal = self.get_balance_by_account_id(account_id, id_asset)
+            if bal is None:
+                self.create_balances_if_absent([(account_id, id_asset)])
+                continue
+            if Decimal(bal.available) + available_delta < 0 or Decimal(bal.locked) + locked_delta < 0:
+                return None
+
+            stmt = (
+                update(Balance)
+                .where(
+                    Balance.id == bal.id,
+                    Balance.version == bal.version,
+                    Balance.available + available_delta >= 0,
+                    Balance.locked + locked_delta >= 0,
+                )
+                .values(
+                    available=Balance.available + available_delta,
+                    locked=Balance.locked + locked_delta,
+                    version=Balance.version + 1,
+                    updated_at=func.now(),
+                )
+                .returning(Balance)
+            )
+            updated = self.db.scalars(stmt, execution_options={"populate_existing": True}).one_or_none()
+            conflict_tracker.record(account_id, conflicted=updated is None)
+            if updated is not None:
+                return updated
+            ledger_metrics.balance_write_conflicts.inc("retried")
+
+        ledger_metrics.balance_write_conflicts.inc("fallback")
+        return self._apply_delta_orm(account_id, id_asset, available_delta, locked_delta)
+
+    def _supports_upsert(self) -> bool:
+        return settings.balance_upsert_enabled and self.db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def _credit_statement(account_id: int, id_asset: int, available_delta: Decimal, locked_delta: Decimal):
+        # INSERT ... ON CONFLICT (account_id, id_asset) DO UPDATE ... RETURNING
+        stmt = pg_insert(Balance).values(
+            account_id=account_id,
+            id_asset=id_asset,
+            available=available_delta,
+            locked=locked_delta,
+            updated_at=func.now(),
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[Balance.account_id, Balance.id_asset],
+            set_={
+                "available": Balance.available + stmt.excluded.available,
+                "locked": Balance.locked + stmt.excluded.locked,
+                "version": Balance.version + 1,
+                "updated_at": func.now(),
+            },
+        ).returning(Balance)
+
+    @staticmethod
+    def _debit_statement(account_id: int, id_asset: int, available_delta: Decimal, locked_delta: Decimal):
+        # a missing row can never satisfy a debit, so a guarded UPDATE ... RETURNING is enough
+        return (
+            update(Balance)
+            .where(
+                Balance.account_id == account_id,
+                Balance.id_asset == id_asset,
+                Balance.available + available_delta >= 0,
+                Balance.locked + locked_delta >= 0,
+            )
+            .values(
+                available=Balance.available + available_delta,
+                locked=Balance.locked + locked_delta,
+                version=Balance.version + 1,
+                updated_at=func.now(),
+            )
+            .returning(Balance)
+        )
+
+    def _apply_delta_orm(
+        self, account_id: int, id_asset: int, available_delta: Decimal, locked_delta: Decimal
+    ) -> Balance | None:
+        bal = self.get_balance_by_accont_id_for_update(account_id, id_asset)
+        if not bal:
+            bal = self.create_balance(account_id, id_asset, ZERO, ZERO)
+
+        available = Decimal(bal.available) + available_delta
+        locked = Decimal(bal.locked) + locked_delta
+        if available < 0 or locked < 0:
+            return None
+
+        bal.available = available
+        bal.locked = locked
+        self.db.flush()
+        return bal
@@ -1,9 +1,40 @@
+from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Iterator
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, noload
 
-from app.ledger.models.event import LedgerEvent
+from app.core.config import get_settings
+from app.ledger.models.event import EVENT_BALANCE_EFFECTS, LedgerEvent
+
+settings = get_settings()
+
+COPY_COLUMNS = (
+    "idempotency_key",
+    "account_id",
+    "id_asset",
+    "delta",
+    "event_type",
+    "reference_type",
+    "reference_id",
+)
+
+# rows fetched per round trip while a page is being serialized
+EVENT_PAGE_YIELD_PER = 500
+
+
+def balance_effect_sum(component: str):
+    """SQL aggregate of the events' effect on ``available`` or ``locked`` (see EVENT_BALANCE_EFFECTS)."""
+    index = ("available", "locked").index(component)
+    coefficients = {event_type: effect[index] for event_type, effect in EVENT_BALANCE_EFFECTS.items()}
+    return func.coalesce(func.sum(LedgerEvent.delta * case(coefficients, value=LedgerEvent.event_type, else_=0)), 0)
+
+
+def unknown_event_count():
+    return func.count().filter(LedgerEvent.event_type.not_in(list(EVENT_BALANCE_EFFECTS)))
 
 
 class EventRepository:
@@ -12,13 +43,94 @@ class EventRepository:
 
     def get_event_by_idempotency_key(self, idempotency_key: str):
         ev = self.db.execute(
-            select(LedgerEvent).where(
+            select(LedgerEvent)
+            .options(noload("*"))
+            .where(
                 LedgerEvent.idempotency_key == idempotency_key,
             )
         ).scalar_one_or_none()
 
         return ev
 
+    def get_events_by_idempotency_keys(self, idempotency_keys) -> dict:
+        rows = self.db.execute(
+            select(LedgerEvent).options(noload("*")).where(LedgerEvent.idempotency_key.in_(set(idempotency_keys)))
+        ).scalars()
+        return {ev.idempotency_key: ev for ev in rows}
+
+    def list_events(
+        self,
+        account_id: int,
+        id_asset: int | None = None,
+        event_type: str | None = None,
+        after_id: int = 0,
+        limit: int = 100,
+    ) -> Iterator[LedgerEvent]:
+        """One page of an account's history in id order, resuming after ``after_id``.
+
+        Keyset pagination: ix_event_account_id_id (or ix_event_account_id_asset_id with an asset)
+        returns the rows already in id order, so a page stops after ``limit`` index entries however
+        deep into the history it is, unlike OFFSET. An ``event_type`` filter is applied while
+        walking the index, so a rare type scans further per page.
+        """
+        stmt = (
+            select(LedgerEvent)
+            .options(noload("*"))
+            .where(LedgerEvent.account_id == account_id, LedgerEvent.id > after_id)
+            .order_by(LedgerEvent.id)
+            .limit(limit)
+        )
+        if id_asset is not None:
+            stmt = stmt.where(LedgerEvent.id_asset == id_asset)
+        if event_type is not None:
+            stmt = stmt.where(LedgerEvent.event_type == event_type)
+        return self.db.scalars(stmt, execution_options={"yield_per": EVENT_PAGE_YIELD_PER})
+
+    def create_events(self, events, returning: bool = True) -> list:
+        """Insert many events in as few round trips as possible.
+
+        With ``returning`` the rows go out as multi-row INSERT ... RETURNING pages
+        (insertmanyvalues) and the ORM objects come back in input order. Without it, batches of
+        at least ``event_copy_threshold`` rows are streamed with COPY on psycopg; the
+        idempotency_key constraint still applies, but a violation fails the whole COPY.
+        """
+        if not events:
+            return []
+
+        if returning:
+            stmt = insert(LedgerEvent).returning(LedgerEvent, sort_by_parameter_order=True)
+            return list(self.db.scalars(stmt, events))
+
+        if len(events) >= settings.event_copy_threshold and self.db.get_bind().dialect.driver == "psycopg":
+            self._copy_events(events)
+        else:
+            self.db.execute(insert(LedgerEvent), events)
+        return []
+
+    def create_events_if_absent(self, events) -> list:
+        """Insert the events in one statement, skipping idempotency keys already taken; returns the new rows."""
+        if self.db.get_bind().dialect.name != "postgresql":
+            taken = self.get_events_by_idempotency_keys(ev["idempotency_key"] for ev in events)
+            return self.create_events([ev for ev in events if ev["idempotency_key"] not in taken])
+
+        stmt = (
+            pg_insert(LedgerEvent)
+            .values(events)
+            .on_conflict_do_nothing(index_elements=[LedgerEvent.idempotency_key])
+            .returning(LedgerEvent)
+        )
+        return list(self.db.scalars(stmt))
+
+    def _copy_events(self, events) -> None:
+        created_at = datetime.now(timezone.utc)
+        columns = ", ".join(COPY_COLUMNS + ("created_at",))
+
+        self.db.flush()
+        with self.db.connection().connection.cursor() as cursor:
+            with cursor.copy(f"COPY {LedgerEvent.__tablename__} ({columns}) FROM STDIN") as copy:
+                for ev in events:
+                    copy.write_row([ev[column] for column in COPY_COLUMNS] + [created_at])
+
     def create_event(
         self,
         idempotency_key: str,
@@ -41,3 +153,43 @@ class EventRepository:
         self.db.add(ev)
         self.db.flush()
         return ev
+
+    def create_event_if_absent(
+        self,
+        idempotency_key: str,
+        account_id: int,
+        id_asset: int,
+        delta: Decimal,
+        event_type: str,
+        reference_type: str,
+        reference_id: str,
+    ) -> LedgerEvent | None:
+        """Insert the event unless its idempotency_key is already taken; returns ``None`` on conflict."""
+        values = {
+            "idempotency_key": idempotency_key,
+            "account_id": account_id,
+            "id_asset": id_asset,
+            "delta": delta,
+            "event_type": event_type,
+            "reference_type": reference_type,
+            "reference_id": reference_id,
+        }
+
+        if self.db.get_bind().dialect.name != "postgresql":
+            try:
+                with self.db.begin_nested():
+                    return self.create_event(**values)
+            except IntegrityError:
+                return None
+
+        stmt = (
+            pg_insert(LedgerEvent)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[LedgerEvent.idempotency_key])
+            .returning(LedgerEvent)
+        )
+        return self.db.scalars(stmt).one_or_none()
+
+    def delete_event(self, ev: LedgerEvent) -> None:
+        self.db.delete(ev)
+        self.db.flush()
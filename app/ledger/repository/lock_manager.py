@@ -0,0 +1,62 @@
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.orm import Session, noload
+
+from app.ledger.models import Balance, Settlement
+from app.ledger.repository.ledger_balance_repository import LedgerBalanceRepository
+
+
+class LockManager:
+    """Row locks for operations that touch more than one row, each taken by one ordered SELECT ... FOR UPDATE.
+
+    Every caller follows the same global order: balance rows by (account_id, id_asset), then
+    settlement rows by id. Two transactions contending for the same rows then queue behind
+    each other instead of deadlocking.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.balance_repository = LedgerBalanceRepository(db)
+
+    def balances(self, keys) -> dict:
+        """Lock every (account_id, id_asset) in ``keys``; missing rows are created with zero balances."""
+        ordered = sorted(set(keys))
+        balances = self._select_balances(ordered)
+
+        missing = [key for key in ordered if key not in balances]
+        if missing:
+            self.balance_repository.create_balances_if_absent(missing)
+            balances.update(self._select_balances(missing))
+        return balances
+
+    def _select_balances(self, keys) -> dict:
+        rows = (
+            self.db.execute(
+                select(Balance)
+                .options(noload("*"))
+                .where(tuple_(Balance.account_id, Balance.id_asset).in_(keys))
+                .order_by(Balance.account_id, Balance.id_asset)
+                .with_for_update(of=Balance)
+            )
+            .scalars()
+            .all()
+        )
+        return {(bal.account_id, bal.id_asset): bal for bal in rows}
+
+    def settlements(self, settlement_ids) -> dict:
+        """Lock each settlement together with its balance row; returns ``{id: (settlement, balance)}``.
+
+        Balance comes first in FROM, so within every joined row the balance is locked before
+        the settlement, and the rows themselves are locked in balance order.
+        """
+        rows = self.db.execute(
+            select(Balance, Settlement)
+            .join(
+                Settlement,
+                and_(Settlement.account_id == Balance.account_id, Settlement.id_asset == Balance.id_asset),
+            )
+            .options(noload("*"))
+            .where(Settlement.id.in_(set(settlement_ids)))
+            .order_by(Balance.account_id, Balance.id_asset, Settlement.id)
+            .with_for_update()
+        ).all()
+        return {settlement.id: (settlement, bal) for bal, settlement in rows}
@@ -0,0 +1,77 @@
+from typing import Iterator, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.ledger.models import Account, Balance, LedgerEvent
+from app.ledger.repository.balance_shard_repository import sharded_available
+from app.ledger.repository.ledger_event_repository import balance_effect_sum, unknown_event_count
+
+
+class ReconciliationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def account_id_bounds(self) -> Tuple[int, int]:
+        low, high = self.db.execute(select(func.min(Account.id), func.max(Account.id))).one()
+        return low or 0, high or 0
+
+    def stream_mismatches(self, account_from: int, account_to: int, yield_per: int) -> Iterator[Row]:
+        """(account, asset) pairs in ``[account_from, account_to)`` whose balance row disagrees with
+        the full replay of their events. Evaluated as one statement, so it sees a single consistent
+        snapshot even while the ledger keeps writing."""
+        events = (
+            select(
+                LedgerEvent.account_id,
+                LedgerEvent.id_asset,
+                balance_effect_sum("available").label("available"),
+                balance_effect_sum("locked").label("locked"),
+                func.sum(LedgerEvent.delta).label("delta"),
+                func.count().label("events"),
+                unknown_event_count().label("unknown"),
+            )
+            .where(LedgerEvent.account_id >= account_from, LedgerEvent.account_id < account_to)
+            .group_by(LedgerEvent.account_id, LedgerEvent.id_asset)
+            .subquery()
+        )
+        balances = (
+            select(
+                Balance.account_id,
+                Balance.id_asset,
+                (Balance.available + sharded_available(Balance.account_id, Balance.id_asset)).label("available"),
+                Balance.locked,
+            )
+            .where(Balance.account_id >= account_from, Balance.account_id < account_to)
+            .subquery()
+        )
+
+        stmt = (
+            select(
+                func.coalesce(balances.c.account_id, events.c.account_id).label("account_id"),
+                func.coalesce(balances.c.id_asset, events.c.id_asset).label("id_asset"),
+                balances.c.available,
+                balances.c.locked,
+                events.c.available.label("expected_available"),
+                events.c.locked.label("expected_locked"),
+                events.c.delta.label("sum_delta"),
+                events.c.events,
+                events.c.unknown,
+            )
+            .select_from(
+                balances.outerjoin(
+                    events,
+                    and_(balances.c.account_id == events.c.account_id, balances.c.id_asset == events.c.id_asset),
+                    full=True,
+                )
+            )
+            .where(
+                or_(
+                    func.coalesce(balances.c.available, 0) != func.coalesce(events.c.available, 0),
+                    func.coalesce(balances.c.locked, 0) != func.coalesce(events.c.locked, 0),
+                    func.coalesce(events.c.unknown, 0) > 0,
+                )
+            )
+            .order_by("account_id", "id_asset")
+        )
+        return self.db.execute(stmt, execution_options={"yield_per": yield_per})
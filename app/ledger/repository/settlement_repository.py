@@ -1,3 +1,6 @@
+from sqlalchemy import select
+from sqlalchemy.orm import noload
+
 from app.ledger.models import Settlement
 
 
@@ -6,4 +9,6 @@ class SettlementRepository:
         self.db = db
 
     def get_settlement_for_update(self, settlement_id: int) -> Settlement | None:
-        return self.db.query(Settlement).filter(Settlement.id == settlement_id).with_for_update().first()
+        return self.db.execute(
+            select(Settlement).options(noload("*")).where(Settlement.id == settlement_id).with_for_update()
+        ).scalar_one_or_none()
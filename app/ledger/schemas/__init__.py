@@ -1,6 +1,8 @@
 from app.ledger.schemas.balance import BalanceOut, BalancesResponse
+from app.ledger.schemas.batch import BatchItemResult, BatchOperation, BatchRequest, BatchResponse
 from app.ledger.schemas.deposit import DepositRequest
-from app.ledger.schemas.event import EventCreate, EventOut
+from app.ledger.schemas.event import EventCreate, EventOut, EventPage
 from app.ledger.schemas.lock import LockIn, Unlock
 from app.ledger.schemas.request import LockRequest, UnlockRequest
+from app.ledger.schemas.transfer import TransferRequest, TransferResponse
 from app.ledger.schemas.withdraw import WithdrawRequest
@@ -0,0 +1,37 @@
+from decimal import Decimal
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.ledger.schemas.balance import BalanceOut
+
+
+class BatchOperation(BaseModel):
+    operation: Literal["deposit", "lock", "unlock", "withdraw"]
+    idempotency_key: str
+    account_id: int
+    asset: str
+    amount: Decimal = Field(..., gt=0)
+    reference_id: str
+
+
+class BatchRequest(BaseModel):
+    mode: Literal["atomic", "per_item"] = Field(
+        "atomic",
+        description="atomic: any rejected item aborts the whole batch; per_item: rejected items are skipped",
+    )
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    operation: str
+    idempotency_key: str
+    status: Literal["applied", "replayed", "rejected"]
+    error: Optional[str] = None
+    balance: Optional[BalanceOut] = None
+
+
+class BatchResponse(BaseModel):
+    mode: str
+    results: List[BatchItemResult]
@@ -1,4 +1,6 @@
+from datetime import datetime
 from decimal import Decimal
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -14,6 +16,7 @@ class EventCreate(BaseModel):
 
 
 class EventOut(BaseModel):
+    id: int
     idempotency_key: str
     account_id: int
     asset: str
@@ -21,3 +24,9 @@ class EventOut(BaseModel):
     event_type: str
     reference_type: str
     reference_id: str
+    created_at: datetime
+
+
+class EventPage(BaseModel):
+    events: List[EventOut]
+    next_after_id: Optional[int] = Field(None, description="pass as after_id for the next page; null on the last one")
@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.ledger.schemas.balance import BalanceOut
+
+
+class TransferRequest(BaseModel):
+    # both events derive their key from this one; ":credit" must still fit event.idempotency_key
+    idempotency_key: str = Field(..., max_length=113)
+    account_id: int = Field(..., description="The account debited", examples=[2])
+    to_account_id: int = Field(..., description="The account credited", examples=[3])
+    asset: str = Field(..., examples=["USD", "BTC"])
+    amount: Decimal = Field(..., gt=0)
+    reference_id: str
+
+    @model_validator(mode="after")
+    def _distinct_accounts(self):
+        if self.account_id == self.to_account_id:
+            raise ValueError("account_id and to_account_id must differ")
+        return self
+
+
+class TransferResponse(BaseModel):
+    account_id: int
+    to_account_id: int
+    asset: str
+    balance: BalanceOut
+    to_balance: BalanceOut
@@ -1,15 +1,38 @@
+import asyncio
+import time
 from decimal import Decimal
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette.requests import Request
 
-from app.core.exceptions import InsufficientFunds, LockExceedsAvailable, UnlockExceedsLocked
+from app.core.coalescer import GroupCommitCoalescer
+from app.core.config import get_settings
+from app.core.db import SessionLocal
+from app.core.exceptions import IdempotencyKeyReused, InsufficientFunds, LockExceedsAvailable, UnlockExceedsLocked
+from app.core.idempotency_cache import idempotency_cache
 from app.core.ledger_logger import LedgerErrorLogger, LedgerLogger
+from app.core.ledger_metrics import ledger_metrics, observe_operation
+from app.core.rejection_log import rejection_log
+from app.core.retry import retryable_reason
 from app.ledger import schemas
 from app.ledger.models.balance import Balance
+from app.ledger.models.event import LedgerEvent
 from app.ledger.repository.asset_repository import AssetRepository
+from app.ledger.repository.balance_shard_repository import BalanceShardRepository, shard_for
 from app.ledger.repository.ledger_balance_repository import LedgerBalanceRepository
 from app.ledger.repository.ledger_event_repository import EventRepository
+from app.ledger.repository.lock_manager import LockManager
+
+settings = get_settings()
+
+# operation -> (available sign, locked sign, event_type, reference_type)
+BATCH_OPERATIONS = {
+    "deposit": (1, 0, "deposit", "deposit"),
+    "withdraw": (-1, 0, "withdraw", "withdraw"),
+    "lock": (-1, 1, "lock", "payment"),
+    "unlock": (1, -1, "unlock", "payment"),
+}
 
 
 class LedgerService:
@@ -20,22 +43,59 @@ class LedgerService:
         self.balance_repository = LedgerBalanceRepository(db)
         self.event_repository = EventRepository(db)
         self.asset_repository = AssetRepository(db)
+        self.shard_repository = BalanceShardRepository(db)
+        self.lock_manager = LockManager(db)
 
-        self.ledger_log_error = LedgerErrorLogger(__name__, request)
-        self.ledger_log = LedgerLogger(__name__, request)
+        self.ledger_log_error = LedgerErrorLogger(__name__)
+        self.ledger_log = LedgerLogger(__name__)
 
     def get_balances(self, account_id: int):
         rows = self.balance_repository.get_balances_by_account_id(account_id)
         balances = {
-            r.asset.nm_asset: {
-                "available": Decimal(r.available),
-                "locked": Decimal(r.locked),
+            bal.asset.nm_asset: {
+                "available": Decimal(bal.available) + Decimal(sharded),
+                "locked": Decimal(bal.locked),
             }
-            for r in rows
+            for bal, sharded in rows
         }
         return balances
 
+    def list_events(
+        self,
+        account_id: int,
+        asset: str | None = None,
+        event_type: str | None = None,
+        after_id: int = 0,
+        limit: int = 100,
+    ) -> schemas.EventPage:
+        id_asset = None
+        if asset is not None:
+            id_asset = self.asset_repository.get_id(asset)
+            if id_asset is None:
+                return schemas.EventPage(events=[])
+
+        rows = self.event_repository.list_events(account_id, id_asset, event_type, after_id, limit)
+        events = [
+            schemas.EventOut(
+                id=ev.id,
+                idempotency_key=ev.idempotency_key,
+                account_id=ev.account_id,
+                asset=self.asset_repository.get_name(ev.id_asset),
+                delta=Decimal(ev.delta),
+                event_type=ev.event_type,
+                reference_type=ev.reference_type,
+                reference_id=ev.reference_id,
+                created_at=ev.created_at,
+            )
+            for ev in rows
+        ]
+        # a short page is the last one
+        next_after_id = events[-1].id if len(events) == limit else None
+        return schemas.EventPage(events=events, next_after_id=next_after_id)
+
     def _get_or_create_balance(self, account_id: int, id_asset: int, for_update: bool = True) -> Balance:
+        if not for_update and self._sharded(account_id):
+            return self._balance_with_shards(account_id, id_asset)
         if for_update:
             bal = self.balance_repository.get_balance_by_accont_id_for_update(account_id, id_asset)
         else:
@@ -46,91 +106,216 @@ class LedgerService:
         bal = self.balance_repository.create_balance(account_id, id_asset, Decimal("0"), Decimal("0"))
         return bal
 
-    def deposit(self, *, idempotency_key: str, account_id: int, asset: str, amount: Decimal, reference_id: str):
-        asset_row = self.asset_repository.get_or_create(asset)
-        bal = self._get_or_create_balance(account_id, asset_row.id, True)
-        existing_event = self.event_repository.get_event_by_idempotency_key(idempotency_key)
-        if existing_event:
-            self.ledger_log_error.event_exists(
-                **{
-                    "account_id": account_id,
-                    "asset": asset,
-                    "amount": amount,
-                    "idempotency_key": idempotency_key,
-                    "operation": "deposit",
-                }
-            )
-            return existing_event, bal
-
-        self.ledger_log.deposit(
-            **{
-                "account_id": account_id,
-                "asset": asset,
-                "amount": amount,
-                "idempotency_key": idempotency_key,
-            }
+    @staticmethod
+    def _sharded(account_id: int) -> bool:
+        return account_id in settings.sharded_account_ids
+
+    def _balance_with_shards(self, account_id: int, id_asset: int) -> Balance:
+        """Transient copy of the balance row with its shards folded into ``available``."""
+        row = self.balance_repository.get_balance_with_shards(account_id, id_asset)
+        if row is None:
+            # shards are only ever read through their balance row, so it has to exist
+            self.balance_repository.create_balances_if_absent([(account_id, id_asset)])
+            row = self.balance_repository.get_balance_with_shards(account_id, id_asset)
+        bal, sharded = row
+        return Balance(
+            account_id=account_id,
+            id_asset=id_asset,
+            available=Decimal(bal.available) + Decimal(sharded),
+            locked=Decimal(bal.locked),
         )
 
-        ev = self.event_repository.create_event(
+    def _sweep_shards(self, account_id: int, id_asset: int) -> bool:
+        """Move whatever the shards hold into the balance row; False when they were empty."""
+        key = (account_id, id_asset)
+        self.lock_manager.balances([key])
+        swept = self.shard_repository.sweep([key]).get(key)
+        if not swept:
+            return False
+        self.balance_repository.apply_delta(account_id, id_asset, available_delta=swept)
+        return True
+
+    def _debit(self, account_id: int, id_asset: int, available_delta: Decimal, locked_delta: Decimal = Decimal("0")):
+        """apply_delta for operations that take from ``available``: when the balance row alone
+        falls short, the account's shards are swept into it and the debit is tried once more."""
+        bal = self.balance_repository.apply_delta(account_id, id_asset, available_delta, locked_delta)
+        if bal is None and self._sweep_shards(account_id, id_asset):
+            bal = self.balance_repository.apply_delta(account_id, id_asset, available_delta, locked_delta)
+        return bal
+
+    def _current_balance(self, account_id: int, id_asset: int) -> Balance:
+        bal = self.balance_repository.get_balance_by_account_id(account_id, id_asset)
+        if bal:
+            return bal
+        return Balance(account_id=account_id, id_asset=id_asset, available=Decimal("0"), locked=Decimal("0"))
+
+    def _claim_event(self, **event) -> tuple[LedgerEvent, bool]:
+        """Record the event for this idempotency key, or return the one already recorded.
+
+        The boolean is True on a replay. In insert-first mode the unique constraint on
+        ``event.idempotency_key`` decides, so a replay never reaches the balance row.
+        """
+        if settings.idempotency_insert_first:
+            ev = self.event_repository.create_event_if_absent(**event)
+            if ev:
+                return ev, False
+
+        existing = self.event_repository.get_event_by_idempotency_key(event["idempotency_key"])
+        if existing:
+            ledger_metrics.replays.inc(event["event_type"], "database")
+            idempotency_cache.mark_replayed(self.db, event["idempotency_key"])
+            return existing, True
+        return self.event_repository.create_event(**event), False
+
+    @observe_operation("deposit")
+    def deposit(self, *, idempotency_key: str, account_id: int, asset: str, amount: Decimal, reference_id: str):
+        deposit = {
+            "idempotency_key": idempotency_key,
+            "account_id": account_id,
+            "asset": asset,
+            "amount": amount,
+            "reference_id": reference_id,
+        }
+        if _coalesces_deposits(account_id):
+            ev, bal, replayed = submit_deposit(deposit).result()
+            if replayed:
+                idempotency_cache.mark_replayed(self.db, idempotency_key)
+            self._log_deposit(deposit, replayed)
+            return ev, bal
+
+        id_asset = self.asset_repository.get_or_create_id(asset)
+        ev, replayed = self._claim_event(
             idempotency_key=idempotency_key,
             account_id=account_id,
-            id_asset=asset_row.id,
+            id_asset=id_asset,
             delta=amount,
             event_type="deposit",
             reference_type="deposit",
             reference_id=reference_id,
         )
-        bal.available = Decimal(bal.available) + amount
-        self.db.flush()
+        self._log_deposit(deposit, replayed)
+        if replayed:
+            return ev, self._get_or_create_balance(account_id, id_asset, False)
+
+        if self._sharded(account_id):
+            shard = shard_for(idempotency_key, settings.balance_shards)
+            self.shard_repository.credit(account_id, id_asset, shard, amount)
+            return ev, self._balance_with_shards(account_id, id_asset)
+
+        bal = self.balance_repository.apply_delta(account_id, id_asset, available_delta=amount)
         return ev, bal
 
-    def lock_funds(self, payload: schemas.LockIn):
-        self.ledger_log.lock(
-            **{
-                **payload.model_dump(),
-            }
-        )
+    def _log_deposit(self, deposit: dict, replayed: bool) -> None:
+        fields = {key: deposit[key] for key in ("account_id", "asset", "amount", "idempotency_key")}
+        if replayed:
+            self.ledger_log_error.event_exists(**fields, operation="deposit")
+        else:
+            self.ledger_log.deposit(**fields)
 
-        asset_row = self.asset_repository.get_or_create(payload.asset)
-        bal = self._get_or_create_balance(payload.account_id, asset_row.id, True)
-        existing_event = self.event_repository.get_event_by_idempotency_key(payload.idempotency_key)
-        if existing_event:
-            self.ledger_log_error.event_exists(**payload.model_dump())
-            return existing_event, bal
+    def deposit_group(self, account_id: int, asset: str, deposits: list[dict]) -> list[tuple]:
+        """Apply deposits to one balance with a single bulk event INSERT and a single balance UPDATE.
 
-        if Decimal(bal.available) < payload.amount:
-            raise LockExceedsAvailable(
-                message=f"available={bal.available} < amount={payload.amount}",
-                request=self.request,
-                payload=payload.model_dump(),
+        Returns ``(event, balance, replayed)`` per deposit, in order. Each applied deposit sees the
+        running balance right after it, as if the deposits had been applied one by one; a replay
+        sees the balance after the whole group.
+        """
+        id_asset = self.asset_repository.get_or_create_id(asset)
+        created = {
+            ev.idempotency_key: ev
+            for ev in self.event_repository.create_events_if_absent(
+                [
+                    {
+                        "idempotency_key": d["idempotency_key"],
+                        "account_id": account_id,
+                        "id_asset": id_asset,
+                        "delta": d["amount"],
+                        "event_type": "deposit",
+                        "reference_type": "deposit",
+                        "reference_id": d["reference_id"],
+                    }
+                    for d in deposits
+                ]
             )
+        }
+        # the first deposit holding a new key applies it; any other with the same key replays it
+        applied, seen = [], set()
+        for d in deposits:
+            applied.append(d["idempotency_key"] in created and d["idempotency_key"] not in seen)
+            seen.add(d["idempotency_key"])
+        replayed_keys = {d["idempotency_key"] for d in deposits} - created.keys()
+        recorded = self.event_repository.get_events_by_idempotency_keys(replayed_keys) if replayed_keys else {}
+
+        total = sum((ev.delta for ev in created.values()), Decimal("0"))
+        if total:
+            bal = self.balance_repository.apply_delta(account_id, id_asset, available_delta=total)
+        else:
+            bal = self._get_or_create_balance(account_id, id_asset, False)
 
-        ev = self.event_repository.create_event(
+        results, available = [], Decimal(bal.available)
+        for d, new in reversed(list(zip(deposits, applied))):
+            key = d["idempotency_key"]
+            if not new:
+                ledger_metrics.replays.inc("deposit", "database")
+                results.append((created.get(key) or recorded[key], bal, True))
+                continue
+            running = Balance(account_id=account_id, id_asset=id_asset, available=available, locked=bal.locked)
+            results.append((created[key], running, False))
+            available -= Decimal(d["amount"])
+        results.reverse()
+        return results
+
+    @observe_operation("lock")
+    def lock_funds(self, payload: schemas.LockIn):
+        # dict(model) is a plain field copy, no serialization; shared by every log call below
+        log_fields = dict(payload)
+        self.ledger_log.lock(**log_fields)
+
+        id_asset = self.asset_repository.get_or_create_id(payload.asset)
+        ev, replayed = self._claim_event(
             idempotency_key=payload.idempotency_key,
             account_id=payload.account_id,
-            id_asset=asset_row.id,
+            id_asset=id_asset,
             delta=-payload.amount,
             reference_id=payload.reference_id,
             event_type="lock",
             reference_type="payment",
         )
+        if replayed:
+            self.ledger_log_error.event_exists(**log_fields)
+            return ev, self._get_or_create_balance(payload.account_id, id_asset, False)
 
-        bal.available = Decimal(bal.available) - payload.amount
-        bal.locked = Decimal(bal.locked) + payload.amount
-
-        self.db.flush()
+        bal = self._debit(payload.account_id, id_asset, -payload.amount, payload.amount)
+        if bal is None:
+            self.event_repository.delete_event(ev)
+            current = self._current_balance(payload.account_id, id_asset)
+            raise LockExceedsAvailable(
+                message=f"available={current.available} < amount={payload.amount}",
+                request=self.request,
+                payload=log_fields,
+            )
         return ev, bal
 
+    @observe_operation("unlock")
     def unlock_funds(self, *, idempotency_key: str, account_id: int, asset: str, amount: Decimal, reference_id: str):
-        existing = self.event_repository.get_event_by_idempotency_key(idempotency_key)
-        asset_row = self.asset_repository.get_or_create(asset)
-        bal = self._get_or_create_balance(account_id, asset_row.id)
-        if existing:
-            return existing, bal
+        id_asset = self.asset_repository.get_or_create_id(asset)
+        ev, replayed = self._claim_event(
+            idempotency_key=idempotency_key,
+            account_id=account_id,
+            id_asset=id_asset,
+            delta=amount,
+            event_type="unlock",
+            reference_type="payment",
+            reference_id=reference_id,
+        )
+        if replayed:
+            return ev, self._get_or_create_balance(account_id, id_asset, False)
 
-        if Decimal(bal.locked) < amount:
+        bal = self.balance_repository.apply_delta(account_id, id_asset, available_delta=amount, locked_delta=-amount)
+        if bal is None:
+            self.event_repository.delete_event(ev)
+            current = self._current_balance(account_id, id_asset)
             raise UnlockExceedsLocked(
-                message=f"locked={bal.locked} < amount={amount}",
+                message=f"locked={current.locked} < amount={amount}",
                 request=self.request,
                 payload={
                     "account_id": account_id,
@@ -140,20 +325,9 @@ class LedgerService:
                 },
             )
 
-        ev = self.event_repository.create_event(
-            idempotency_key=idempotency_key,
-            account_id=account_id,
-            id_asset=asset_row.id,
-            delta=amount,
-            event_type="unlock",
-            reference_type="payment",
-            reference_id=reference_id,
-        )
-
-        bal.locked = Decimal(bal.locked) - amount
-        bal.available = Decimal(bal.available) + amount
         return ev, bal
 
+    @observe_operation("withdraw")
     def withdraw(
         self,
         *,
@@ -166,10 +340,17 @@ class LedgerService:
         if amount <= 0:
             raise ValueError("Withdraw amount must be positive")
 
-        asset_row = self.asset_repository.get_or_create(asset)
-        bal = self._get_or_create_balance(account_id, asset_row.id)
-        existing = self.event_repository.get_event_by_idempotency_key(idempotency_key)
-        if existing:
+        id_asset = self.asset_repository.get_or_create_id(asset)
+        ev, replayed = self._claim_event(
+            idempotency_key=idempotency_key,
+            account_id=account_id,
+            id_asset=id_asset,
+            delta=-amount,
+            event_type="withdraw",
+            reference_type="withdraw",
+            reference_id=reference_id,
+        )
+        if replayed:
             self.ledger_log_error.event_exists(
                 **{
                     "account_id": account_id,
@@ -179,12 +360,15 @@ class LedgerService:
                     "operation": "withdraw",
                 }
             )
-            return existing, bal
+            return ev, self._get_or_create_balance(account_id, id_asset, False)
 
-        if bal.available < amount:
+        bal = self._debit(account_id, id_asset, -amount)
+        if bal is None:
+            self.event_repository.delete_event(ev)
+            current = self._current_balance(account_id, id_asset)
             raise InsufficientFunds(
                 request=self.request,
-                message=f"available={bal.available}, requested={amount}",
+                message=f"available={current.available}, requested={amount}",
                 payload={
                     "account_id": account_id,
                     "asset": asset,
@@ -193,16 +377,272 @@ class LedgerService:
                 },
             )
 
-        ev = self.event_repository.create_event(
-            idempotency_key=idempotency_key,
-            account_id=account_id,
-            id_asset=asset_row.id,
-            delta=-amount,
-            event_type="withdraw",
-            reference_type="withdraw",
-            reference_id=reference_id,
+        return ev, bal
+
+    @staticmethod
+    def _records(ev: LedgerEvent | None, row: dict) -> bool:
+        return ev is not None and all(
+            getattr(ev, field) == row[field] for field in ("event_type", "account_id", "id_asset", "delta")
         )
 
-        bal.available -= amount
+    @observe_operation("transfer")
+    def transfer(self, payload: schemas.TransferRequest):
+        """Move ``amount`` of ``available`` between two accounts in one transaction.
 
-        return ev, bal
+        Both events go in with one INSERT keyed on the transfer's idempotency key, both balance
+        rows are locked by one ordered SELECT ... FOR UPDATE and updated by one UPDATE. Returns
+        ``(events, debited balance, credited balance)``.
+        """
+        self.ledger_log.transfer(**dict(payload))
+        error_fields = {
+            "account_id": payload.account_id,
+            "asset": payload.asset,
+            "amount": payload.amount,
+            "idempotency_key": payload.idempotency_key,
+            "reference_id": payload.reference_id,
+        }
+
+        id_asset = self.asset_repository.get_or_create_id(payload.asset)
+        event = {
+            "id_asset": id_asset,
+            "event_type": "transfer",
+            "reference_type": "transfer",
+            "reference_id": payload.reference_id,
+        }
+        rows = [
+            {
+                **event,
+                "idempotency_key": payload.idempotency_key,
+                "account_id": payload.account_id,
+                "delta": -payload.amount,
+            },
+            {
+                **event,
+                "idempotency_key": f"{payload.idempotency_key}:credit",
+                "account_id": payload.to_account_id,
+                "delta": payload.amount,
+            },
+        ]
+        events = self.event_repository.create_events_if_absent(rows)
+        if len(events) < 2:
+            # a key already recorded: nothing is applied, and it is a replay only if both keys hold this transfer
+            for ev in events:
+                self.event_repository.delete_event(ev)
+            recorded = self.event_repository.get_events_by_idempotency_keys(row["idempotency_key"] for row in rows)
+            if not all(self._records(recorded.get(row["idempotency_key"]), row) for row in rows):
+                raise IdempotencyKeyReused(request=self.request, payload={**error_fields, "operation": "transfer"})
+            ledger_metrics.replays.inc("transfer", "database")
+            idempotency_cache.mark_replayed(self.db, payload.idempotency_key)
+            self.ledger_log_error.event_exists(**error_fields, operation="transfer")
+            return (
+                [recorded[row["idempotency_key"]] for row in rows],
+                self._get_or_create_balance(payload.account_id, id_asset, False),
+                self._get_or_create_balance(payload.to_account_id, id_asset, False),
+            )
+
+        debited, credited = (payload.account_id, id_asset), (payload.to_account_id, id_asset)
+        balances = self.lock_manager.balances([debited, credited])
+        source, target = balances[debited], balances[credited]
+
+        swept = Decimal("0")
+        if source.available < payload.amount:
+            swept = self.shard_repository.sweep([debited]).get(debited, swept)
+        if source.available + swept < payload.amount:
+            if swept:
+                self.balance_repository.add_available([(source, swept)])
+            for ev in events:
+                self.event_repository.delete_event(ev)
+            raise InsufficientFunds(
+                request=self.request,
+                message=f"available={source.available}, requested={payload.amount}",
+                payload=error_fields,
+            )
+
+        self.balance_repository.add_available([(source, swept - payload.amount), (target, payload.amount)])
+        return events, source, target
+
+    @observe_operation("batch")
+    def apply_batch(self, operations: list[schemas.BatchOperation], atomic: bool = True) -> list[dict]:
+        """Apply an ordered list of operations in one transaction.
+
+        Every touched balance row is locked once, up front and in (account_id, id_asset)
+        order, then the operations are applied in memory and their events bulk-inserted.
+        With ``atomic`` the first rejected operation raises and aborts the whole batch;
+        otherwise rejected operations are reported and skipped.
+        """
+        id_assets = {op.asset: self.asset_repository.get_or_create_id(op.asset) for op in operations}
+        balances = self.lock_manager.balances({(op.account_id, id_assets[op.asset]) for op in operations})
+        recorded = set(self.event_repository.get_events_by_idempotency_keys([op.idempotency_key for op in operations]))
+
+        results, events = [], []
+        for index, op in enumerate(operations):
+            id_asset = id_assets[op.asset]
+            bal = balances[(op.account_id, id_asset)]
+            result = {"index": index, "operation": op.operation, "idempotency_key": op.idempotency_key}
+
+            if op.idempotency_key in recorded:
+                ledger_metrics.replays.inc(op.operation, "database")
+                results.append({**result, "status": "replayed", "balance": self._balance_out(bal)})
+                continue
+
+            available_sign, locked_sign, event_type, reference_type = BATCH_OPERATIONS[op.operation]
+            available = Decimal(bal.available) + available_sign * op.amount
+            locked = Decimal(bal.locked) + locked_sign * op.amount
+            if available < 0:
+                # the balance row is already locked, so its shards can be swept into it
+                swept = self.shard_repository.sweep([(op.account_id, id_asset)]).get((op.account_id, id_asset))
+                if swept:
+                    bal.available = Decimal(bal.available) + swept
+                    available += swept
+            if available < 0 or locked < 0:
+                error = self._batch_rejection(op, bal)
+                if atomic:
+                    raise error
+                rejection_log.record_after_transaction(self.db, error)
+                results.append({**result, "status": "rejected", "error": error.detail})
+                continue
+
+            bal.available, bal.locked = available, locked
+            recorded.add(op.idempotency_key)
+            events.append(
+                {
+                    "idempotency_key": op.idempotency_key,
+                    "account_id": op.account_id,
+                    "id_asset": id_asset,
+                    "delta": available_sign * op.amount,
+                    "event_type": event_type,
+                    "reference_type": reference_type,
+                    "reference_id": op.reference_id,
+                }
+            )
+            results.append({**result, "status": "applied", "balance": self._balance_out(bal)})
+
+        self.event_repository.create_events(events, returning=False)
+        self.db.flush()
+        return results
+
+    @staticmethod
+    def _balance_out(bal: Balance) -> dict:
+        return {"available": Decimal(bal.available), "locked": Decimal(bal.locked)}
+
+    def _batch_rejection(self, op: schemas.BatchOperation, bal: Balance):
+        payload = {
+            "account_id": op.account_id,
+            "asset": op.asset,
+            "amount": op.amount,
+            "idempotency_key": op.idempotency_key,
+        }
+        if op.operation == "lock":
+            return LockExceedsAvailable(
+                message=f"available={bal.available} < amount={op.amount}", request=self.request, payload=payload
+            )
+        if op.operation == "unlock":
+            return UnlockExceedsLocked(
+                message=f"locked={bal.locked} < amount={op.amount}", request=self.request, payload=payload
+            )
+        return InsufficientFunds(
+            message=f"available={bal.available}, requested={op.amount}", request=self.request, payload=payload
+        )
+
+
+def _coalesces_deposits(account_id: int) -> bool:
+    # shards already spread a hot account's deposits over several rows
+    return settings.deposit_coalesce_window_ms > 0 and account_id not in settings.sharded_account_ids
+
+
+def _commit_deposit_group(key, deposits: list[dict]) -> list[tuple]:
+    account_id, asset = key
+    with SessionLocal() as db:
+        results = LedgerService(db, None).deposit_group(account_id, asset, deposits)
+        # keep the loaded events and balances readable by the callers once the session is gone
+        db.expunge_all()
+        db.commit()
+    ledger_metrics.deposit_groups.inc()
+    ledger_metrics.coalesced_deposits.inc(amount=len(deposits))
+    return results
+
+
+def _apply_deposit_group(key, deposits: list[dict]) -> list:
+    try:
+        return _commit_deposit_group(key, deposits)
+    except Exception as exc:
+        # a deadlock or serialization failure is retried by each caller's route; anything else
+        # may be one bad deposit, which must not fail the rest, so each goes again on its own
+        if len(deposits) == 1 or retryable_reason(exc):
+            raise
+    results = []
+    for deposit in deposits:
+        try:
+            results.extend(_commit_deposit_group(key, [deposit]))
+        except Exception as exc:  # noqa: BLE001 - raised to that deposit's caller only
+            results.append(exc)
+    return results
+
+
+deposit_coalescer = GroupCommitCoalescer(
+    _apply_deposit_group, max_size=settings.deposit_coalesce_max_size, max_workers=settings.deposit_coalesce_workers
+)
+
+
+def submit_deposit(deposit: dict):
+    """Queue a deposit for the next group commit on its balance; resolves to ``(event, balance, replayed)``.
+
+    The group runs in its own transaction, so the deposit is committed independently of the caller's session.
+    """
+    window_seconds = settings.deposit_coalesce_window_ms / 1000
+    return deposit_coalescer.submit((deposit["account_id"], deposit["asset"]), deposit, window_seconds)
+
+
+class AsyncLedgerService:
+    """Async counterpart of LedgerService.
+
+    Each call runs the sync service on the AsyncSession's connection through ``run_sync``,
+    so the repositories are shared while the event loop never blocks on Postgres.
+    """
+
+    def __init__(self, db: AsyncSession, request: Request):
+        self.db = db
+        self.request = request
+
+    async def _run(self, method: str, *args, **kwargs):
+        def call(session: Session):
+            return getattr(LedgerService(session, self.request), method)(*args, **kwargs)
+
+        return await self.db.run_sync(call)
+
+    async def get_balances(self, account_id: int):
+        return await self._run("get_balances", account_id)
+
+    async def list_events(self, account_id: int, **filters):
+        return await self._run("list_events", account_id, **filters)
+
+    async def deposit(self, **kwargs):
+        if not _coalesces_deposits(kwargs["account_id"]):
+            return await self._run("deposit", **kwargs)
+
+        # waiting on the group must not hold the event loop, so this path skips run_sync
+        started, outcome = time.perf_counter(), "error"
+        try:
+            ev, bal, replayed = await asyncio.wrap_future(submit_deposit(kwargs))
+            if replayed:
+                idempotency_cache.mark_replayed(self.db.sync_session, kwargs["idempotency_key"])
+            LedgerService(self.db.sync_session, self.request)._log_deposit(kwargs, replayed)
+            outcome = "success"
+            return ev, bal
+        finally:
+            ledger_metrics.observe("deposit", outcome, time.perf_counter() - started)
+
+    async def lock_funds(self, payload: schemas.LockIn):
+        return await self._run("lock_funds", payload=payload)
+
+    async def unlock_funds(self, **kwargs):
+        return await self._run("unlock_funds", **kwargs)
+
+    async def withdraw(self, **kwargs):
+        return await self._run("withdraw", **kwargs)
+
+    async def transfer(self, payload: schemas.TransferRequest):
+        return await self._run("transfer", payload=payload)
+
+    async def apply_batch(self, operations: list[schemas.BatchOperation], atomic: bool = True):
+        return await self._run("apply_batch", operations, atomic=atomic)
@@ -0,0 +1,111 @@
+import json
+import multiprocessing
+import os
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+from app.ledger.repository.reconciliation_repository import ReconciliationRepository
+
+Partition = Tuple[int, int]
+
+
+class ReconciliationService:
+    """Audits every balance row against a full replay of its events.
+
+    The replay is an SQL aggregate per (account_id, id_asset) that applies each event's
+    effect on available and locked (EVENT_BALANCE_EFFECTS), so lock/unlock/settlement
+    are reconciled as well as the plain ``sum(delta)``; only mismatches leave the database.
+    """
+
+    def __init__(self, db: Session, yield_per: int = 5_000):
+        self.db = db
+        self.yield_per = yield_per
+        self.repository = ReconciliationRepository(db)
+
+    def partitions(self, size: int) -> List[Partition]:
+        low, high = self.repository.account_id_bounds()
+        return [(lo, min(lo + size, high + 1)) for lo in range(low, high + 1, size)] if high else []
+
+    def check_partition(self, account_from: int, account_to: int) -> Iterator[Dict]:
+        for row in self.repository.stream_mismatches(account_from, account_to, self.yield_per):
+            yield {
+                "account_id": row.account_id,
+                "id_asset": row.id_asset,
+                "available": row.available,
+                "locked": row.locked,
+                "expected_available": Decimal(row.expected_available or 0),
+                "expected_locked": Decimal(row.expected_locked or 0),
+                "sum_delta": Decimal(row.sum_delta or 0),
+                "events": row.events or 0,
+                "unknown_event_types": row.unknown or 0,
+            }
+
+
+def _check(partition: Partition) -> Tuple[Partition, List[Dict]]:
+    with SessionLocal() as db:
+        return partition, list(ReconciliationService(db).check_partition(*partition))
+
+
+class _State:
+    """Completed partitions, persisted after each one so a restarted audit skips them."""
+
+    def __init__(self, path: Optional[str], partition_size: int, restart: bool):
+        self.path = path
+        self.data = {"partition_size": partition_size, "done": {}}
+        if path and os.path.exists(path) and not restart:
+            with open(path) as fh:
+                saved = json.load(fh)
+            if saved["partition_size"] != partition_size:
+                raise ValueError(f"{path} was written with partition_size={saved['partition_size']}; use restart")
+            self.data = saved
+
+    def done(self, partition: Partition) -> bool:
+        return str(partition[0]) in self.data["done"]
+
+    def mark(self, partition: Partition, mismatches: int) -> None:
+        self.data["done"][str(partition[0])] = mismatches
+        if self.path:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as fh:
+                json.dump(self.data, fh)
+            os.replace(tmp, self.path)
+
+    @property
+    def mismatches(self) -> int:
+        return sum(self.data["done"].values())
+
+
+def reconcile(
+    partition_size: int = 10_000,
+    processes: int = 1,
+    state_path: Optional[str] = None,
+    restart: bool = False,
+    on_mismatch: Callable[[Dict], None] = lambda mismatch: None,
+) -> Dict[str, int]:
+    """Reconcile the whole ledger, one account_id range per task, ``processes`` at a time."""
+    state = _State(state_path, partition_size, restart)
+    with SessionLocal() as db:
+        pending = [p for p in ReconciliationService(db).partitions(partition_size) if not state.done(p)]
+
+    if processes > 1 and len(pending) > 1:
+        with multiprocessing.get_context("spawn").Pool(processes) as pool:
+            results = pool.imap_unordered(_check, pending)
+            for partition, mismatches in results:
+                for mismatch in mismatches:
+                    on_mismatch(mismatch)
+                state.mark(partition, len(mismatches))
+    else:
+        for partition in pending:
+            _, mismatches = _check(partition)
+            for mismatch in mismatches:
+                on_mismatch(mismatch)
+            state.mark(partition, len(mismatches))
+
+    return {
+        "partitions_checked": len(pending),
+        "partitions_done": len(state.data["done"]),
+        "mismatches": state.mismatches,
+    }
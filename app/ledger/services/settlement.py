@@ -2,16 +2,17 @@ from decimal import Decimal
 from uuid import uuid4
 
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette.requests import Request
 
 from app.core.exceptions import InvalidSettlementState, LockExceedsAvailable, SettleExceedsLocked
+from app.core.ledger_metrics import observe_operation
 from app.ledger.models.settlement import Settlement
 from app.ledger.repository.dominio_repository import DominioRepository
-from app.ledger.repository.ledger_balance_repository import LedgerBalanceRepository
 from app.ledger.repository.asset_repository import AssetRepository
 from app.ledger.repository.ledger_event_repository import EventRepository
-from app.ledger.repository.settlement_repository import SettlementRepository
+from app.ledger.repository.lock_manager import LockManager
 
 
 class SettlementService:
@@ -19,18 +20,18 @@ class SettlementService:
         self.db = db
         self.request = request
 
-        self.balance_repository = LedgerBalanceRepository(db)
         self.dominio_repository = DominioRepository(db)
-        self.settlement_repository = SettlementRepository(db)
+        self.lock_manager = LockManager(db)
         self.event_repository = EventRepository(db)
         self.asset_repository = AssetRepository(db)
         #
-        # self.ledger_log_error = LedgerErrorLogger(__name__, request)
-        # self.ledger_log = LedgerLogger(__name__, request)
+        # self.ledger_log_error = LedgerErrorLogger(__name__)
+        # self.ledger_log = LedgerLogger(__name__)
 
+    @observe_operation("settlement_create")
     def create_settlement(self, account_id: int, asset: str, amount: Decimal):
-        asset_row = self.asset_repository.get_or_create(asset)
-        balance = self.balance_repository.get_balance_by_accont_id_for_update(account_id, asset_row.id)
+        id_asset = self.asset_repository.get_or_create_id(asset)
+        balance = self.lock_manager.balances([(account_id, id_asset)])[(account_id, id_asset)]
 
         if balance.locked < amount:
             raise SettleExceedsLocked(
@@ -43,49 +44,72 @@ class SettlementService:
                 },
             )
 
-        pending_status = self.dominio_repository.get_status_by_name("PENDING")
-
         settlement = Settlement(
             account_id=account_id,
-            id_asset=asset_row.id,
+            id_asset=id_asset,
             amount=amount,
-            id_status=pending_status.id,
+            id_status=self.dominio_repository.get_status_id("PENDING"),
         )
 
         self.db.add(settlement)
         return settlement
 
+    @observe_operation("settlement_confirm")
     def confirm_settlement(self, settlement_id: int):
-        settlement = self.settlement_repository.get_settlement_for_update(settlement_id)
+        locked = self.lock_manager.settlements([settlement_id])
 
-        if not settlement:
+        if settlement_id not in locked:
             raise HTTPException(detail=f"settlement {settlement_id} not found", status_code=404)
+        settlement, balance = locked[settlement_id]
 
-        if settlement.status != "SENT":
+        current_status = self.dominio_repository.get_status_name(settlement.id_status)
+        if current_status != "SENT":
             raise InvalidSettlementState(
-                message=f"Invalid settlement state: {settlement.status}",
+                message=f"Invalid settlement state: {current_status}",
                 request=self.request,
                 payload={
                     "settlement_id": settlement_id,
-                    "current_status": settlement.status,
+                    "current_status": current_status,
                 },
             )
 
-        balance = self.balance_repository.get_balance_by_accont_id_for_update(settlement.account_id, settlement.id_asset)
-
         balance.locked -= settlement.amount
 
-        self.event_repository.create_event(
-            idempotency_key=str(uuid4()),
-            account_id=settlement.account_id,
-            id_asset=settlement.id_asset,
-            delta=-settlement.amount,
-            event_type="settlement",
-            reference_type="settlement_id",
-            reference_id=str(settlement.id),
+        self.event_repository.create_events(
+            [
+                {
+                    "idempotency_key": str(uuid4()),
+                    "account_id": settlement.account_id,
+                    "id_asset": settlement.id_asset,
+                    "delta": -settlement.amount,
+                    "event_type": "settlement",
+                    "reference_type": "settlement_id",
+                    "reference_id": str(settlement.id),
+                }
+            ],
+            returning=False,
         )
 
-        status_confirmed = self.dominio_repository.get_status_by_name("CONFIRMED")
-        settlement.id_status = status_confirmed.id
+        settlement.id_status = self.dominio_repository.get_status_id("CONFIRMED")
 
         return settlement
+
+
+class AsyncSettlementService:
+    """Async counterpart of SettlementService, bridged through ``AsyncSession.run_sync``."""
+
+    def __init__(self, db: AsyncSession, request: Request):
+        self.db = db
+        self.request = request
+
+    async def _run(self, method: str, *args, **kwargs):
+        def call(session: Session):
+            return getattr(SettlementService(session, self.request), method)(*args, **kwargs)
+
+        return await self.db.run_sync(call)
+
+    async def create_settlement(self, account_id: int, asset: str, amount: Decimal):
+        return await self._run("create_settlement", account_id, asset, amount)
+
+    async def confirm_settlement(self, settlement_id: int):
+        return await self._run("confirm_settlement", settlement_id)
@@ -0,0 +1,74 @@
+from decimal import Decimal
+from typing import Dict, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.ledger.repository.balance_shard_repository import BalanceShardRepository
+from app.ledger.repository.balance_snapshot_repository import BalanceSnapshotRepository
+
+
+class SnapshotService:
+    """Event-sourced checkpoints of ``balance``.
+
+    ``checkpoint`` folds the events recorded since the last run into ``balance_snapshot``,
+    one id window per transaction so an interrupted run resumes where it stopped;
+    ``verify`` and ``rebuild`` compare or reset ``balance`` against snapshot + later events.
+    Result sets are read through server-side cursors, so memory stays flat however many
+    events or accounts there are.
+    """
+
+    def __init__(self, db: Session, window: int = 1_000_000, yield_per: int = 5_000):
+        self.db = db
+        self.window = window
+        self.yield_per = yield_per
+        self.repository = BalanceSnapshotRepository(db)
+        self.shard_repository = BalanceShardRepository(db)
+
+    def checkpoint(self) -> Dict[str, int]:
+        horizon = self.repository.event_horizon()
+        self.db.commit()
+
+        start = self.repository.min_checkpoint()
+        pairs = 0
+        for lo in range(start, horizon, self.window):
+            hi = min(lo + self.window, horizon)
+            rows = self.repository.stream_window_totals(lo, hi, self.yield_per)
+            for chunk in rows.partitions():
+                self._check_known(chunk)
+                self.repository.apply_totals(chunk, last_event_id=hi)
+                pairs += len(chunk)
+            self.db.commit()
+
+        self.repository.advance_all(horizon)
+        self.db.commit()
+        return {"from_event_id": start, "to_event_id": horizon, "pairs_updated": pairs}
+
+    def verify(self, account_id: int | None = None) -> Iterator[Dict]:
+        """Yield every (account, asset) whose balance row differs from its event-derived value."""
+        for row in self.repository.stream_mismatches(self.yield_per, account_id=account_id):
+            yield {
+                "account_id": row.account_id,
+                "id_asset": row.id_asset,
+                "available": row.available,
+                "locked": row.locked,
+                "expected_available": Decimal(row.expected_available or 0),
+                "expected_locked": Decimal(row.expected_locked or 0),
+            }
+
+    def rebuild(self) -> Dict[str, int]:
+        """Checkpoint, then overwrite drifted balance rows.
+
+        Run it with ledger writes paused: a write committed while the UPDATE runs can be lost.
+        """
+        stats = self.checkpoint()
+        # the rebuilt rows hold the whole balance, so nothing may stay behind in the shards
+        self.shard_repository.empty_all()
+        stats["balances_rewritten"] = self.repository.overwrite_balances()
+        self.db.commit()
+        return stats
+
+    @staticmethod
+    def _check_known(rows) -> None:
+        unknown = [(r.account_id, r.id_asset) for r in rows if r.unknown]
+        if unknown:
+            raise ValueError(f"events with an unmapped event_type for {unknown[:10]}")
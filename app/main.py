@@ -1,19 +1,45 @@
+from contextlib import asynccontextmanager
 from logging import getLogger
 
 from fastapi import FastAPI
-from starlette.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.responses import JSONResponse, PlainTextResponse
 
 import app.ledger.models
+from app.core.config import get_settings
+from app.core.db import SessionLocal, get_pool_stats
+from app.core.exceptions import LedgerRejection
+from app.core.ledger_metrics import ledger_metrics
 from app.core.logging import setup_logging
-from app.core.middleware import RequestContextMiddleware
+from app.core.middleware import RequestContextMiddleware, RequestProfilerMiddleware
+from app.core.rejection_log import ledger_rejection_handler
 from app.ledger.controllers.ledger import router as ledger_router
+from app.ledger.controllers.ledger_async import router as async_ledger_router
+from app.ledger.models.dominio import status_registry
 
 logger = getLogger(__name__)
+settings = get_settings()
 setup_logging()
 
-app = FastAPI(title="Ledger MVP")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    try:
+        with SessionLocal() as db:
+            status_registry.load(db)
+    except SQLAlchemyError:
+        # the registry reloads itself on the first miss, so a cold start is not fatal
+        logger.warning("status_registry_load_failed", exc_info=True)
+    yield
+
+
+app = FastAPI(title="Ledger MVP", lifespan=lifespan)
+if settings.request_profiling_enabled:
+    # added first so it runs inside RequestContextMiddleware and sees the request id
+    app.add_middleware(RequestProfilerMiddleware)
 app.add_middleware(RequestContextMiddleware)
-app.include_router(ledger_router)
+app.include_router(async_ledger_router if settings.async_db_enabled else ledger_router)
+app.add_exception_handler(LedgerRejection, ledger_rejection_handler)
 
 
 @app.get("/health")
@@ -21,6 +47,11 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(ledger_metrics.render(get_pool_stats()), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.exception(
@@ -0,0 +1,226 @@
+# benchmarks/loadgen.py
+"""Multi-process HTTP load generator for the ledger API.
+
+    python -m benchmarks.loadgen hot_account --serve --duration 30 --processes 4 --concurrency 8 \
+        --output bench_output.json --baseline benchmarks/baselines/hot_account.json
+
+``--serve`` starts ``uvicorn app.main:app`` (``--serve-workers`` processes) on ``--url`` and stops it
+afterwards; without it the API must already be running. Accounts are seeded straight into DATABASE_URL.
+
+The report carries ops/s and p50/p90/p99 latency. With ``--baseline`` the run fails (exit code 1)
+when throughput drops or p50/p99 grow by more than ``--max-regression``; ``--save-baseline`` records
+the current run as the new baseline instead.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from benchmarks.scenarios import SCENARIOS, run_service_operation, seed
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _outcome(status_code: int) -> str:
+    if 200 <= status_code < 300:
+        return "ok"
+    if status_code == 409:
+        return "rejected"
+    return f"http_{status_code}"
+
+
+def _worker(scenario_name: str, url: str, context: Dict, duration: float, concurrency: int, run_id: str, start, queue):
+    scenario = SCENARIOS[scenario_name]
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    lock = threading.Lock()
+
+    def loop(thread_id: int):
+        rng = random.Random(f"{run_id}-{os.getpid()}-{thread_id}")
+        local_latencies, local_outcomes, seq = [], Counter(), 0
+        with httpx.Client(base_url=url, timeout=30.0) as client:
+            while time.monotonic() < deadline:
+                seq += 1
+                key = f"{run_id}-{os.getpid()}-{thread_id}-{seq}"
+                operation = scenario.build(rng, context["accounts"], context, key)
+                started = time.perf_counter()
+                try:
+                    if operation.target == "service":
+                        status = run_service_operation(operation)
+                    else:
+                        status = client.post(operation.path, json=operation.body).status_code
+                    outcome = _outcome(status)
+                except Exception as exc:  # noqa: BLE001 - a load generator reports failures, it doesn't stop on them
+                    outcome = type(exc).__name__
+                local_latencies.append(time.perf_counter() - started)
+                local_outcomes[outcome] += 1
+        with lock:
+            latencies.extend(local_latencies)
+            outcomes.update(local_outcomes)
+
+    # spawning and importing the app takes a while; every process starts the clock together
+    start.wait()
+    deadline = time.monotonic() + duration
+    threads = [threading.Thread(target=loop, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queue.put((latencies, dict(outcomes)))
+
+
+def summarize(scenario: str, latencies: List[float], outcomes: Dict[str, int], elapsed: float, config: Dict) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        "scenario": scenario,
+        "config": config,
+        "duration_s": round(elapsed, 3),
+        "requests": len(ordered),
+        "ops_per_s": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 50) * 1000, 3),
+            "p90": round(percentile(ordered, 90) * 1000, 3),
+            "p99": round(percentile(ordered, 99) * 1000, 3),
+            "max": round((ordered[-1] if ordered else 0.0) * 1000, 3),
+        },
+        "outcomes": outcomes,
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """Return a human-readable line for each metric that regressed beyond ``max_regression``."""
+    regressions = []
+    if report["ops_per_s"] < baseline["ops_per_s"] * (1 - max_regression):
+        regressions.append(f"ops/s {report['ops_per_s']} < baseline {baseline['ops_per_s']}")
+    for pct in ("p50", "p99"):
+        current, reference = report["latency_ms"][pct], baseline["latency_ms"][pct]
+        if current > reference * (1 + max_regression):
+            regressions.append(f"{pct} {current}ms > baseline {reference}ms")
+    return regressions
+
+
+def _serve(url: str, workers: int) -> subprocess.Popen:
+    parsed = urlparse(url)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            parsed.hostname,
+            "--port",
+            str(parsed.port or 80),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ]
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"API did not become healthy at {url}")
+
+
+def run(
+    scenario: str, url: str, duration: float, processes: int, concurrency: int, serve_workers: Optional[int] = None
+) -> Dict:
+    run_id = uuid.uuid4().hex[:10]
+    context = seed(SCENARIOS[scenario], run_id)
+    server = _serve(url, serve_workers) if serve_workers else None
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        start = ctx.Barrier(processes + 1)
+        workers = [
+            ctx.Process(target=_worker, args=(scenario, url, context, duration, concurrency, run_id, start, queue))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        start.wait()
+        started = time.monotonic()
+
+        latencies, outcomes = [], Counter()
+        for _ in workers:
+            worker_latencies, worker_outcomes = queue.get()
+            latencies.extend(worker_latencies)
+            outcomes.update(worker_outcomes)
+        elapsed = time.monotonic() - started
+        for worker in workers:
+            worker.join()
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    config = {"processes": processes, "concurrency": concurrency, "duration": duration}
+    return summarize(scenario, latencies, dict(outcomes), elapsed, config)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads per process")
+    parser.add_argument("--serve", action="store_true", help="start uvicorn app.main:app for the run")
+    parser.add_argument("--serve-workers", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="baseline JSON report to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.scenario,
+        args.url,
+        args.duration,
+        args.processes,
+        args.concurrency,
+        serve_workers=args.serve_workers if args.serve else None,
+    )
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline and args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as fh:
+            json.dump(report, fh, indent=2)
+    elif args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare_to_baseline(report, json.load(fh), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {args.scenario}: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
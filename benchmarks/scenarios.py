@@ -0,0 +1,151 @@
+# benchmarks/scenarios.py
+import random
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.db import SessionLocal
+from app.ledger import schemas
+from app.ledger.models.account import Account
+from app.ledger.models.dominio import Dominio
+from app.ledger.services.ledger import LedgerService
+from app.ledger.services.settlement import SettlementService
+
+SEED_AVAILABLE = Decimal("1000000000")
+SEED_LOCKED = Decimal("1000000")
+ASSET = "USDC"
+OPERATIONS = ("deposit", "withdraw", "lock", "unlock")
+
+
+@dataclass
+class Operation:
+    """One unit of load: an HTTP call (``path``/``body``) or, with ``target="service"``, a service call."""
+
+    name: str
+    path: str = ""
+    body: Dict = field(default_factory=dict)
+    target: str = "http"
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    accounts: int
+    build: Callable[[random.Random, List[int], Dict, str], Operation]
+    replay_keys: int = 0
+    statuses: tuple = ()
+
+
+def _request():
+    return SimpleNamespace(state=SimpleNamespace(request_id=f"bench-{uuid.uuid4().hex[:8]}"))
+
+
+def _ledger_call(operation: str, account_id: int, key: str, amount: str = "1") -> Operation:
+    body = {
+        "idempotency_key": key,
+        "account_id": account_id,
+        "asset": ASSET,
+        "amount": amount,
+        "reference_id": key,
+    }
+    return Operation(name=operation, path=f"/ledger/{operation}", body=body)
+
+
+def _mixed(rng: random.Random, accounts: List[int], _context: Dict, key: str) -> Operation:
+    return _ledger_call(rng.choice(OPERATIONS), rng.choice(accounts), key)
+
+
+def _replay(rng: random.Random, accounts: List[int], context: Dict, _key: str) -> Operation:
+    # the same payload under an already recorded key: answered without touching the balance
+    return _ledger_call("deposit", accounts[0], rng.choice(context["replay_keys"]))
+
+
+def _settlement(rng: random.Random, accounts: List[int], _context: Dict, key: str) -> Operation:
+    # settlements have no HTTP route yet, so this scenario drives SettlementService directly
+    return Operation(
+        name="settlement_create",
+        target="service",
+        body={"account_id": rng.choice(accounts), "asset": ASSET, "amount": Decimal("1")},
+    )
+
+
+SCENARIOS = {
+    s.name: s
+    for s in (
+        Scenario("hot_account", "every worker hammers one account/asset row", accounts=1, build=_mixed),
+        Scenario("uniform", "operations spread uniformly over many accounts", accounts=1000, build=_mixed),
+        Scenario(
+            "replay_storm", "clients retrying already applied deposits", accounts=1, build=_replay, replay_keys=100
+        ),
+        Scenario(
+            "settlement_burst",
+            "concurrent settlement creation",
+            accounts=50,
+            build=_settlement,
+            statuses=("PENDING",),
+        ),
+    )
+}
+
+
+def seed(scenario: Scenario, run_id: str) -> Dict:
+    """Create funded accounts (available and locked), pre-record replay keys and ensure statuses exist."""
+    context = {"accounts": [], "replay_keys": []}
+    with SessionLocal() as db:
+        if scenario.statuses:
+            existing = set(db.scalars(select(Dominio.nm_dominio).where(Dominio.nm_dominio.in_(scenario.statuses))))
+            db.add_all(Dominio(nm_dominio=name) for name in scenario.statuses if name not in existing)
+        service = LedgerService(db, _request())
+        for _ in range(scenario.accounts):
+            account = Account(guid=str(uuid.uuid4()))
+            db.add(account)
+            db.flush()
+            context["accounts"].append(account.id)
+            service.deposit(
+                idempotency_key=f"{run_id}-seed-{account.id}",
+                account_id=account.id,
+                asset=ASSET,
+                amount=SEED_AVAILABLE,
+                reference_id=run_id,
+            )
+            service.lock_funds(
+                schemas.LockIn(
+                    idempotency_key=f"{run_id}-seed-lock-{account.id}",
+                    account_id=account.id,
+                    asset=ASSET,
+                    amount=SEED_LOCKED,
+                    reference_id=run_id,
+                )
+            )
+        for index in range(scenario.replay_keys):
+            key = f"{run_id}-replay-{index}"
+            service.deposit(
+                idempotency_key=key,
+                account_id=context["accounts"][0],
+                asset=ASSET,
+                amount=Decimal("1"),
+                reference_id=key,
+            )
+            context["replay_keys"].append(key)
+        db.commit()
+    return context
+
+
+def run_service_operation(operation: Operation) -> int:
+    """Execute a ``target="service"`` operation in its own transaction; returns an HTTP-like status."""
+    with SessionLocal() as db:
+        try:
+            settlement = SettlementService(db, _request()).create_settlement(**operation.body)
+            # the service leaves the on-chain fields to the caller
+            settlement.from_address, settlement.to_address, settlement.blockchain = "bench-from", "bench-to", "bench"
+            db.commit()
+        except HTTPException as exc:
+            db.rollback()
+            return exc.status_code
+    return 200
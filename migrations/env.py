@@ -16,6 +16,8 @@ settings = get_settings()
 from app.core.db import Base
 from app.ledger.models.account import Account
 from app.ledger.models.balance import Balance
+from app.ledger.models.balance_shard import BalanceShard
+from app.ledger.models.balance_snapshot import BalanceSnapshot
 from app.ledger.models.dominio import Dominio
 from app.ledger.models.event import LedgerEvent
 from app.ledger.models.settlement import Settlement
@@ -0,0 +1,40 @@
+"""balance snapshot
+
+Revision ID: 3f2a9c1d7e54
+Revises: 7bdb2cfcd09c
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7e54'
+down_revision: Union[str, None] = '7bdb2cfcd09c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('balance_snapshot',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('id_asset', sa.Integer(), nullable=False),
+    sa.Column('available', sa.Numeric(precision=20, scale=8), nullable=False),
+    sa.Column('locked', sa.Numeric(precision=20, scale=8), nullable=False),
+    sa.Column('last_event_id', sa.BIGINT(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.ForeignKeyConstraint(['id_asset'], ['assets.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_id', 'id_asset', name='uq_balance_snapshot_account_id_asset')
+    )
+    op.create_index(op.f('ix_balance_snapshot_last_event_id'), 'balance_snapshot', ['last_event_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_balance_snapshot_last_event_id'), table_name='balance_snapshot')
+    op.drop_table('balance_snapshot')
@@ -0,0 +1,28 @@
+"""event account/asset/id index
+
+Revision ID: f41e62d49081
+Revises: 3f2a9c1d7e54
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f41e62d49081'
+down_revision: Union[str, None] = '3f2a9c1d7e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # built CONCURRENTLY so a large event table keeps taking writes meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index('ix_event_account_id_asset_id', 'event', ['account_id', 'id_asset', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_event_account_id_asset_id', table_name='event', postgresql_concurrently=True)
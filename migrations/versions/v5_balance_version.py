@@ -0,0 +1,26 @@
+"""balance version
+
+Revision ID: 5e8b3f0c2a71
+Revises: 9c4d2b7a1e36
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b3f0c2a71'
+down_revision: Union[str, None] = '9c4d2b7a1e36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('balance', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('balance', 'version')
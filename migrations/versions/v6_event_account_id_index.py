@@ -0,0 +1,28 @@
+"""event account/id index
+
+Revision ID: 7b1d94e6c3a8
+Revises: 5e8b3f0c2a71
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1d94e6c3a8'
+down_revision: Union[str, None] = '5e8b3f0c2a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # without an asset filter, (account_id, id_asset, id) cannot return an account's events in id order
+    with op.get_context().autocommit_block():
+        op.create_index('ix_event_account_id_id', 'event', ['account_id', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_event_account_id_id', table_name='event', postgresql_concurrently=True)
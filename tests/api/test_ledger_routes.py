@@ -108,3 +108,232 @@ def test_request_id_header_added(client):
     resp = client.get("/health")
     assert resp.status_code == 200
     assert "X-Request-Id" in resp.headers
+
+
+@pytest.fixture()
+def idempotency_cache_enabled(monkeypatch):
+    from app.core.idempotency_cache import idempotency_cache
+
+    monkeypatch.setattr(idempotency_cache, "enabled", True)
+    return idempotency_cache
+
+
+@pytest.mark.api
+def test_idempotent_retry_served_from_cache(client, idempotency_cache_enabled):
+    session = TestingSessionLocal()
+    account = AccountBuilder(session, guid=uuid.uuid4()).build()
+    account_id = account.id
+    session.close()
+
+    payload = {
+        "idempotency_key": "api-dep-cache",
+        "account_id": account_id,
+        "asset": "USDC",
+        "amount": "15.00",
+        "reference_id": "r5",
+    }
+    first = client.post("/ledger/deposit", json=payload)
+    second = client.post("/ledger/deposit", json=payload)
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert idempotency_cache_enabled.stats()["hits"] == 1
+
+
+@pytest.mark.api
+def test_idempotency_key_reuse_with_different_payload_returns_409(client, idempotency_cache_enabled):
+    session = TestingSessionLocal()
+    account = AccountBuilder(session, guid=uuid.uuid4()).build()
+    account_id = account.id
+    session.close()
+
+    payload = {
+        "idempotency_key": "api-dep-reuse",
+        "account_id": account_id,
+        "asset": "USDC",
+        "amount": "15.00",
+        "reference_id": "r6",
+    }
+    assert client.post("/ledger/deposit", json=payload).status_code == 200
+
+    resp = client.post("/ledger/deposit", json={**payload, "amount": "16.00"})
+    assert resp.status_code == 409
+    assert idempotency_cache_enabled.stats()["conflicts"] == 1
+
+
+@pytest.mark.api
+def test_database_replay_with_different_payload_is_not_cached(client, idempotency_cache_enabled):
+    session = TestingSessionLocal()
+    account = AccountBuilder(session, guid=uuid.uuid4()).build()
+    account_id = account.id
+    session.close()
+
+    payload = {
+        "idempotency_key": f"api-dep-evicted-{account_id}",
+        "account_id": account_id,
+        "asset": "USDC",
+        "amount": "10.00",
+        "reference_id": "r8",
+    }
+    assert client.post("/ledger/deposit", json=payload).status_code == 200
+    # another worker, or an eviction: the next request for the key is answered from the database
+    idempotency_cache_enabled.clear()
+
+    assert client.post("/ledger/deposit", json={**payload, "amount": "99.00"}).status_code == 200
+    assert idempotency_cache_enabled.stats()["size"] == 0
+    assert client.post("/ledger/deposit", json=payload).status_code == 200
+
+
+@pytest.mark.api
+def test_rejected_request_is_not_cached(client, idempotency_cache_enabled):
+    session = TestingSessionLocal()
+    account = AccountBuilder(session, guid=uuid.uuid4()).build()
+    account_id = account.id
+    session.close()
+
+    payload = {
+        "idempotency_key": "api-wd-nocache",
+        "account_id": account_id,
+        "asset": "USDC",
+        "amount": "20.00",
+        "reference_id": "r7",
+    }
+    assert client.post("/ledger/withdraw", json=payload).status_code == 409
+    assert idempotency_cache_enabled.stats()["size"] == 0
+
+
+@pytest.mark.api
+def test_batch_endpoint_returns_per_item_results(client):
+    session = TestingSessionLocal()
+    account_id = AccountBuilder(session, guid=uuid.uuid4()).build().id
+    session.close()
+
+    def op(operation, key, amount):
+        return {
+            "operation": operation,
+            "idempotency_key": key,
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": amount,
+            "reference_id": key,
+        }
+
+    resp = client.post(
+        "/ledger/batch",
+        json={
+            "mode": "per_item",
+            "operations": [op("deposit", "api-b-1", "10"), op("withdraw", "api-b-2", "50"), op("lock", "api-b-3", "4")],
+        },
+    )
+
+    assert resp.status_code == 200
+    assert [r["status"] for r in resp.json()["results"]] == ["applied", "rejected", "applied"]
+    balances = client.get(f"/ledger/balances?account_id={account_id}").json()["balances"]
+    assert Decimal(str(balances["USDC"]["available"])) == Decimal("6")
+    assert Decimal(str(balances["USDC"]["locked"])) == Decimal("4")
+
+
+@pytest.mark.api
+def test_metrics_endpoint_exposes_operations_and_pool(client):
+    session = TestingSessionLocal()
+    account_id = AccountBuilder(session, guid=uuid.uuid4()).build().id
+    session.close()
+    client.post(
+        "/ledger/deposit",
+        json={
+            "idempotency_key": f"api-metrics-{uuid.uuid4()}",
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": "1.00",
+            "reference_id": "r",
+        },
+    )
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'ledger_operations_total{operation="deposit",outcome="success"}' in resp.text
+    assert 'ledger_db_pool_size{pool="sync"}' in resp.text
+    assert "ledger_http_requests_in_flight 1" in resp.text
+
+
+@pytest.mark.api
+def test_events_are_paged_by_keyset(client):
+    session = TestingSessionLocal()
+    account_id = AccountBuilder(session, guid=uuid.uuid4()).build().id
+    session.close()
+    prefix = uuid.uuid4().hex[:8]
+    for index, asset in enumerate(["USDC", "USDC", "BTC", "USDC"]):
+        client.post(
+            "/ledger/deposit",
+            json={
+                "idempotency_key": f"api-events-{prefix}-{index}",
+                "account_id": account_id,
+                "asset": asset,
+                "amount": "1.00",
+                "reference_id": "r",
+            },
+        )
+    client.post(
+        "/ledger/withdraw",
+        json={
+            "idempotency_key": f"api-events-{prefix}-w",
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": "1.00",
+            "reference_id": "r",
+        },
+    )
+
+    first = client.get(f"/ledger/events?account_id={account_id}&asset=USDC&limit=2").json()
+    second = client.get(f"/ledger/events?account_id={account_id}&asset=USDC&after_id={first['next_after_id']}").json()
+
+    assert [e["idempotency_key"] for e in first["events"]] == [f"api-events-{prefix}-0", f"api-events-{prefix}-1"]
+    assert first["next_after_id"] == first["events"][-1]["id"]
+    assert [e["event_type"] for e in second["events"]] == ["deposit", "withdraw"]
+    assert second["next_after_id"] is None
+    withdrawals = client.get(f"/ledger/events?account_id={account_id}&event_type=withdraw").json()["events"]
+    assert [(e["asset"], Decimal(str(e["delta"]))) for e in withdrawals] == [("USDC", Decimal("-1"))]
+    assert client.get(f"/ledger/events?account_id={account_id}&asset=NOPE").json() == {
+        "events": [],
+        "next_after_id": None,
+    }
+    assert client.get(f"/ledger/events?account_id={account_id}&limit=0").status_code == 422
+
+
+@pytest.mark.api
+def test_transfer_between_accounts(client):
+    session = TestingSessionLocal()
+    source, target = (AccountBuilder(session, guid=uuid.uuid4()).build().id for _ in range(2))
+    session.close()
+    key = f"api-transfer-{uuid.uuid4().hex[:8]}"
+    client.post(
+        "/ledger/deposit",
+        json={
+            "idempotency_key": f"{key}-seed",
+            "account_id": source,
+            "asset": "USDC",
+            "amount": "10",
+            "reference_id": "r",
+        },
+    )
+    payload = {
+        "idempotency_key": key,
+        "account_id": source,
+        "to_account_id": target,
+        "asset": "USDC",
+        "amount": "4",
+        "reference_id": "r",
+    }
+
+    first = client.post("/ledger/transfer", json=payload)
+    second = client.post("/ledger/transfer", json=payload)
+
+    assert first.status_code == 200
+    assert Decimal(str(first.json()["balance"]["available"])) == Decimal("6")
+    assert Decimal(str(first.json()["to_balance"]["available"])) == Decimal("4")
+    assert second.json() == first.json()
+    overdraft = {**payload, "amount": "100", "idempotency_key": f"{key}-2"}
+    assert client.post("/ledger/transfer", json=overdraft).status_code == 409
+    assert client.post("/ledger/transfer", json={**payload, "to_account_id": source}).status_code == 422
@@ -0,0 +1,125 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from tests.builders.account_builder import AccountBuilder
+from tests.conftest import TestingSessionLocal
+
+
+def _new_account_id():
+    session = TestingSessionLocal()
+    account = AccountBuilder(session, guid=uuid.uuid4()).build()
+    account_id = account.id
+    session.close()
+    return account_id
+
+
+@pytest.mark.api
+def test_async_deposit_lock_and_get_balances(async_client):
+    account_id = _new_account_id()
+
+    resp = async_client.post(
+        "/ledger/deposit",
+        json={
+            "idempotency_key": "async-dep-1",
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": "50.00",
+            "reference_id": "r1",
+        },
+    )
+    assert resp.status_code == 200
+
+    resp = async_client.post(
+        "/ledger/lock",
+        json={
+            "idempotency_key": "async-lock-1",
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": "20.00",
+            "reference_id": "r1",
+        },
+    )
+    assert resp.status_code == 200
+
+    balances = async_client.get(f"/ledger/balances?account_id={account_id}").json()["balances"]
+    assert Decimal(str(balances["USDC"]["available"])) == Decimal("30.00")
+    assert Decimal(str(balances["USDC"]["locked"])) == Decimal("20.00")
+
+
+@pytest.mark.api
+def test_async_withdraw_insufficient_returns_409(async_client):
+    account_id = _new_account_id()
+
+    resp = async_client.post(
+        "/ledger/withdraw",
+        json={
+            "idempotency_key": "async-wd-1",
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": "20.00",
+            "reference_id": "r2",
+        },
+    )
+    assert resp.status_code == 409
+
+
+@pytest.mark.api
+def test_async_idempotent_retry_returns_same_balance(async_client):
+    account_id = _new_account_id()
+    payload = {
+        "idempotency_key": "async-dep-2",
+        "account_id": account_id,
+        "asset": "USDC",
+        "amount": "30.00",
+        "reference_id": "r3",
+    }
+
+    first = async_client.post("/ledger/deposit", json=payload)
+    second = async_client.post("/ledger/deposit", json=payload)
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+
+
+@pytest.mark.api
+def test_async_list_events(async_client):
+    account_id = _new_account_id()
+    async_client.post(
+        "/ledger/deposit",
+        json={
+            "idempotency_key": f"async-events-{uuid.uuid4()}",
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": "5.00",
+            "reference_id": "r",
+        },
+    )
+
+    page = async_client.get(f"/ledger/events?account_id={account_id}").json()
+
+    assert [(e["event_type"], e["asset"]) for e in page["events"]] == [("deposit", "USDC")]
+    assert page["next_after_id"] is None
+
+
+@pytest.mark.api
+def test_async_coalesced_deposit_and_replay(async_client, monkeypatch):
+    from app.ledger.services import ledger as ledger_module
+
+    monkeypatch.setattr(ledger_module.settings, "deposit_coalesce_window_ms", 2.0)
+    account_id = _new_account_id()
+    body = {
+        "idempotency_key": f"async-coalesced-{account_id}",
+        "account_id": account_id,
+        "asset": "USDC",
+        "amount": "50.00",
+        "reference_id": "r1",
+    }
+
+    for _ in range(2):
+        resp = async_client.post("/ledger/deposit", json=body)
+        assert resp.status_code == 200
+
+    balances = async_client.get(f"/ledger/balances?account_id={account_id}").json()["balances"]
+    assert Decimal(str(balances["USDC"]["available"])) == Decimal("50.00")
@@ -0,0 +1,73 @@
+import logging
+import uuid
+
+import pytest
+
+from tests.builders.account_builder import AccountBuilder
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture(scope="module")
+def profiled_client(postgres_container):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core.db import get_db
+    from app.core.middleware import RequestContextMiddleware, RequestProfilerMiddleware
+    from app.ledger.controllers.ledger import router
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    profiled_app = FastAPI()
+    profiled_app.add_middleware(RequestProfilerMiddleware)
+    profiled_app.add_middleware(RequestContextMiddleware)
+    profiled_app.include_router(router)
+    profiled_app.dependency_overrides[get_db] = override_get_db
+    with TestClient(profiled_app) as c:
+        yield c
+
+
+@pytest.mark.api
+def test_profiler_reports_statements_and_server_timing(profiled_client, caplog):
+    session = TestingSessionLocal()
+    account_id = AccountBuilder(session, guid=uuid.uuid4()).build().id
+    session.close()
+
+    with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+        resp = profiled_client.post(
+            "/ledger/deposit",
+            json={
+                "idempotency_key": f"prof-{uuid.uuid4()}",
+                "account_id": account_id,
+                "asset": "USDC",
+                "amount": "5.00",
+                "reference_id": "r",
+            },
+            headers={"X-Request-Id": "prof-req-1"},
+        )
+
+    assert resp.status_code == 200
+    timing = resp.headers["Server-Timing"]
+    assert timing.startswith("db;dur=") and "lock;dur=" in timing and "app;dur=" in timing
+
+    record = next(r for r in caplog.records if r.getMessage() == "request_profile")
+    assert record.request_id == "prof-req-1"
+    assert record.route == "/ledger/deposit"
+    assert record.db_statements >= 2
+    assert record.lock_wait_ms <= record.db_time_ms <= record.handler_time_ms
+
+
+@pytest.mark.api
+def test_unprofiled_requests_record_nothing(client):
+    resp = client.get("/health")
+
+    assert "Server-Timing" not in resp.headers
@@ -0,0 +1,125 @@
+"""Micro benchmarks of LedgerService/SettlementService against the test database.
+
+The default run executes each benchmark once (``--benchmark-disable`` in pytest.ini) as a smoke test.
+To measure, and to record or check a baseline under benchmarks/baselines:
+
+    pytest tests/benchmarks --benchmark-enable --benchmark-autosave
+    pytest tests/benchmarks --benchmark-enable --benchmark-compare --benchmark-compare-fail=median:20%
+"""
+import itertools
+from decimal import Decimal
+
+import pytest
+
+from app.ledger import schemas
+from app.ledger.models.dominio import Dominio
+from app.ledger.services.ledger import LedgerService
+from app.ledger.services.settlement import SettlementService
+from tests.builders.account_builder import AccountBuilder
+
+pytestmark = pytest.mark.benchmark(group="ledger_service")
+
+
+@pytest.fixture()
+def funded(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account_id = AccountBuilder(db_session).build().id
+    service.deposit(
+        account_id=account_id,
+        asset="USDC",
+        amount=Decimal("1000000000"),
+        idempotency_key="bench-seed",
+        reference_id="r",
+    )
+    return service, account_id, itertools.count()
+
+
+def test_bench_deposit(benchmark, funded):
+    service, account_id, seq = funded
+
+    benchmark(
+        lambda: service.deposit(
+            account_id=account_id,
+            asset="USDC",
+            amount=Decimal("1"),
+            idempotency_key=f"bd-{next(seq)}",
+            reference_id="r",
+        )
+    )
+
+
+def test_bench_replayed_deposit(benchmark, funded):
+    service, account_id, _ = funded
+
+    benchmark(
+        lambda: service.deposit(
+            account_id=account_id,
+            asset="USDC",
+            amount=Decimal("1000000000"),
+            idempotency_key="bench-seed",
+            reference_id="r",
+        )
+    )
+
+
+def test_bench_lock_unlock(benchmark, funded):
+    service, account_id, seq = funded
+
+    def lock_unlock():
+        n = next(seq)
+        service.lock_funds(
+            schemas.LockIn(
+                account_id=account_id, asset="USDC", amount=Decimal("1"), idempotency_key=f"bl-{n}", reference_id="r"
+            )
+        )
+        service.unlock_funds(
+            account_id=account_id, asset="USDC", amount=Decimal("1"), idempotency_key=f"bu-{n}", reference_id="r"
+        )
+
+    benchmark(lock_unlock)
+
+
+def test_bench_get_balances(benchmark, funded):
+    service, account_id, _ = funded
+
+    benchmark(service.get_balances, account_id)
+
+
+def test_bench_batch_of_100(benchmark, funded):
+    service, account_id, seq = funded
+
+    def batch():
+        n = next(seq)
+        operations = [
+            schemas.BatchOperation(
+                operation="deposit",
+                idempotency_key=f"bb-{n}-{i}",
+                account_id=account_id,
+                asset="USDC",
+                amount=Decimal("1"),
+                reference_id="r",
+            )
+            for i in range(100)
+        ]
+        service.apply_batch(operations)
+
+    benchmark(batch)
+
+
+def test_bench_settlement_create(benchmark, db_session, request_mock, funded):
+    service, account_id, _ = funded
+    service.lock_funds(
+        schemas.LockIn(
+            account_id=account_id, asset="USDC", amount=Decimal("1000"), idempotency_key="bench-lock", reference_id="r"
+        )
+    )
+    db_session.add(Dominio(nm_dominio="PENDING"))
+    db_session.flush()
+    settlements = SettlementService(db_session, request_mock)
+
+    def create():
+        settlement = settlements.create_settlement(account_id=account_id, asset="USDC", amount=Decimal("1"))
+        settlement.from_address, settlement.to_address, settlement.blockchain = "from", "to", "bench"
+        db_session.flush()
+
+    benchmark(create)
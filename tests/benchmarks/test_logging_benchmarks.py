@@ -0,0 +1,41 @@
+"""Per-operation cost of LedgerLogger/LedgerErrorLogger with the JSON formatter, at INFO vs WARNING.
+
+    pytest tests/benchmarks/test_logging_benchmarks.py --benchmark-enable --benchmark-group-by=param:level
+"""
+import io
+import logging
+from decimal import Decimal
+
+import pytest
+from pythonjsonlogger import jsonlogger
+
+from app.core.ledger_logger import LedgerErrorLogger, LedgerLogger
+
+LOGGER_NAME = "bench.ledger"
+FIELDS = {"account_id": 1, "asset": "USDC", "amount": Decimal("10.50"), "idempotency_key": "bench-key"}
+
+
+@pytest.fixture(params=["INFO", "WARNING"])
+def level(request):
+    logger = logging.getLogger(LOGGER_NAME)
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(jsonlogger.JsonFormatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(request.param)
+    yield request.param
+    logger.removeHandler(handler)
+    logger.propagate = True
+    logger.setLevel(logging.NOTSET)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_bench_operation_log(benchmark, level):
+    ledger_log = LedgerLogger(LOGGER_NAME)
+
+    benchmark(ledger_log.deposit, **FIELDS)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_bench_error_log(benchmark, level):
+    benchmark(lambda: LedgerErrorLogger(LOGGER_NAME).insufficient_funds(**FIELDS))
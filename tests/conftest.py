@@ -186,6 +186,65 @@ def client(postgres_container):
         yield c
 
 
+@pytest.fixture(scope="session")
+def async_client(postgres_container):
+    """
+    TestClient over the async ledger routes, backed by an AsyncSession on the test database.
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.core.db import get_async_db
+    from app.core.exceptions import LedgerRejection
+    from app.core.middleware import RequestContextMiddleware
+    from app.core.rejection_log import ledger_rejection_handler
+    from app.ledger.controllers.ledger_async import router
+
+    async_engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        db = TestingAsyncSessionLocal()
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+
+    async_app = FastAPI()
+    async_app.add_middleware(RequestContextMiddleware)
+    async_app.include_router(router)
+    async_app.add_exception_handler(LedgerRejection, ledger_rejection_handler)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(async_app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """
+    db_session rolls back the outer transaction after the session commits, so anything
+    published to the process-wide caches during a test must not leak into the next one.
+    """
+    from app.core.idempotency_cache import idempotency_cache
+    from app.core.rejection_log import rejection_log
+    from app.ledger.models.dominio import status_registry
+    from app.ledger.repository.asset_repository import asset_cache
+    from app.ledger.repository.ledger_balance_repository import conflict_tracker
+
+    caches = (asset_cache, status_registry, idempotency_cache, rejection_log, conflict_tracker)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
 @pytest.fixture()
 def freeze_time():
     from freezegun import freeze_time as _freeze
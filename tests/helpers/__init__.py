@@ -0,0 +1,7 @@
+from .query_counter import QueryCounter, assert_max_queries, count_queries
+
+__all__ = [
+    "QueryCounter",
+    "assert_max_queries",
+    "count_queries",
+]
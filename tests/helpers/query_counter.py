@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(session):
+    """Record every SQL statement the session's engine sends while the block runs."""
+    engine = session.get_bind().engine
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(session, expected: int):
+    with count_queries(session) as counter:
+        yield counter
+    assert counter.count <= expected, f"expected at most {expected} statements, got {counter.count}:\n" + "\n".join(
+        counter.statements
+    )
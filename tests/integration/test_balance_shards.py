@@ -0,0 +1,105 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.ledger import schemas
+from app.ledger.models import Balance, BalanceShard
+from app.ledger.services import ledger as ledger_module
+from app.ledger.services.ledger import LedgerService
+from app.ledger.services.reconciliation import ReconciliationService
+from app.ledger.services.snapshot import SnapshotService
+from tests.builders.account_builder import AccountBuilder
+
+
+@pytest.fixture()
+def hot_account(db_session, request_mock, monkeypatch):
+    account_id = AccountBuilder(db_session, guid=uuid.uuid4()).build().id
+    monkeypatch.setattr(ledger_module.settings, "sharded_account_ids", {account_id})
+    monkeypatch.setattr(ledger_module.settings, "balance_shards", 4)
+    service = LedgerService(db_session, request_mock)
+    for index in range(8):
+        service.deposit(
+            account_id=account_id, asset="USDC", amount=Decimal("10"), idempotency_key=f"hot-{index}", reference_id="r"
+        )
+    return service, account_id
+
+
+def _balance_row(db_session, account_id):
+    return db_session.execute(select(Balance).where(Balance.account_id == account_id)).scalar_one()
+
+
+def _held_in_shards(db_session, account_id):
+    return db_session.scalar(select(func.sum(BalanceShard.available)).where(BalanceShard.account_id == account_id))
+
+
+@pytest.mark.integration
+def test_deposits_spread_over_shards_and_reads_aggregate(db_session, hot_account):
+    service, account_id = hot_account
+
+    shards = db_session.scalars(select(BalanceShard.shard).where(BalanceShard.account_id == account_id)).all()
+    assert 1 < len(shards) <= 4
+    assert _balance_row(db_session, account_id).available == Decimal("0")
+    assert service.get_balances(account_id)["USDC"] == {"available": Decimal("80"), "locked": Decimal("0")}
+
+    _, replayed = service.deposit(
+        account_id=account_id, asset="USDC", amount=Decimal("10"), idempotency_key="hot-0", reference_id="r"
+    )
+    assert replayed.available == Decimal("80")
+
+
+@pytest.mark.integration
+def test_debit_sweeps_shards_into_balance_row(db_session, hot_account):
+    service, account_id = hot_account
+
+    _, bal = service.withdraw(
+        account_id=account_id, asset="USDC", amount=Decimal("25"), idempotency_key="hot-w", reference_id="r"
+    )
+
+    assert bal.available == Decimal("55")
+    assert _held_in_shards(db_session, account_id) == Decimal("0")
+    assert service.get_balances(account_id)["USDC"]["available"] == Decimal("55")
+
+
+@pytest.mark.integration
+def test_batch_debit_sweeps_shards(db_session, hot_account):
+    service, account_id = hot_account
+    lock = schemas.BatchOperation(
+        operation="lock",
+        idempotency_key="hot-batch-lock",
+        account_id=account_id,
+        asset="USDC",
+        amount=Decimal("70"),
+        reference_id="r",
+    )
+
+    [result] = service.apply_batch([lock])
+
+    assert result["status"] == "applied"
+    assert result["balance"] == {"available": Decimal("10"), "locked": Decimal("70")}
+    assert service.get_balances(account_id)["USDC"] == {"available": Decimal("10"), "locked": Decimal("70")}
+
+
+@pytest.mark.integration
+def test_audits_count_shards_and_rebuild_folds_them(db_session, hot_account):
+    service, account_id = hot_account
+    service.lock_funds(
+        schemas.LockIn(
+            account_id=account_id, asset="USDC", amount=Decimal("5"), idempotency_key="hot-l", reference_id="r"
+        )
+    )
+    service.deposit(
+        account_id=account_id, asset="USDC", amount=Decimal("10"), idempotency_key="hot-after", reference_id="r"
+    )
+    db_session.flush()
+
+    assert list(ReconciliationService(db_session).check_partition(account_id, account_id + 1)) == []
+    assert list(SnapshotService(db_session).verify(account_id=account_id)) == []
+
+    SnapshotService(db_session).rebuild()
+    assert _held_in_shards(db_session, account_id) == Decimal("0")
+    assert (_balance_row(db_session, account_id).available, service.get_balances(account_id)["USDC"]["available"]) == (
+        Decimal("85"),
+        Decimal("85"),
+    )
@@ -0,0 +1,107 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.ledger import schemas
+from app.ledger.models import Balance, BalanceSnapshot, Dominio, Settlement
+from app.ledger.repository.asset_repository import AssetRepository
+from app.ledger.services.ledger import LedgerService
+from app.ledger.services.settlement import SettlementService
+from app.ledger.services.snapshot import SnapshotService
+from tests.builders.account_builder import AccountBuilder
+
+
+def _activity(service, account_id, prefix):
+    service.deposit(
+        account_id=account_id, asset="USDC", amount=Decimal("100"), idempotency_key=f"{prefix}-d", reference_id="r"
+    )
+    service.lock_funds(
+        schemas.LockIn(
+            account_id=account_id, asset="USDC", amount=Decimal("30"), idempotency_key=f"{prefix}-l", reference_id="r"
+        )
+    )
+    service.unlock_funds(
+        account_id=account_id, asset="USDC", amount=Decimal("10"), idempotency_key=f"{prefix}-u", reference_id="r"
+    )
+    service.withdraw(
+        account_id=account_id, asset="USDC", amount=Decimal("5"), idempotency_key=f"{prefix}-w", reference_id="r"
+    )
+
+
+def _snapshot_of(db_session, account_id):
+    return db_session.execute(select(BalanceSnapshot).where(BalanceSnapshot.account_id == account_id)).scalar_one()
+
+
+@pytest.mark.integration
+def test_checkpoint_matches_balance_and_verifies_clean(db_session, request_mock):
+    account_id = AccountBuilder(db_session).build().id
+    _activity(LedgerService(db_session, request_mock), account_id, "snap1")
+
+    stats = SnapshotService(db_session).checkpoint()
+
+    snapshot = _snapshot_of(db_session, account_id)
+    assert (snapshot.available, snapshot.locked) == (Decimal("75"), Decimal("20"))
+    assert snapshot.last_event_id == stats["to_event_id"]
+    assert list(SnapshotService(db_session).verify(account_id=account_id)) == []
+
+
+@pytest.mark.integration
+def test_incremental_checkpoint_replays_only_new_events(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account_id = AccountBuilder(db_session).build().id
+    _activity(service, account_id, "snap2a")
+    first = SnapshotService(db_session).checkpoint()
+
+    _activity(service, account_id, "snap2b")
+    second = SnapshotService(db_session, window=1, yield_per=1).checkpoint()
+
+    assert second["from_event_id"] == first["to_event_id"]
+    assert second["pairs_updated"] == 4
+    snapshot = _snapshot_of(db_session, account_id)
+    assert (snapshot.available, snapshot.locked) == (Decimal("150"), Decimal("40"))
+
+
+@pytest.mark.integration
+def test_settlement_events_reduce_locked(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account_id = AccountBuilder(db_session).build().id
+    _activity(service, account_id, "snap3")
+    sent = Dominio(nm_dominio="SENT")
+    db_session.add_all([sent, Dominio(nm_dominio="CONFIRMED")])
+    db_session.flush()
+    settlement = Settlement(
+        account_id=account_id,
+        id_asset=AssetRepository(db_session).get_or_create_id("USDC"),
+        amount=Decimal("20"),
+        from_address="a",
+        to_address="b",
+        blockchain="eth",
+        id_status=sent.id,
+    )
+    db_session.add(settlement)
+    db_session.flush()
+    SettlementService(db_session, request_mock).confirm_settlement(settlement.id)
+    db_session.flush()
+
+    SnapshotService(db_session).checkpoint()
+
+    assert _snapshot_of(db_session, account_id).locked == Decimal("0")
+    assert list(SnapshotService(db_session).verify(account_id=account_id)) == []
+
+
+@pytest.mark.integration
+def test_verify_reports_drift_and_rebuild_repairs_it(db_session, request_mock):
+    account_id = AccountBuilder(db_session).build().id
+    _activity(LedgerService(db_session, request_mock), account_id, "snap4")
+    balance = db_session.execute(select(Balance).where(Balance.account_id == account_id)).scalar_one()
+    balance.available = Decimal("999")
+    db_session.flush()
+
+    [mismatch] = SnapshotService(db_session).verify(account_id=account_id)
+    assert mismatch["available"] == Decimal("999")
+    assert mismatch["expected_available"] == Decimal("75")
+
+    assert SnapshotService(db_session).rebuild()["balances_rewritten"] >= 1
+    db_session.refresh(balance)
+    assert balance.available == Decimal("75")
@@ -0,0 +1,103 @@
+import threading
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.ledger_metrics import ledger_metrics
+from app.ledger.services import ledger as ledger_module
+from app.ledger.services.ledger import LedgerService
+from tests.builders.account_builder import AccountBuilder
+from tests.conftest import TestingSessionLocal
+
+
+def _deposit(key, amount):
+    return {"idempotency_key": key, "amount": Decimal(amount), "reference_id": "r"}
+
+
+@pytest.mark.integration
+def test_deposit_group_returns_running_balances_and_replays(db_session, request_mock):
+    account_id = AccountBuilder(db_session, guid=uuid.uuid4()).build().id
+    service = LedgerService(db_session, request_mock)
+    service.deposit(account_id=account_id, asset="USDC", amount=Decimal("5"), idempotency_key="grp-0", reference_id="r")
+
+    results = service.deposit_group(
+        account_id,
+        "USDC",
+        [_deposit("grp-1", "10"), _deposit("grp-0", "5"), _deposit("grp-2", "20"), _deposit("grp-1", "10")],
+    )
+
+    assert [replayed for _, _, replayed in results] == [False, True, False, True]
+    assert [bal.available for _, bal, _ in results] == [Decimal("15"), Decimal("35"), Decimal("35"), Decimal("35")]
+    assert results[3][0].id == results[0][0].id
+    assert service.get_balances(account_id)["USDC"]["available"] == Decimal("35")
+
+
+@pytest.mark.integration
+def test_concurrent_deposits_share_one_transaction(request_mock, monkeypatch):
+    monkeypatch.setattr(ledger_module.settings, "deposit_coalesce_window_ms", 200.0)
+    with TestingSessionLocal() as db:
+        account_id = AccountBuilder(db, guid=uuid.uuid4()).build().id
+        db.commit()
+
+    groups = ledger_metrics.deposit_groups.value()
+    prefix = uuid.uuid4().hex
+    results = [None] * 5
+
+    def deposit(index):
+        with TestingSessionLocal() as db:
+            results[index] = LedgerService(db, request_mock).deposit(
+                account_id=account_id,
+                asset="USDC",
+                amount=Decimal(index + 1),
+                idempotency_key=f"{prefix}-{index}",
+                reference_id="r",
+            )
+
+    threads = [threading.Thread(target=deposit, args=(index,)) for index in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ledger_metrics.deposit_groups.value() == groups + 1
+    assert max(bal.available for _, bal in results) == Decimal("15")
+    assert len({bal.available for _, bal in results}) == 5
+    with TestingSessionLocal() as db:
+        assert LedgerService(db, request_mock).get_balances(account_id)["USDC"]["available"] == Decimal("15")
+
+
+@pytest.mark.integration
+def test_invalid_deposit_fails_only_its_caller(request_mock, monkeypatch):
+    monkeypatch.setattr(ledger_module.settings, "deposit_coalesce_window_ms", 200.0)
+    with TestingSessionLocal() as db:
+        account_id = AccountBuilder(db, guid=uuid.uuid4()).build().id
+        db.commit()
+
+    prefix = uuid.uuid4().hex
+    outcomes = [None] * 4
+
+    def deposit(index):
+        with TestingSessionLocal() as db:
+            try:
+                LedgerService(db, request_mock).deposit(
+                    account_id=account_id,
+                    asset="USDC",
+                    amount=Decimal("1"),
+                    idempotency_key=f"{prefix}-{index}",
+                    reference_id=None if index == 2 else "r",
+                )
+                outcomes[index] = "ok"
+            except IntegrityError:
+                outcomes[index] = "integrity_error"
+
+    threads = [threading.Thread(target=deposit, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes == ["ok", "ok", "integrity_error", "ok"]
+    with TestingSessionLocal() as db:
+        assert LedgerService(db, request_mock).get_balances(account_id)["USDC"]["available"] == Decimal("3")
@@ -0,0 +1,56 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.ledger.models import Dominio, Settlement
+from app.ledger.repository.asset_repository import AssetRepository
+from app.ledger.repository.lock_manager import LockManager
+from tests.builders.account_builder import AccountBuilder
+from tests.helpers import assert_max_queries, count_queries
+
+
+def _settlement(db_session, account_id, id_asset, status):
+    settlement = Settlement(
+        account_id=account_id,
+        id_asset=id_asset,
+        amount=Decimal("1"),
+        from_address="a",
+        to_address="b",
+        blockchain="eth",
+        id_status=status.id,
+    )
+    db_session.add(settlement)
+    db_session.flush()
+    return settlement
+
+
+@pytest.mark.integration
+def test_balances_are_locked_in_key_order_and_created_when_missing(db_session):
+    first, second = (AccountBuilder(db_session, guid=uuid.uuid4()).build().id for _ in range(2))
+    id_asset = AssetRepository(db_session).get_or_create_id("USDC")
+
+    with count_queries(db_session) as counter:
+        locked = LockManager(db_session).balances([(second, id_asset), (first, id_asset), (second, id_asset)])
+
+    assert list(locked) == [(first, id_asset), (second, id_asset)]
+    assert all(bal.available == 0 for bal in locked.values())
+    assert "ORDER BY balance.account_id, balance.id_asset FOR UPDATE" in counter.statements[0]
+
+
+@pytest.mark.integration
+def test_settlements_are_locked_with_their_balance_in_one_statement(db_session):
+    account_id = AccountBuilder(db_session, guid=uuid.uuid4()).build().id
+    id_asset = AssetRepository(db_session).get_or_create_id("USDC")
+    manager = LockManager(db_session)
+    manager.balances([(account_id, id_asset)])
+    status = Dominio(nm_dominio="SENT")
+    db_session.add(status)
+    db_session.flush()
+    settlements = [_settlement(db_session, account_id, id_asset, status) for _ in range(2)]
+
+    with assert_max_queries(db_session, 1):
+        locked = manager.settlements([s.id for s in settlements] + [-1])
+
+    assert sorted(locked) == sorted(s.id for s in settlements)
+    assert {(bal.account_id, bal.id_asset) for _, bal in locked.values()} == {(account_id, id_asset)}
@@ -0,0 +1,83 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from app.core.ledger_metrics import ledger_metrics
+from app.ledger.models import Balance
+from app.ledger.repository import ledger_balance_repository as balance_module
+from app.ledger.repository.asset_repository import AssetRepository
+from app.ledger.repository.ledger_balance_repository import LedgerBalanceRepository, conflict_tracker
+from tests.builders.account_builder import AccountBuilder
+
+
+@pytest.fixture()
+def funded(db_session, monkeypatch):
+    monkeypatch.setattr(balance_module.settings, "balance_concurrency", "optimistic")
+    account_id = AccountBuilder(db_session, guid=uuid.uuid4()).build().id
+    id_asset = AssetRepository(db_session).get_or_create_id("USDC")
+    repo = LedgerBalanceRepository(db_session)
+    repo.apply_delta(account_id, id_asset, Decimal("100"), Decimal("0"))
+    return repo, account_id, id_asset
+
+
+@pytest.mark.integration
+def test_optimistic_write_applies_delta_and_bumps_version(funded):
+    repo, account_id, id_asset = funded
+    before = repo.get_balance_by_account_id(account_id, id_asset).version
+
+    bal = repo.apply_delta(account_id, id_asset, Decimal("-30"), Decimal("30"))
+
+    assert (bal.available, bal.locked) == (Decimal("70"), Decimal("30"))
+    assert bal.version == before + 1
+
+
+@pytest.mark.integration
+def test_optimistic_write_refuses_overdraft(funded):
+    repo, account_id, id_asset = funded
+
+    assert repo.apply_delta(account_id, id_asset, Decimal("-101"), Decimal("0")) is None
+    assert repo.get_balance_by_account_id(account_id, id_asset).available == Decimal("100")
+
+
+@pytest.mark.integration
+def test_lost_version_race_is_retried(db_session, funded, monkeypatch):
+    repo, account_id, id_asset = funded
+    read = LedgerBalanceRepository.get_balance_by_account_id
+    raced = []
+
+    def read_then_race(self, *args):
+        bal = read(self, *args)
+        if not raced:
+            # a concurrent writer commits between our read and our conditional UPDATE
+            raced.append(bal.version)
+            db_session.execute(
+                update(Balance)
+                .where(Balance.id == bal.id)
+                .values(available=Balance.available + 5, version=Balance.version + 1),
+                execution_options={"synchronize_session": False},
+            )
+        return bal
+
+    monkeypatch.setattr(LedgerBalanceRepository, "get_balance_by_account_id", read_then_race)
+    retried = ledger_metrics.balance_write_conflicts.value("retried")
+
+    bal = repo.apply_delta(account_id, id_asset, Decimal("-10"), Decimal("0"))
+
+    assert bal.available == Decimal("95")
+    assert bal.version == raced[0] + 2
+    assert ledger_metrics.balance_write_conflicts.value("retried") == retried + 1
+
+
+@pytest.mark.integration
+def test_adaptive_mode_turns_pessimistic_for_contended_accounts(funded, monkeypatch):
+    repo, account_id, id_asset = funded
+    monkeypatch.setattr(balance_module.settings, "balance_concurrency", "adaptive")
+    assert repo._concurrency(account_id) == "optimistic"
+
+    for _ in range(5):
+        conflict_tracker.record(account_id, conflicted=True)
+
+    assert repo._concurrency(account_id) == "pessimistic"
+    assert repo.apply_delta(account_id, id_asset, Decimal("-1"), Decimal("0")).available == Decimal("99")
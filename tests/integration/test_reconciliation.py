@@ -0,0 +1,75 @@
+import contextlib
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.ledger import schemas
+from app.ledger.models import Balance
+from app.ledger.services import reconciliation
+from app.ledger.services.ledger import LedgerService
+from app.ledger.services.reconciliation import ReconciliationService
+from tests.builders.account_builder import AccountBuilder
+
+
+def _activity(service, account_id, prefix):
+    service.deposit(
+        account_id=account_id, asset="USDC", amount=Decimal("100"), idempotency_key=f"{prefix}-d", reference_id="r"
+    )
+    service.lock_funds(
+        schemas.LockIn(
+            account_id=account_id, asset="USDC", amount=Decimal("30"), idempotency_key=f"{prefix}-l", reference_id="r"
+        )
+    )
+    service.withdraw(
+        account_id=account_id, asset="USDC", amount=Decimal("5"), idempotency_key=f"{prefix}-w", reference_id="r"
+    )
+
+
+@pytest.mark.integration
+def test_partition_with_consistent_balances_reports_nothing(db_session, request_mock):
+    account_id = AccountBuilder(db_session, guid=uuid.uuid4()).build().id
+    _activity(LedgerService(db_session, request_mock), account_id, "rec1")
+    db_session.flush()
+
+    assert list(ReconciliationService(db_session, yield_per=1).check_partition(account_id, account_id + 1)) == []
+
+
+@pytest.mark.integration
+def test_partition_reports_drifted_balance(db_session, request_mock):
+    account_id = AccountBuilder(db_session, guid=uuid.uuid4()).build().id
+    _activity(LedgerService(db_session, request_mock), account_id, "rec2")
+    balance = db_session.execute(select(Balance).where(Balance.account_id == account_id)).scalar_one()
+    balance.locked = Decimal("1")
+    db_session.flush()
+
+    [mismatch] = ReconciliationService(db_session).check_partition(account_id, account_id + 1)
+
+    assert mismatch["account_id"] == account_id
+    assert (mismatch["available"], mismatch["expected_available"]) == (Decimal("65"), Decimal("65"))
+    assert (mismatch["locked"], mismatch["expected_locked"]) == (Decimal("1"), Decimal("30"))
+    assert mismatch["sum_delta"] == Decimal("65")
+    assert mismatch["events"] == 3
+
+
+@pytest.mark.integration
+def test_reconcile_resumes_from_state_file(db_session, monkeypatch, tmp_path):
+    accounts = [AccountBuilder(db_session, guid=uuid.uuid4()).build().id for _ in range(3)]
+    monkeypatch.setattr(reconciliation, "SessionLocal", lambda: contextlib.nullcontext(db_session))
+    low, high = ReconciliationService(db_session).repository.account_id_bounds()
+    checked = []
+    monkeypatch.setattr(reconciliation, "_check", lambda partition: (checked.append(partition), (partition, []))[1])
+    state = tmp_path / "reconcile.json"
+    # an interrupted run that already covered the first partition
+    state.write_text(json.dumps({"partition_size": 1, "done": {str(low): 0}}))
+
+    summary = reconciliation.reconcile(partition_size=1, state_path=str(state))
+
+    assert (low, low + 1) not in checked
+    assert (accounts[-1], accounts[-1] + 1) in checked
+    assert summary["partitions_done"] == high - low + 1
+    assert json.loads(state.read_text())["done"].keys() == {str(lo) for lo in range(low, high + 1)}
+    with pytest.raises(ValueError):
+        reconciliation.reconcile(partition_size=2, state_path=str(state))
@@ -69,3 +69,102 @@ def test_event_persists_exact_delta(db_session):
 
     stored = repo.get_event_by_idempotency_key("prec-1")
     assert Decimal(stored.delta) == Decimal("0.12345678")
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("upsert_enabled", [True, False])
+def test_apply_delta_creates_and_updates_balance(db_session, monkeypatch, upsert_enabled):
+    from app.ledger.repository import ledger_balance_repository
+
+    monkeypatch.setattr(ledger_balance_repository.settings, "balance_upsert_enabled", upsert_enabled)
+    account = AccountBuilder(db_session, guid=uuid.uuid4()).build()
+    asset = AssetBuilder(db_session, nm_asset="USDC").get_or_create()
+    repo = LedgerBalanceRepository(db_session)
+
+    bal = repo.apply_delta(account.id, asset.id, available_delta=Decimal("10"))
+    assert (Decimal(bal.available), Decimal(bal.locked)) == (Decimal("10"), Decimal("0"))
+
+    bal = repo.apply_delta(account.id, asset.id, available_delta=Decimal("-4"), locked_delta=Decimal("4"))
+    assert (Decimal(bal.available), Decimal(bal.locked)) == (Decimal("6"), Decimal("4"))
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("upsert_enabled", [True, False])
+def test_apply_delta_rejects_negative_result(db_session, monkeypatch, upsert_enabled):
+    from app.ledger.repository import ledger_balance_repository
+
+    monkeypatch.setattr(ledger_balance_repository.settings, "balance_upsert_enabled", upsert_enabled)
+    account = AccountBuilder(db_session, guid=uuid.uuid4()).build()
+    asset = AssetBuilder(db_session, nm_asset="USDC").get_or_create()
+    repo = LedgerBalanceRepository(db_session)
+    repo.apply_delta(account.id, asset.id, available_delta=Decimal("5"))
+
+    assert repo.apply_delta(account.id, asset.id, available_delta=Decimal("-6")) is None
+    assert repo.apply_delta(account.id, asset.id, locked_delta=Decimal("-1")) is None
+
+    bal = repo.get_balance_by_account_id(account.id, asset.id)
+    assert (Decimal(bal.available), Decimal(bal.locked)) == (Decimal("5"), Decimal("0"))
+
+
+@pytest.mark.integration
+def test_create_event_if_absent_returns_none_on_conflict(db_session):
+    account = AccountBuilder(db_session, guid=uuid.uuid4()).build()
+    asset = AssetBuilder(db_session, nm_asset="USDC").get_or_create()
+    repo = EventRepository(db_session)
+    event = {
+        "idempotency_key": "absent-key",
+        "account_id": account.id,
+        "id_asset": asset.id,
+        "delta": Decimal("1"),
+        "event_type": "deposit",
+        "reference_type": "deposit",
+        "reference_id": "r1",
+    }
+
+    first = repo.create_event_if_absent(**event)
+    assert first is not None
+    assert repo.create_event_if_absent(**{**event, "delta": Decimal("2")}) is None
+    assert Decimal(repo.get_event_by_idempotency_key("absent-key").delta) == Decimal("1")
+
+
+def _bulk_events(account_id, id_asset, prefix, count):
+    return [
+        {
+            "idempotency_key": f"{prefix}-{i}",
+            "account_id": account_id,
+            "id_asset": id_asset,
+            "delta": Decimal(i),
+            "event_type": "deposit",
+            "reference_type": "deposit",
+            "reference_id": f"r{i}",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.integration
+def test_create_events_returns_rows_in_input_order(db_session):
+    account = AccountBuilder(db_session, guid=uuid.uuid4()).build()
+    asset = AssetBuilder(db_session, nm_asset="USDC").get_or_create()
+    repo = EventRepository(db_session)
+
+    created = repo.create_events(_bulk_events(account.id, asset.id, "bulk", 25))
+
+    assert [ev.idempotency_key for ev in created] == [f"bulk-{i}" for i in range(25)]
+    assert all(ev.id for ev in created)
+
+
+@pytest.mark.integration
+def test_create_events_copy_path(db_session, monkeypatch):
+    from app.ledger.repository import ledger_event_repository
+
+    monkeypatch.setattr(ledger_event_repository.settings, "event_copy_threshold", 10)
+    account = AccountBuilder(db_session, guid=uuid.uuid4()).build()
+    asset = AssetBuilder(db_session, nm_asset="USDC").get_or_create()
+    repo = EventRepository(db_session)
+
+    repo.create_events(_bulk_events(account.id, asset.id, "copy", 10), returning=False)
+
+    stored = repo.get_events_by_idempotency_keys([f"copy-{i}" for i in range(10)])
+    assert len(stored) == 10
+    assert Decimal(stored["copy-7"].delta) == Decimal("7")
@@ -0,0 +1,114 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.core.exceptions import IdempotencyKeyReused, InsufficientFunds
+from app.ledger import schemas
+from app.ledger.models import LedgerEvent
+from app.ledger.services import ledger as ledger_module
+from app.ledger.services.ledger import LedgerService
+from app.ledger.services.reconciliation import ReconciliationService
+from tests.builders.account_builder import AccountBuilder
+from tests.helpers import assert_max_queries
+
+
+@pytest.fixture()
+def accounts(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    source, target = (AccountBuilder(db_session, guid=uuid.uuid4()).build().id for _ in range(2))
+    service.deposit(account_id=source, asset="USDC", amount=Decimal("100"), idempotency_key="tr-seed", reference_id="r")
+    service.deposit(account_id=target, asset="USDC", amount=Decimal("5"), idempotency_key="tr-seed-2", reference_id="r")
+    return service, source, target
+
+
+def _transfer(source, target, amount, key="tr-1"):
+    return schemas.TransferRequest(
+        idempotency_key=key, account_id=source, to_account_id=target, asset="USDC", amount=amount, reference_id="ord-1"
+    )
+
+
+def _events(db_session, key):
+    return db_session.scalars(
+        select(LedgerEvent).where(LedgerEvent.idempotency_key.in_([key, f"{key}:credit"])).order_by(LedgerEvent.id)
+    ).all()
+
+
+@pytest.mark.integration
+def test_transfer_moves_funds_with_paired_events(db_session, accounts):
+    service, source, target = accounts
+
+    with assert_max_queries(db_session, 3):
+        _, debited, credited = service.transfer(_transfer(source, target, Decimal("30")))
+
+    assert (debited.available, credited.available) == (Decimal("70"), Decimal("35"))
+    assert [(ev.account_id, ev.delta, ev.event_type) for ev in _events(db_session, "tr-1")] == [
+        (source, Decimal("-30"), "transfer"),
+        (target, Decimal("30"), "transfer"),
+    ]
+    for account_id in (source, target):
+        assert list(ReconciliationService(db_session).check_partition(account_id, account_id + 1)) == []
+
+
+@pytest.mark.integration
+def test_transfer_is_idempotent_on_one_key(db_session, accounts):
+    service, source, target = accounts
+    service.transfer(_transfer(source, target, Decimal("30")))
+
+    events, debited, credited = service.transfer(_transfer(source, target, Decimal("30")))
+
+    assert len(events) == 2
+    assert (debited.available, credited.available) == (Decimal("70"), Decimal("35"))
+    assert len(_events(db_session, "tr-1")) == 2
+
+
+@pytest.mark.integration
+def test_key_taken_by_another_operation_is_rejected(db_session, accounts):
+    service, source, target = accounts
+    service.deposit(
+        account_id=target, asset="USDC", amount=Decimal("1"), idempotency_key="tr-1:credit", reference_id="r"
+    )
+
+    with pytest.raises(IdempotencyKeyReused):
+        service.transfer(_transfer(source, target, Decimal("30")))
+    with pytest.raises(IdempotencyKeyReused):
+        service.transfer(_transfer(source, target, Decimal("30"), key="tr-seed"))
+
+    assert [ev.event_type for ev in _events(db_session, "tr-1")] == ["deposit"]
+    assert service.get_balances(source)["USDC"]["available"] == Decimal("100")
+
+
+@pytest.mark.integration
+def test_transfer_key_reused_with_another_amount_is_rejected(db_session, accounts):
+    service, source, target = accounts
+    service.transfer(_transfer(source, target, Decimal("30")))
+
+    with pytest.raises(IdempotencyKeyReused):
+        service.transfer(_transfer(source, target, Decimal("31")))
+
+    assert service.get_balances(source)["USDC"]["available"] == Decimal("70")
+
+
+@pytest.mark.integration
+def test_insufficient_funds_leaves_no_trace(db_session, accounts):
+    service, source, target = accounts
+
+    with pytest.raises(InsufficientFunds):
+        service.transfer(_transfer(source, target, Decimal("100.01")))
+
+    assert _events(db_session, "tr-1") == []
+    assert service.get_balances(source)["USDC"]["available"] == Decimal("100")
+    assert service.get_balances(target)["USDC"]["available"] == Decimal("5")
+
+
+@pytest.mark.integration
+def test_transfer_sweeps_sharded_source(db_session, accounts, monkeypatch):
+    service, source, target = accounts
+    monkeypatch.setattr(ledger_module.settings, "sharded_account_ids", {source})
+    service.deposit(account_id=source, asset="USDC", amount=Decimal("50"), idempotency_key="tr-shard", reference_id="r")
+
+    _, debited, credited = service.transfer(_transfer(source, target, Decimal("120")))
+
+    assert (debited.available, credited.available) == (Decimal("30"), Decimal("125"))
+    assert service.get_balances(source)["USDC"]["available"] == Decimal("30")
@@ -0,0 +1,60 @@
+import time
+
+from app.core.cache import TTLCache
+from app.ledger.repository.asset_repository import AssetRepository, asset_cache
+from tests.builders.asset_builder import AssetBuilder
+from tests.conftest import TestingSessionLocal
+from tests.helpers import count_queries
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(max_size=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_get_or_create_id_is_served_from_cache_after_commit():
+    session = TestingSessionLocal()
+    repo = AssetRepository(session)
+    id_asset = repo.get_or_create_id("CACHE1")
+    session.commit()
+
+    try:
+        with count_queries(session) as counter:
+            assert repo.get_or_create_id("CACHE1") == id_asset
+            assert repo.get_name(id_asset) == "CACHE1"
+    finally:
+        session.close()
+
+    assert counter.statements == []
+
+
+def test_rolled_back_asset_is_not_cached(db_session):
+    repo = AssetRepository(db_session)
+    repo.get_or_create_id("ROLLBK")
+    db_session.rollback()
+
+    assert asset_cache.get_id("ROLLBK") is None
+
+
+def test_get_or_create_recovers_from_unique_violation(db_session):
+    existing = AssetBuilder(db_session, nm_asset="RACE1").build()
+    repo = AssetRepository(db_session)
+
+    assert repo._create("RACE1").id == existing.id
@@ -1,3 +1,5 @@
+import logging
+import time
 import uuid
 from decimal import Decimal
 from unittest.mock import MagicMock
@@ -8,6 +10,7 @@ from fastapi.testclient import TestClient
 from app import main as main_module
 from app.core.exceptions import InsufficientFunds
 from app.core.ledger_logger import LedgerErrorLogger
+from app.core.rejection_log import RejectionLog
 from app.ledger.services.ledger import LedgerService
 from tests.builders.account_builder import AccountBuilder
 from tests.conftest import TestingSessionLocal
@@ -35,17 +38,10 @@ def test_global_exception_handler_logs_once(monkeypatch):
     app.router.routes = original_routes
 
 
-def test_custom_exception_logger_called(monkeypatch, request_mock):
+def test_custom_exception_logger_called(monkeypatch, client):
     session = TestingSessionLocal()
-    account = AccountBuilder(session, guid=uuid.uuid4()).build()
-    service = LedgerService(session, request_mock)
-    service.deposit(
-        account_id=account.id,
-        asset="USDC",
-        amount=Decimal("10"),
-        idempotency_key="dep-log",
-        reference_id="ref",
-    )
+    account_id = AccountBuilder(session, guid=uuid.uuid4()).build().id
+    session.close()
 
     called = {}
 
@@ -54,14 +50,59 @@ def test_custom_exception_logger_called(monkeypatch, request_mock):
 
     monkeypatch.setattr(LedgerErrorLogger, "insufficient_funds", fake_insufficient_funds)
 
+    resp = client.post(
+        "/ledger/withdraw",
+        json={
+            "idempotency_key": f"wd-log-{uuid.uuid4()}",
+            "account_id": account_id,
+            "asset": "USDC",
+            "amount": "100",
+            "reference_id": "ref2",
+        },
+    )
+
+    assert resp.status_code == 409
+    assert called["insufficient"]["account_id"] == account_id
+
+
+def test_raising_a_rejection_does_not_log(monkeypatch, db_session, request_mock):
+    account = AccountBuilder(db_session, guid=uuid.uuid4()).build()
+    service = LedgerService(db_session, request_mock)
+    monkeypatch.setattr(LedgerErrorLogger, "insufficient_funds", MagicMock())
+
     with pytest.raises(InsufficientFunds):
         service.withdraw(
-            account_id=account.id,
-            asset="USDC",
-            amount=Decimal("100"),
-            idempotency_key="wd-log",
-            reference_id="ref2",
+            account_id=account.id, asset="USDC", amount=Decimal("1"), idempotency_key="wd-nolog", reference_id="r"
         )
 
-    assert "insufficient" in called
-    session.close()
+    LedgerErrorLogger.insufficient_funds.assert_not_called()
+
+
+def test_rejection_log_rate_limits_per_account(monkeypatch, request_mock):
+    log = RejectionLog(burst=2, window_seconds=60)
+    monkeypatch.setattr(LedgerErrorLogger, "insufficient_funds", MagicMock())
+
+    def rejection(account_id):
+        return InsufficientFunds(request=request_mock, payload={"account_id": account_id, "asset": "USDC"})
+
+    admitted = [log.record(rejection(1)) for _ in range(5)]
+
+    assert admitted == [True, True, False, False, False]
+    assert log.record(rejection(2)) is True
+    assert LedgerErrorLogger.insufficient_funds.call_count == 3
+
+
+def test_rejection_log_reports_suppressed_count_in_next_window(monkeypatch, request_mock, caplog):
+    log = RejectionLog(burst=1, window_seconds=0.01)
+    monkeypatch.setattr(LedgerErrorLogger, "insufficient_funds", MagicMock())
+    exc = InsufficientFunds(request=request_mock, payload={"account_id": 7})
+    for _ in range(3):
+        log.record(exc)
+    time.sleep(0.02)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.rejection_log"):
+        assert log.record(exc) is True
+
+    summary = next(r for r in caplog.records if r.getMessage() == "rejections_suppressed")
+    assert summary.suppressed == 2
+    assert summary.account_id == 7
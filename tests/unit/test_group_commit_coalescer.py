@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from app.core.coalescer import GroupCommitCoalescer
+
+
+def test_submissions_within_the_window_are_applied_together():
+    calls = []
+
+    def apply(key, items):
+        calls.append((key, list(items)))
+        return [item * 10 for item in items]
+
+    coalescer = GroupCommitCoalescer(apply)
+    futures = [coalescer.submit("a", 1, 0.05), coalescer.submit("a", 2, 0.05), coalescer.submit("b", 3, 0.05)]
+
+    assert [f.result(timeout=5) for f in futures] == [10, 20, 30]
+    assert sorted(calls) == [("a", [1, 2]), ("b", [3])]
+
+
+def test_full_group_is_applied_without_waiting_for_the_window():
+    applied = threading.Event()
+
+    def apply(key, items):
+        applied.set()
+        return items
+
+    coalescer = GroupCommitCoalescer(apply, max_size=2)
+    first, second = coalescer.submit("a", 1, 60), coalescer.submit("a", 2, 60)
+
+    assert (first.result(timeout=5), second.result(timeout=5)) == (1, 2)
+    assert applied.is_set()
+
+
+def test_groups_are_applied_by_a_bounded_pool():
+    lock, running, peak = threading.Lock(), [0], [0]
+
+    def apply(key, items):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return items
+
+    coalescer = GroupCommitCoalescer(apply, max_workers=2)
+    futures = [coalescer.submit(key, key, 0) for key in range(20)]
+
+    assert [f.result(timeout=5) for f in futures] == list(range(20))
+    assert peak[0] <= 2
+    assert threading.active_count() < 20
+
+
+def test_failed_group_fails_every_caller():
+    def apply(key, items):
+        raise RuntimeError("boom")
+
+    coalescer = GroupCommitCoalescer(apply)
+    futures = [coalescer.submit("a", 1, 0.01), coalescer.submit("a", 2, 0.01)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(timeout=5)
+
+
+def test_exception_result_fails_only_its_caller():
+    def apply(key, items):
+        return [ValueError(item) if item == 2 else item for item in items]
+
+    coalescer = GroupCommitCoalescer(apply)
+    ok, bad = coalescer.submit("a", 1, 0.01), coalescer.submit("a", 2, 0.01)
+
+    assert ok.result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
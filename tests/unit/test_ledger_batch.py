@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+import pytest
+
+from app.core.exceptions import InsufficientFunds
+from app.ledger import schemas
+from app.ledger.services.ledger import LedgerService
+from tests.builders.account_builder import AccountBuilder
+
+
+def _op(operation, key, account_id, amount, asset="USDC"):
+    return schemas.BatchOperation(
+        operation=operation,
+        idempotency_key=key,
+        account_id=account_id,
+        asset=asset,
+        amount=Decimal(amount),
+        reference_id=f"ref-{key}",
+    )
+
+
+def test_batch_applies_operations_in_order(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account = AccountBuilder(db_session).build()
+
+    results = service.apply_batch(
+        [
+            _op("deposit", "b-dep-1", account.id, "100"),
+            _op("lock", "b-lock-1", account.id, "40"),
+            _op("unlock", "b-unlock-1", account.id, "10"),
+            _op("withdraw", "b-wd-1", account.id, "20"),
+        ]
+    )
+
+    assert [r["status"] for r in results] == ["applied"] * 4
+    assert results[-1]["balance"] == {"available": Decimal("50"), "locked": Decimal("30")}
+    balance = service.get_balances(account.id)["USDC"]
+    assert (balance["available"], balance["locked"]) == (Decimal("50"), Decimal("30"))
+
+
+def test_batch_atomic_mode_raises_on_first_rejection(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account = AccountBuilder(db_session).build()
+
+    with pytest.raises(InsufficientFunds):
+        service.apply_batch(
+            [
+                _op("deposit", "b-dep-2", account.id, "10"),
+                _op("withdraw", "b-wd-2", account.id, "20"),
+            ]
+        )
+
+
+def test_batch_per_item_mode_skips_rejected_and_replays(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account = AccountBuilder(db_session).build()
+    service.deposit(
+        account_id=account.id, asset="USDC", amount=Decimal("10"), idempotency_key="b-dep-3", reference_id="r"
+    )
+
+    results = service.apply_batch(
+        [
+            _op("deposit", "b-dep-3", account.id, "10"),
+            _op("withdraw", "b-wd-3", account.id, "50"),
+            _op("lock", "b-lock-3", account.id, "5"),
+            _op("lock", "b-lock-3", account.id, "5"),
+        ],
+        atomic=False,
+    )
+
+    assert [r["status"] for r in results] == ["replayed", "rejected", "applied", "replayed"]
+    balance = service.get_balances(account.id)["USDC"]
+    assert (balance["available"], balance["locked"]) == (Decimal("5"), Decimal("5"))
@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import pytest
+
+from app.core.exceptions import InsufficientFunds
+from app.core.ledger_metrics import ledger_metrics
+from app.core.metrics import Counter, LabeledHistogram, render_prometheus
+from app.ledger.services.ledger import LedgerService
+from tests.builders.account_builder import AccountBuilder
+
+
+def test_render_prometheus_text_format():
+    counter = Counter("ops_total", "Ops.", labelnames=("operation",))
+    counter.inc("deposit")
+    counter.inc("deposit")
+    hist = LabeledHistogram("op_seconds", "Latency.", labelnames=("operation",), buckets=(0.1,))
+    hist.labels("deposit").observe(0.05)
+
+    text = render_prometheus([counter, hist])
+
+    assert "# TYPE ops_total counter" in text
+    assert 'ops_total{operation="deposit"} 2' in text
+    assert 'op_seconds_bucket{operation="deposit",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{operation="deposit",le="+Inf"} 1' in text
+    assert 'op_seconds_count{operation="deposit"} 1' in text
+
+
+def test_service_operations_are_counted(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account_id = AccountBuilder(db_session).build().id
+    deposits = ledger_metrics.operations.value("deposit", "success")
+    replays = ledger_metrics.replays.value("deposit", "database")
+    rejected = ledger_metrics.rejections.value("withdraw", "InsufficientFunds")
+    observed = ledger_metrics.duration.labels("deposit").snapshot()["count"]
+
+    for _ in range(2):
+        service.deposit(
+            account_id=account_id, asset="USDC", amount=Decimal("5"), idempotency_key="m-1", reference_id="r"
+        )
+    with pytest.raises(InsufficientFunds):
+        service.withdraw(
+            account_id=account_id, asset="USDC", amount=Decimal("50"), idempotency_key="m-2", reference_id="r"
+        )
+
+    assert ledger_metrics.operations.value("deposit", "success") == deposits + 2
+    assert ledger_metrics.replays.value("deposit", "database") == replays + 1
+    assert ledger_metrics.rejections.value("withdraw", "InsufficientFunds") == rejected + 1
+    assert ledger_metrics.duration.labels("deposit").snapshot()["count"] == observed + 2
@@ -1,8 +1,14 @@
 from decimal import Decimal
 
+import pytest
+from sqlalchemy import select
+
+from app.core.exceptions import LockExceedsAvailable
 from app.ledger import schemas
+from app.ledger.models.event import LedgerEvent
 from app.ledger.services.ledger import LedgerService
 from tests.builders.account_builder import AccountBuilder
+from tests.helpers import count_queries
 
 
 def _balance_snapshot(service, account_id, asset):
@@ -157,3 +163,33 @@ def test_withdraw_idempotent(db_session, request_mock):
 
     assert final == after
     assert ev_same.idempotency_key == key
+
+
+def test_replay_does_not_touch_balance_row(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account = AccountBuilder(db_session).build()
+    service.deposit(account_id=account.id, asset="USDC", amount=Decimal("10"), idempotency_key="dep4", reference_id="r")
+    db_session.commit()
+
+    with count_queries(db_session) as counter:
+        service.deposit(
+            account_id=account.id, asset="USDC", amount=Decimal("10"), idempotency_key="dep4", reference_id="r"
+        )
+
+    assert not [s for s in counter.statements if "UPDATE balance" in s or "FOR UPDATE" in s]
+
+
+def test_rejected_operation_releases_idempotency_key(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account = AccountBuilder(db_session).build()
+    service.deposit(account_id=account.id, asset="USDC", amount=Decimal("10"), idempotency_key="dep5", reference_id="r")
+
+    with pytest.raises(LockExceedsAvailable):
+        service.lock_funds(
+            payload=schemas.LockIn(
+                account_id=account.id, asset="USDC", amount=Decimal("50"), idempotency_key="lock5", reference_id="r"
+            )
+        )
+
+    stored = db_session.execute(select(LedgerEvent).where(LedgerEvent.idempotency_key == "lock5")).scalar_one_or_none()
+    assert stored is None
@@ -0,0 +1,28 @@
+from benchmarks.loadgen import compare_to_baseline, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_reports_throughput_and_latency():
+    report = summarize("uniform", [0.001, 0.002, 0.003, 0.004], {"ok": 3, "rejected": 1}, 2.0, {})
+
+    assert report["requests"] == 4
+    assert report["ops_per_s"] == 2.0
+    assert report["latency_ms"]["p50"] == 2.0
+    assert report["latency_ms"]["max"] == 4.0
+
+
+def test_compare_to_baseline_flags_regressions_only_beyond_tolerance():
+    baseline = {"ops_per_s": 1000.0, "latency_ms": {"p50": 2.0, "p99": 10.0}}
+    within = {"ops_per_s": 900.0, "latency_ms": {"p50": 2.2, "p99": 11.0}}
+    worse = {"ops_per_s": 700.0, "latency_ms": {"p50": 2.0, "p99": 15.0}}
+
+    assert compare_to_baseline(within, baseline, 0.2) == []
+    assert len(compare_to_baseline(worse, baseline, 0.2)) == 2
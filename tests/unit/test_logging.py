@@ -0,0 +1,65 @@
+import json
+import logging
+import queue
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.ledger_metrics import ledger_metrics
+from app.core.logging import BoundedQueueHandler
+
+
+def _record(level=logging.INFO, msg="deposit"):
+    return logging.LogRecord("ledger.test", level, __file__, 1, msg, None, None)
+
+
+@pytest.mark.parametrize("policy", ["drop", "block"])
+def test_full_queue_drops_and_counts_records(policy):
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy=policy, block_timeout=0.001)
+    dropped = ledger_metrics.log_records_dropped.value("WARNING")
+
+    handler.handle(_record(logging.WARNING))
+    handler.handle(_record(logging.WARNING))
+
+    assert handler.queue.qsize() == 1
+    assert ledger_metrics.log_records_dropped.value("WARNING") == dropped + 1
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), policy="spill")
+
+
+def test_queue_mode_writes_json_from_background_listener(monkeypatch, capsys):
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    monkeypatch.setattr(app_logging.settings, "log_queue_enabled", True)
+    try:
+        app_logging.setup_logging()
+        assert isinstance(root.handlers[0], BoundedQueueHandler)
+        logging.getLogger("ledger.test").warning("queued", extra={"request_id": "q-1"})
+        app_logging.shutdown_logging()
+    finally:
+        root.handlers = handlers
+
+    line = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert line["message"] == "queued"
+    assert line["request_id"] == "q-1"
+
+
+def test_ledger_logger_skips_mapping_when_level_is_filtered(monkeypatch, caplog):
+    from app.core import ledger_logger
+    from app.core.log_mapper import LedgerLogMapper
+
+    calls, deposit = [], LedgerLogMapper.deposit
+    monkeypatch.setattr(ledger_logger.LedgerLogMapper, "deposit", lambda **kw: calls.append(kw) or deposit(**kw))
+    fields = {"account_id": 1, "asset": "USDC", "amount": 1, "idempotency_key": "k"}
+
+    with caplog.at_level(logging.WARNING, logger="ledger.lazy"):
+        ledger_logger.LedgerLogger("ledger.lazy").deposit(**fields)
+    assert calls == []
+
+    with caplog.at_level(logging.INFO, logger="ledger.lazy"):
+        ledger_logger.LedgerLogger("ledger.lazy").deposit(**fields)
+    assert len(calls) == 1
+    assert caplog.records[-1].amount == "1"
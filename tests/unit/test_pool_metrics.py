@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.metrics import Histogram
+from app.core.pool import InstrumentedQueuePool, pool_status
+from tests.conftest import settings
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        hist.observe(value)
+
+    snapshot = hist.snapshot()
+    assert snapshot["buckets"] == {0.1: 1, 1.0: 3, float("inf"): 4}
+    assert snapshot["count"] == 4
+
+
+def test_instrumented_pool_records_checkouts_and_timeouts():
+    engine = create_engine(
+        settings.database_url, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1
+    )
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            assert pool_status(engine.pool)["checked_out"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        status = pool_status(engine.pool)
+        assert status["checked_out"] == 0
+        assert status["checkouts"] == 1
+        assert status["checkout_timeouts"] == 1
+        assert status["wait_seconds"]["count"] == 2
+    finally:
+        engine.dispose()
@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+
+from app.ledger import schemas
+from app.ledger.services.ledger import LedgerService
+from tests.builders.account_builder import AccountBuilder
+from tests.helpers import assert_max_queries
+
+
+@pytest.fixture()
+def funded_account(db_session, request_mock):
+    service = LedgerService(db_session, request_mock)
+    account_id = AccountBuilder(db_session).build().id
+    service.deposit(
+        account_id=account_id, asset="USDC", amount=Decimal("100"), idempotency_key="qb-0", reference_id="r"
+    )
+    db_session.commit()
+    return service, account_id
+
+
+def test_deposit_statement_budget(db_session, funded_account):
+    service, account_id = funded_account
+
+    with assert_max_queries(db_session, 2):
+        service.deposit(
+            account_id=account_id, asset="USDC", amount=Decimal("1"), idempotency_key="qb-1", reference_id="r"
+        )
+
+
+def test_replay_statement_budget(db_session, funded_account):
+    service, account_id = funded_account
+
+    with assert_max_queries(db_session, 3):
+        service.deposit(
+            account_id=account_id, asset="USDC", amount=Decimal("1"), idempotency_key="qb-0", reference_id="r"
+        )
+
+
+def test_lock_statement_budget(db_session, funded_account):
+    service, account_id = funded_account
+    payload = schemas.LockIn(
+        account_id=account_id, asset="USDC", amount=Decimal("1"), idempotency_key="qb-2", reference_id="r"
+    )
+
+    with assert_max_queries(db_session, 2):
+        service.lock_funds(payload)
+
+
+def test_get_balances_loads_assets_in_one_statement(db_session, funded_account):
+    service, account_id = funded_account
+
+    with assert_max_queries(db_session, 1):
+        assert service.get_balances(account_id)["USDC"]["available"] == Decimal("100")
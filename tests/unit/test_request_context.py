@@ -0,0 +1,46 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core.ledger_logger import LedgerLogger
+from app.core.middleware import RequestContextMiddleware
+from app.core.request_context import get_request_id, request_id_var
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/sync")
+    def sync_endpoint(request: Request):
+        return {"var": get_request_id(), "state": request.state.request_id}
+
+    @app.get("/async")
+    async def async_endpoint():
+        return {"var": get_request_id()}
+
+    return app
+
+
+def test_request_id_is_visible_to_sync_and_async_handlers():
+    with TestClient(_app()) as client:
+        sync = client.get("/sync", headers={"X-Request-Id": "ctx-1"})
+        generated = client.get("/async")
+
+    assert sync.json() == {"var": "ctx-1", "state": "ctx-1"}
+    assert sync.headers["X-Request-Id"] == "ctx-1"
+    assert generated.json()["var"] == generated.headers["X-Request-Id"]
+    assert get_request_id() is None
+
+
+def test_ledger_logger_reads_request_id_from_context(caplog):
+    token = request_id_var.set("ctx-log")
+    try:
+        with caplog.at_level(logging.INFO, logger="ledger.test"):
+            LedgerLogger("ledger.test").deposit(account_id=1, asset="USDC", amount=1, idempotency_key="k")
+    finally:
+        request_id_var.reset(token)
+
+    assert caplog.records[-1].request_id == "ctx-log"
@@ -0,0 +1,74 @@
+import pytest
+
+from app.ledger.models.dominio import Dominio, StatusRegistry, status_registry
+from app.ledger.repository.dominio_repository import DominioRepository
+from tests.conftest import TestingSessionLocal
+from tests.helpers import count_queries
+
+
+def _seed_statuses(db_session, *names):
+    rows = [Dominio(nm_dominio=name) for name in names]
+    db_session.add_all(rows)
+    db_session.flush()
+    return {row.nm_dominio: row.id for row in rows}
+
+
+def test_registry_resolves_names_and_ids(db_session):
+    ids = _seed_statuses(db_session, "PENDING", "CONFIRMED")
+    registry = StatusRegistry()
+    registry.load(db_session)
+
+    assert registry.id_of("PENDING") == ids["PENDING"]
+    assert registry.name_of(ids["CONFIRMED"]) == "CONFIRMED"
+    assert registry.id_of("UNKNOWN") is None
+
+
+def test_registry_mappings_are_read_only(db_session):
+    _seed_statuses(db_session, "PENDING")
+    registry = StatusRegistry()
+    registry.load(db_session)
+
+    with pytest.raises(TypeError):
+        registry.ids["PENDING"] = 0
+
+
+def test_repository_reloads_registry_on_miss(db_session):
+    repo = DominioRepository(db_session)
+    _seed_statuses(db_session, "PENDING")
+    repo.refresh()
+
+    ids = _seed_statuses(db_session, "SENT")
+    assert status_registry.id_of("SENT") is None
+    assert repo.get_status_id("SENT") == ids["SENT"]
+    assert repo.get_status_name(ids["SENT"]) == "SENT"
+
+
+def test_reload_is_published_only_after_commit(db_session):
+    repo = DominioRepository(db_session)
+    ids = _seed_statuses(db_session, "UNCOMMITTED")
+
+    assert repo.get_status_id("UNCOMMITTED") == ids["UNCOMMITTED"]
+    assert status_registry.id_of("UNCOMMITTED") is None
+
+    session = TestingSessionLocal()
+    try:
+        committed = _seed_statuses(session, "COMMITTED")
+        assert DominioRepository(session).get_status_id("COMMITTED") == committed["COMMITTED"]
+        session.commit()
+        assert status_registry.id_of("COMMITTED") == committed["COMMITTED"]
+    finally:
+        session.execute(Dominio.__table__.delete().where(Dominio.nm_dominio == "COMMITTED"))
+        session.commit()
+        session.close()
+
+
+def test_unknown_status_is_not_reloaded_on_every_lookup(db_session):
+    repo = DominioRepository(db_session)
+    assert repo.get_status_id("NO_SUCH_STATUS") is None
+
+    with count_queries(db_session) as counter:
+        assert repo.get_status_id("NO_SUCH_STATUS") is None
+        assert repo.get_status_name(-1) is None
+        assert repo.get_status_name(-1) is None
+
+    assert len(counter.statements) == 1
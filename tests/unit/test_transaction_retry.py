@@ -0,0 +1,79 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core import retry
+from app.core.ledger_metrics import ledger_metrics
+from app.core.middleware import RequestContextMiddleware
+from app.core.retry import RetryingRoute
+
+
+class _PgError(Exception):
+    def __init__(self, sqlstate):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def _client(failures, error=OperationalError):
+    calls = []
+    router = APIRouter(route_class=RetryingRoute)
+
+    @router.post("/op")
+    def op(payload: dict):
+        calls.append(payload)
+        if len(calls) <= len(failures):
+            raise error("UPDATE balance ...", {}, _PgError(failures[len(calls) - 1]))
+        return {"attempts": len(calls)}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(RequestContextMiddleware)
+    return TestClient(app), calls
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(retry.settings, "transaction_retry_base_delay", 0.0)
+    monkeypatch.setattr(retry.settings, "transaction_retry_attempts", 2)
+
+
+def test_deadlock_and_serialization_failures_are_retried_with_the_same_body():
+    client, calls = _client(["40P01", "40001"])
+    deadlocks = ledger_metrics.transaction_retries.value("deadlock_detected")
+
+    resp = client.post("/op", json={"amount": "1"})
+
+    assert resp.json() == {"attempts": 3}
+    assert calls == [{"amount": "1"}] * 3
+    assert ledger_metrics.transaction_retries.value("deadlock_detected") == deadlocks + 1
+
+
+def test_retries_are_bounded():
+    client, calls = _client(["40P01"] * 3)
+    exhausted = ledger_metrics.transaction_retries_exhausted.value("deadlock_detected")
+
+    with pytest.raises(OperationalError):
+        client.post("/op", json={})
+
+    assert len(calls) == 3
+    assert ledger_metrics.transaction_retries_exhausted.value("deadlock_detected") == exhausted + 1
+
+
+def test_other_database_errors_are_not_retried():
+    client, calls = _client(["23505"], error=IntegrityError)
+
+    with pytest.raises(IntegrityError):
+        client.post("/op", json={})
+
+    assert len(calls) == 1
+
+
+def test_backoff_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(retry.settings, "transaction_retry_base_delay", 0.01)
+    monkeypatch.setattr(retry.settings, "transaction_retry_max_delay", 0.03)
+
+    delays = [retry.backoff_delay(5) for _ in range(50)]
+
+    assert all(0 <= delay <= 0.03 for delay in delays)
+    assert len(set(delays)) > 1